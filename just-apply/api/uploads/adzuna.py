@@ -0,0 +1,438 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from db import SQLiteThreadPool, apply_sqlite_pragmas
+
+# =========================================================
+# ADZUNA CLIENT
+# =========================================================
+# search_live_jobs_adzuna() asks Adzuna for the user's own role and then a
+# list of fallback roles. QueryFanOut runs the primary search on the
+# request's own thread and only moves on to the fallbacks, a few at a time
+# on a pool shared by all requests, while the caller still wants more jobs;
+# results come back in priority order, so the merged job list is the same
+# as asking one query at a time. A cache miss that the primary search fills
+# therefore costs one Adzuna call, not one per role.
+#
+# Every call goes through one HttpClient per process: a requests.Session
+# whose connection pool keeps TLS connections to Adzuna open between
+# searches instead of opening a new one for each request.
+#
+# Before a call goes out it needs a token from a TokenBucket (per process)
+# or SQLiteTokenBucket (shared by the workers on the host through a SQLite
+# file), and the CircuitBreaker has to be closed. After enough timeouts,
+# connection errors, 429s or 5xxs in a row the breaker opens and calls fail
+# straight away with AdzunaUnavailable until reset_seconds have passed;
+# then one trial call decides whether it closes again.
+
+
+class AdzunaUnavailable(RuntimeError):
+    pass
+
+
+RATE_LIMIT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class TokenBucket:
+    name = "memory"
+
+    def __init__(self, per_minute: float, burst: int = 6):
+        # per_minute <= 0 turns the limit off.
+        self.rate = max(0.0, float(per_minute)) / 60
+        self.burst = max(1, int(burst))
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated_at = time.time()
+
+        self.granted = 0
+        self.waited = 0
+        self.refused = 0
+
+    def _refill(self, tokens: float, updated_at: float, now: float) -> tuple[float, float]:
+        # Returns (tokens left, seconds to wait); no wait means one was taken.
+        tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate)
+        if tokens >= 1:
+            return tokens - 1, 0.0
+        return tokens, (1 - tokens) / self.rate
+
+    def _take(self) -> float:
+        with self._lock:
+            now = time.time()
+            self._tokens, wait = self._refill(self._tokens, self._updated_at, now)
+            self._updated_at = now
+            return wait
+
+    def acquire(self, timeout: float = 5) -> bool:
+        if not self.rate:
+            return True
+
+        deadline = time.monotonic() + max(0.0, timeout)
+        waited = False
+        while True:
+            wait = self._take()
+            if not wait:
+                with self._lock:
+                    self.granted += 1
+                    self.waited += waited
+                return True
+            if time.monotonic() + wait > deadline:
+                with self._lock:
+                    self.refused += 1
+                return False
+            waited = True
+            time.sleep(wait)
+
+    def tokens(self) -> float:
+        with self._lock:
+            now = time.time()
+            return min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+
+    def stats(self) -> dict:
+        tokens = self.tokens()
+        with self._lock:
+            return {
+                "store": self.name,
+                "per_minute": round(self.rate * 60, 2),
+                "burst": self.burst,
+                "tokens": round(tokens, 2),
+                "granted": self.granted,
+                "waited": self.waited,
+                "refused": self.refused,
+            }
+
+
+class SQLiteTokenBucket(TokenBucket):
+    name = "sqlite"
+
+    def __init__(self, path: str, per_minute: float, burst: int = 6, bucket: str = "adzuna"):
+        super().__init__(per_minute, burst)
+        self.path = path
+        self.bucket = bucket
+        self._pool = SQLiteThreadPool(self._connect, name="rate-limit")
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5, isolation_level=None)
+        apply_sqlite_pragmas(conn, cache_size_kb=500, mmap_size=0)
+        return conn
+
+    def _conn(self):
+        conn = self._pool.acquire()
+        if not self._schema_ready:
+            with self._schema_lock:
+                conn.execute(RATE_LIMIT_SCHEMA)
+                self._schema_ready = True
+        return conn
+
+    def _read(self, conn) -> tuple[float, float]:
+        row = conn.execute(
+            "SELECT tokens, updated_at FROM rate_limits WHERE name = ?", (self.bucket,)
+        ).fetchone()
+        return row if row is not None else (float(self.burst), time.time())
+
+    def _take(self) -> float:
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers
+        # cannot both read the same count and spend the same token.
+        with self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                tokens, updated_at = self._read(conn)
+                now = time.time()
+                tokens, wait = self._refill(tokens, updated_at, now)
+                conn.execute(
+                    """
+                    INSERT INTO rate_limits (name, tokens, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT (name) DO UPDATE SET
+                        tokens = excluded.tokens,
+                        updated_at = excluded.updated_at
+                    """,
+                    (self.bucket, tokens, now),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def tokens(self) -> float:
+        with self._conn() as conn:
+            tokens, updated_at = self._read(conn)
+        return min(self.burst, tokens + max(0.0, time.time() - updated_at) * self.rate)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["path"] = self.path
+        return stats
+
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_seconds = max(0.0, float(reset_seconds))
+        self._lock = threading.Lock()
+
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._open_for = self.reset_seconds
+        self._trial_running = False
+
+        self.opened = 0
+        self.rejected = 0
+        self.last_error = ""
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == BREAKER_OPEN:
+                if time.monotonic() - self._opened_at < self._open_for:
+                    self.rejected += 1
+                    return False
+                self._state = BREAKER_HALF_OPEN
+                self._trial_running = False
+
+            if self._state == BREAKER_HALF_OPEN:
+                if self._trial_running:
+                    self.rejected += 1
+                    return False
+                self._trial_running = True
+            return True
+
+    def release(self):
+        # The call allow() let through never went out (e.g. no rate limit
+        # token), so let the next one be the trial instead.
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = BREAKER_CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self, error: str = "", open_for: Optional[float] = None):
+        # open_for opens the breaker at once for that long, e.g. from a
+        # 429's Retry-After header.
+        with self._lock:
+            self._failures += 1
+            self.last_error = error
+            if (
+                open_for is not None
+                or self._state == BREAKER_HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self._state != BREAKER_OPEN:
+                    self.opened += 1
+                self._state = BREAKER_OPEN
+                self._opened_at = time.monotonic()
+                self._open_for = max(self.reset_seconds, open_for or 0)
+                self._trial_running = False
+
+    def state(self) -> str:
+        with self._lock:
+            if self._state == BREAKER_OPEN and time.monotonic() - self._opened_at >= self._open_for:
+                return BREAKER_HALF_OPEN
+            return self._state
+
+    def stats(self) -> dict:
+        state = self.state()
+        with self._lock:
+            retry_in = 0.0
+            if state == BREAKER_OPEN:
+                retry_in = self._open_for - (time.monotonic() - self._opened_at)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in_seconds": round(max(0.0, retry_in), 1),
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "last_error": self.last_error,
+            }
+
+
+class HttpClient:
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        connect_timeout: float = 5,
+        read_timeout: float = 30,
+    ):
+        # pool_connections is how many hosts keep a pool, pool_maxsize how
+        # many idle connections each pool keeps. Requests beyond that still
+        # go out; their connections are just closed afterwards.
+        self.timeout = (float(connect_timeout), float(read_timeout))
+        self._adapter = HTTPAdapter(
+            pool_connections=max(1, int(pool_connections)),
+            pool_maxsize=max(1, int(pool_maxsize)),
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.errors = 0
+
+    def get(self, url: str, params: Optional[dict] = None, timeout=None) -> requests.Response:
+        with self._lock:
+            self.requests += 1
+        try:
+            return self.session.get(url, params=params, timeout=timeout or self.timeout)
+        except requests.RequestException:
+            with self._lock:
+                self.errors += 1
+            raise
+
+    def close(self):
+        self.session.close()
+
+    def stats(self) -> dict:
+        # urllib3 counts, per host pool, the requests sent and the
+        # connections it had to open; the difference went over a reused one.
+        pools = self._adapter.poolmanager.pools
+        opened = 0
+        sent = 0
+        hosts = []
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            sent += pool.num_requests
+            hosts.append(pool.host)
+
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "connections_opened": opened,
+                "connections_reused": max(0, sent - opened),
+                "hosts": hosts,
+                "connect_timeout": self.timeout[0],
+                "read_timeout": self.timeout[1],
+            }
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def guarded_get(
+    http: HttpClient,
+    url: str,
+    params: dict,
+    limiter: TokenBucket,
+    breaker: CircuitBreaker,
+    rate_limit_wait: float = 5,
+    timeout=None,
+) -> requests.Response:
+    # Raises AdzunaUnavailable when the call is refused or the upstream is
+    # struggling. Any other answer (including a 4xx other than 429) means
+    # Adzuna is up, and is returned for the caller to check.
+    if not breaker.allow():
+        raise AdzunaUnavailable("Adzuna is unavailable (circuit open)")
+    if not limiter.acquire(timeout=rate_limit_wait):
+        breaker.release()
+        raise AdzunaUnavailable("Adzuna rate limit reached")
+
+    try:
+        response = http.get(url, params=params, timeout=timeout)
+    except requests.RequestException as e:
+        breaker.record_failure(type(e).__name__)
+        raise AdzunaUnavailable(f"Adzuna request failed: {e}") from e
+
+    if response.status_code == 429 or response.status_code >= 500:
+        error = f"HTTP {response.status_code}"
+        breaker.record_failure(error, _retry_after(response) if response.status_code == 429 else None)
+        raise AdzunaUnavailable(f"Adzuna returned {error}")
+
+    breaker.record_success()
+    return response
+
+
+class QueryFanOut:
+    def __init__(self, workers: int = 16, width: int = 2):
+        # The workers threads are shared by every search in the process;
+        # each search keeps at most width of its fallbacks on them at once.
+        self.workers = max(1, int(workers))
+        self.width = max(1, int(width))
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="adzuna")
+        self._lock = threading.Lock()
+
+        self.searches = 0
+        self.queries_sent = 0
+        self.queries_cancelled = 0
+        self.queries_failed = 0
+
+    def _counted(self, call: Callable[[], Any]):
+        try:
+            return call()
+        except Exception:
+            with self._lock:
+                self.queries_failed += 1
+            raise
+
+    def results(self, queries: list[str], fetch: Callable[[str], Any]) -> Iterator[tuple[str, Any]]:
+        # Yields (query, fetch(query)) in the order given. The first query
+        # runs on the caller's thread, so it never waits behind other
+        # searches' fallbacks; once the caller asks for the next result, up
+        # to width of the rest are in flight on the shared pool. A failed
+        # fetch is raised when its turn comes, like the serial loop did.
+        # Closing the generator early (break, or an exception in the caller)
+        # cancels everything that has not started; requests already on the
+        # wire finish on their own and are ignored.
+        queries = list(queries)
+        futures = []
+        sent = 0
+
+        with self._lock:
+            self.searches += 1
+
+        try:
+            for i, query in enumerate(queries):
+                if i == 0:
+                    sent += 1
+                    yield query, self._counted(lambda: fetch(query))
+                    continue
+                while len(futures) < min(i - 1 + self.width, len(queries) - 1):
+                    futures.append(self._executor.submit(fetch, queries[len(futures) + 1]))
+                yield query, self._counted(futures[i - 1].result)
+        finally:
+            cancelled = sum(1 for future in futures if future.cancel())
+            with self._lock:
+                self.queries_sent += sent + len(futures) - cancelled
+                self.queries_cancelled += len(queries) - sent - len(futures) + cancelled
+
+    def close(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "searches": self.searches,
+                "queries_sent": self.queries_sent,
+                "queries_cancelled": self.queries_cancelled,
+                "queries_failed": self.queries_failed,
+            }
@@ -0,0 +1,199 @@
+from collections import Counter
+
+# =========================================================
+# PROFILE ANALYTICS
+# =========================================================
+# Analytics are built from per-user counters: {metric: {name: count}}.
+# count_profile() derives them from the full saved job / CV / application
+# lists, and the *_deltas() helpers give the change a single save, upload or
+# status change makes to them. The repository keeps a user_analytics table
+# in sync with those deltas, so the profile page reads counters instead of
+# recounting the whole history; both paths go through summarize() and give
+# identical output.
+
+SKILL = "skill"
+QUALIFICATION = "qualification"
+MISSING_SKILL = "missing_skill"
+ROLE = "role"
+INDUSTRY = "industry"
+STATUS = "status"
+TOTAL = "total"
+
+SAVED_JOBS_TOTAL = "saved_jobs"
+UPLOADED_CVS_TOTAL = "uploaded_cvs"
+APPLICATIONS_TOTAL = "applications"
+MATCH_RATE_TOTAL = "match_rate"
+STRONG_MATCHES = "strong_matches"
+GOOD_MATCHES = "good_matches"
+WEAK_MATCHES = "weak_matches"
+
+# Counter names are stored in an indexed NVARCHAR(255) column on Azure SQL.
+NAME_MAX = 255
+
+
+def _key(value) -> str:
+    return str(value).strip().lower()[:NAME_MAX]
+
+
+def match_bucket(match_percentage: int) -> str:
+    if match_percentage >= 80:
+        return STRONG_MATCHES
+    if match_percentage >= 50:
+        return GOOD_MATCHES
+    return WEAK_MATCHES
+
+
+def saved_job_deltas(job: dict, sign: int = 1) -> Counter:
+    deltas = Counter()
+    match_percentage = int(job.get("match_percentage", 0) or 0)
+
+    deltas[(TOTAL, SAVED_JOBS_TOTAL)] += sign
+    deltas[(TOTAL, MATCH_RATE_TOTAL)] += sign * match_percentage
+    deltas[(TOTAL, match_bucket(match_percentage))] += sign
+
+    role_name = job.get("title") or job.get("job_title") or "Untitled role"
+    deltas[(ROLE, str(role_name)[:NAME_MAX])] += sign
+
+    industry_name = job.get("industry") or ""
+    if industry_name:
+        deltas[(INDUSTRY, str(industry_name)[:NAME_MAX])] += sign
+
+    for missing_skill in job.get("missing_skills", []):
+        key = _key(missing_skill)
+        if key:
+            deltas[(MISSING_SKILL, key)] += sign
+
+    return deltas
+
+
+def cv_deltas(skills: list, qualifications: list, sign: int = 1) -> Counter:
+    deltas = Counter()
+    deltas[(TOTAL, UPLOADED_CVS_TOTAL)] += sign
+
+    for skill in skills or []:
+        key = _key(skill)
+        if key:
+            deltas[(SKILL, key)] += sign
+
+    for qual in qualifications or []:
+        key = _key(qual)
+        if key:
+            deltas[(QUALIFICATION, key)] += sign
+
+    return deltas
+
+
+def application_deltas(old_status, new_status) -> Counter:
+    # old_status is None for a new application.
+    deltas = Counter()
+
+    if old_status is None:
+        deltas[(TOTAL, APPLICATIONS_TOTAL)] += 1
+    elif str(old_status) == str(new_status):
+        return deltas
+    else:
+        deltas[(STATUS, str(old_status))] -= 1
+
+    deltas[(STATUS, str(new_status))] += 1
+    return deltas
+
+
+def count_profile(saved_jobs: list, uploaded_cvs: list, applications: list) -> dict:
+    deltas = Counter()
+
+    for cv in uploaded_cvs:
+        deltas.update(cv_deltas(cv.get("skills", []), cv.get("qualifications", [])))
+
+    for job in saved_jobs:
+        deltas.update(saved_job_deltas(job))
+
+    for application in applications:
+        deltas.update(application_deltas(None, application.get("status", "Applied")))
+
+    return counters_from_deltas(deltas)
+
+
+def counters_from_deltas(deltas) -> dict:
+    counters = {}
+    for (metric, name), count in deltas.items():
+        if count:
+            counters.setdefault(metric, {})[name] = count
+    return counters
+
+
+def diff_counters(expected: dict, actual: dict) -> list[dict]:
+    mismatches = []
+    for metric in sorted(set(expected) | set(actual)):
+        want = expected.get(metric, {})
+        have = actual.get(metric, {})
+        for name in sorted(set(want) | set(have)):
+            if want.get(name, 0) != have.get(name, 0):
+                mismatches.append({
+                    "metric": metric,
+                    "name": name,
+                    "expected": want.get(name, 0),
+                    "actual": have.get(name, 0),
+                })
+    return mismatches
+
+
+def _ranked(counter: dict) -> list[tuple]:
+    return sorted(
+        ((name, count) for name, count in counter.items() if count > 0),
+        key=lambda x: (-x[1], x[0])
+    )
+
+
+def summarize(counters: dict) -> dict:
+    totals = counters.get(TOTAL, {})
+    statuses = counters.get(STATUS, {})
+
+    saved_jobs_count = totals.get(SAVED_JOBS_TOTAL, 0)
+    applications_count = totals.get(APPLICATIONS_TOTAL, 0)
+
+    top_missing_skills = [
+        {"skill": skill, "count": count}
+        for skill, count in _ranked(counters.get(MISSING_SKILL, {}))[:5]
+    ]
+
+    role_breakdown = [
+        {"name": name, "count": count}
+        for name, count in _ranked(counters.get(ROLE, {}))[:5]
+    ]
+
+    application_status_breakdown = [
+        {"name": name, "count": count}
+        for name, count in _ranked(statuses)
+    ]
+
+    industries = _ranked(counters.get(INDUSTRY, {}))
+
+    average_match_rate = (
+        round(totals.get(MATCH_RATE_TOTAL, 0) / saved_jobs_count)
+        if saved_jobs_count else 0
+    )
+
+    return {
+        "all_extracted_skills": [skill for skill, _ in _ranked(counters.get(SKILL, {}))],
+        "all_extracted_qualifications": [
+            qualification for qualification, _ in _ranked(counters.get(QUALIFICATION, {}))
+        ],
+        "analytics": {
+            "average_match_rate": average_match_rate,
+            "saved_jobs_count": saved_jobs_count,
+            "uploaded_cv_count": totals.get(UPLOADED_CVS_TOTAL, 0),
+            "applications_count": applications_count,
+            "applied_jobs_count": applications_count,
+            "interviewing_count": statuses.get("Interviewing", 0),
+            "offer_count": statuses.get("Offer", 0),
+            "rejected_count": statuses.get("Rejected", 0),
+            "strong_matches": totals.get(STRONG_MATCHES, 0),
+            "good_matches": totals.get(GOOD_MATCHES, 0),
+            "weak_matches": totals.get(WEAK_MATCHES, 0),
+            "top_missing_skills": top_missing_skills,
+            "role_breakdown": role_breakdown,
+            "application_status_breakdown": application_status_breakdown,
+            "best_fit_role": role_breakdown[0]["name"] if role_breakdown else "",
+            "best_fit_industry": industries[0][0] if industries else "",
+        },
+    }
@@ -0,0 +1,691 @@
+import argparse
+import io
+import json
+import math
+import os
+import random
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from db import SQLiteThreadPool
+from migrations import run_migrations
+from analytics import summarize
+from matcher import KeywordMatcher, get_matcher
+from cv_jobs import LocalJobQueue
+from cv_parsing import PdfExtractor, extract_text_from_pdf
+from taxonomy import DEFAULT_TAXONOMY_PATH, TaxonomyStore, load_taxonomy
+from job_matching import LocalJobIndex, parse_skill_list
+from job_scoring import JobBatch, rank, title_bonus
+from bm25 import BM25Index, tokenize, top_relevant
+from job_dataset import load_job_dataset
+from repository import Repository, SQLITE
+
+_taxonomy = load_taxonomy(DEFAULT_TAXONOMY_PATH)
+SKILL_KEYWORDS = _taxonomy.skills.names
+QUALIFICATION_KEYWORDS = _taxonomy.qualifications.names
+
+# =========================================================
+# BENCHMARK HELPERS
+# =========================================================
+# Run with: python benchmarks.py <name> [--rows N]
+# Each benchmark builds its own throwaway SQLite database under a temp dir
+# and never touches just_apply_local.db.
+
+
+def timed(fn, repeat: int = 200) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def make_repository(path: str) -> Repository:
+    def connect():
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    return Repository(SQLiteThreadPool(connect).acquire, SQLITE)
+
+
+def report(title: str, rows: list[tuple[str, float]]):
+    print(f"\n{title}")
+    for label, ms in rows:
+        print(f"  {label:<52} {ms:10.3f} ms")
+
+
+# =========================================================
+# INDEXES (history lookups at scale)
+# =========================================================
+def bench_indexes(rows: int = 1_000_000, users: int = 2_000):
+    workdir = tempfile.mkdtemp(prefix="just-apply-bench-")
+    path = os.path.join(workdir, "bench.db")
+
+    conn = sqlite3.connect(path)
+    run_migrations(conn, "sqlite", target=1)
+
+    rng = random.Random(42)
+    emails = [f"user{i}@example.com" for i in range(users)]
+
+    print(f"Seeding {rows:,} emailed_jobs_history rows and {rows // 10:,} saved_jobs rows...")
+    conn.executemany(
+        "INSERT INTO emailed_jobs_history (user_email, external_job_id, title) VALUES (?, ?, ?)",
+        ((emails[i % users], f"ext-{i}", "Role") for i in range(rows)),
+    )
+    conn.executemany(
+        "INSERT INTO saved_jobs (user_email, job_id, title, raw_job_json) VALUES (?, ?, ?, ?)",
+        ((emails[i % users], f"job-{i}", "Role", "{}") for i in range(rows // 10)),
+    )
+    conn.commit()
+
+    repo = make_repository(path)
+    probes = [(emails[i % users], f"ext-{i}") for i in rng.sample(range(rows), 50)]
+
+    def measure():
+        probe = iter(probes * 10)
+        dedupe_ms = timed(lambda: repo.has_job_been_emailed(*next(probe)), repeat=len(probes) * 10)
+        listing_ms = timed(lambda: repo.get_saved_jobs(rng.choice(emails)), repeat=200)
+        return dedupe_ms, listing_ms
+
+    before = measure()
+    start = time.perf_counter()
+    run_migrations(conn, "sqlite")
+    migrate_ms = (time.perf_counter() - start) * 1000
+    after = measure()
+    conn.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    report(f"Index benchmark ({rows:,} history rows, {users:,} users)", [
+        ("has_job_been_emailed (no index)", before[0]),
+        ("has_job_been_emailed (ux_emailed_jobs_user_job)", after[0]),
+        ("get_saved_jobs (no index)", before[1]),
+        ("get_saved_jobs (ix_saved_jobs_user_saved_at)", after[1]),
+        ("migrations 2-5 (one-off)", migrate_ms),
+    ])
+
+
+# =========================================================
+# ANALYTICS ENGINES (profile analytics for one heavy user)
+# =========================================================
+def bench_analytics(rows: int = 10_000):
+    workdir = tempfile.mkdtemp(prefix="just-apply-bench-")
+    path = os.path.join(workdir, "bench.db")
+
+    conn = sqlite3.connect(path)
+    run_migrations(conn, "sqlite")
+
+    rng = random.Random(42)
+    email = "heavy@example.com"
+    titles = [f"Role {i}" for i in range(40)] + [""]
+    industries = ["IT", "Finance", "Health", "Retail", ""]
+    skills = ["python", "sql", "excel", "aws", "docker", "react", "java", "tableau"]
+    statuses = ["Applied", "Interviewing", "Offer", "Rejected"]
+
+    def saved_job(i):
+        job = {
+            "id": f"job-{i}",
+            "title": rng.choice(titles),
+            "industry": rng.choice(industries),
+            "match_percentage": rng.randint(0, 100),
+            "missing_skills": rng.sample(skills, rng.randint(0, 4)),
+        }
+        return (
+            email, job["id"], job["title"], job["industry"], job["match_percentage"],
+            json.dumps(job["missing_skills"]), json.dumps(job),
+        )
+
+    print(f"Seeding {rows:,} saved jobs, {rows // 10:,} applications and 50 CVs for one user...")
+    conn.executemany(
+        "INSERT INTO saved_jobs (user_email, job_id, title, industry, match_percentage, "
+        "missing_skills, raw_job_json) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (saved_job(i) for i in range(rows)),
+    )
+    conn.executemany(
+        "INSERT INTO job_applications (user_email, external_job_id, source_name, status) "
+        "VALUES (?, ?, 'Adzuna', ?)",
+        ((email, f"job-{i}", rng.choice(statuses)) for i in range(rows // 10)),
+    )
+    conn.executemany(
+        "INSERT INTO user_cvs (user_email, original_name, stored_filename, "
+        "extracted_skills, extracted_qualifications) VALUES (?, 'cv.pdf', ?, ?, ?)",
+        ((email, f"cv-{i}", json.dumps(rng.sample(skills, 4)), json.dumps(["BSc"])) for i in range(50)),
+    )
+    conn.commit()
+    conn.close()
+
+    repo = make_repository(path)
+    repo.rebuild_user_analytics(email)
+
+    engines = {
+        "python": lambda: summarize(repo.recompute_user_analytics(email)),
+        "sql": lambda: summarize(repo.aggregate_user_analytics(email)),
+        "summary": lambda: summarize(repo.get_user_analytics(email)),
+    }
+
+    results = {name: engine() for name, engine in engines.items()}
+    assert results["python"] == results["sql"] == results["summary"], "engines disagree"
+
+    timings = [(f"{name} engine", timed(engine, repeat=20)) for name, engine in engines.items()]
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    report(f"Profile analytics engines ({rows:,} saved jobs, identical output)", timings)
+
+
+# =========================================================
+# KEYWORD MATCHER (CV extraction and Adzuna job scoring)
+# =========================================================
+def reference_keyword_match(text: str, keywords: list[str]) -> list[str]:
+    # CV keyword matching before the matcher (word-boundary regex, then a
+    # loose scan), minus dedupe and text cleaning.
+    text = text.lower()
+    found = []
+    for kw in keywords:
+        kw_lower = kw.lower().strip()
+        if re.search(rf"\b{re.escape(kw_lower)}\b", text):
+            found.append(kw)
+        elif kw_lower.replace(" ", "") in text.replace(" ", ""):
+            found.append(kw)
+    return found
+
+
+def reference_substring_match(text: str, keywords: list[str], whole_word=()) -> list[str]:
+    # normalize_adzuna_job's per-keyword `in` scan before the matcher, plus
+    # a regex spelling of whole-word matching.
+    found = []
+    for kw in keywords:
+        pattern = kw.lower().strip()
+        if kw in whole_word:
+            if re.search(rf"(?<!\w){re.escape(pattern)}(?!\w)", text):
+                found.append(kw)
+        elif pattern in text:
+            found.append(kw)
+    return found
+
+
+def check_matcher_equivalence(rng: random.Random, cases: int = 3_000):
+    # Randomised property check: for keyword lists full of shared prefixes,
+    # suffixes and spaces, both matcher paths agree with the old functions.
+    alphabet = "ab c.#+"
+    words = SKILL_KEYWORDS + QUALIFICATION_KEYWORDS
+
+    for _ in range(cases):
+        keywords = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 12))
+        ] + rng.sample(words, 5)
+        text = " ".join(
+            rng.choice(words) if rng.random() < 0.2
+            else "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6)))
+            for _ in range(rng.randint(0, 30))
+        ).lower()
+
+        candidates = [kw for kw in keywords if kw.strip()]
+        whole_word = set(rng.sample(candidates, rng.randint(0, len(candidates))))
+
+        for min_size in (1, 10_000):
+            loose = KeywordMatcher(keywords, ignore_spaces=True, automaton_min_keywords=min_size)
+            exact = KeywordMatcher(keywords, automaton_min_keywords=min_size)
+            bounded = KeywordMatcher(keywords, automaton_min_keywords=min_size, whole_word=whole_word)
+            assert loose.find(text) == reference_keyword_match(text, keywords), (keywords, text)
+            assert exact.find(text) == reference_substring_match(text, keywords), (keywords, text)
+            assert bounded.find(text) == reference_substring_match(text, keywords, whole_word), (keywords, text)
+
+    print(f"Equivalence: {cases:,} random keyword lists/texts agree on both matcher paths")
+
+
+def bench_matcher(rows: int = 10_000):
+    rng = random.Random(42)
+    check_matcher_equivalence(rng)
+
+    vocabulary = (
+        "the of and with team experience years strong communication developer "
+        "engineer analyst role remote hybrid agile stakeholders reporting"
+    ).split() + SKILL_KEYWORDS + QUALIFICATION_KEYWORDS
+
+    cv_text = " ".join(rng.choice(vocabulary) for _ in range(40_000)).lower()
+    descriptions = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(40, 90))).lower()
+        for _ in range(rows)
+    ]
+    taxonomy = [f"skill{i} term" for i in range(5_000)] + SKILL_KEYWORDS
+
+    loose = KeywordMatcher(SKILL_KEYWORDS, ignore_spaces=True)
+    skills = KeywordMatcher(SKILL_KEYWORDS)
+    quals = KeywordMatcher(QUALIFICATION_KEYWORDS)
+    skills_automaton = KeywordMatcher(SKILL_KEYWORDS, automaton_min_keywords=1)
+    quals_automaton = KeywordMatcher(QUALIFICATION_KEYWORDS, automaton_min_keywords=1)
+    taxonomy_scan = KeywordMatcher(taxonomy, automaton_min_keywords=len(taxonomy) + 1)
+    taxonomy_automaton = KeywordMatcher(taxonomy)
+
+    def jobs(match):
+        for text in descriptions:
+            match(text)
+
+    report(f"Keyword matching ({len(cv_text) // 1000} KB CV, {rows:,} job descriptions)", [
+        ("CV skills: old regex + loose scan", timed(lambda: reference_keyword_match(cv_text, SKILL_KEYWORDS), 5)),
+        ("CV skills: matcher (space-insensitive)", timed(lambda: loose.find(cv_text), 5)),
+        ("jobs: old per-keyword `in` scan", timed(lambda: jobs(
+            lambda t: (reference_substring_match(t, SKILL_KEYWORDS), reference_substring_match(t, QUALIFICATION_KEYWORDS))
+        ), 3)),
+        ("jobs: matcher (scan path)", timed(lambda: jobs(lambda t: (skills.find(t), quals.find(t))), 3)),
+        ("jobs: matcher (forced automaton)", timed(lambda: jobs(
+            lambda t: (skills_automaton.find(t), quals_automaton.find(t))
+        ), 3)),
+        (f"jobs: {len(taxonomy):,}-keyword scan", timed(lambda: jobs(taxonomy_scan.find), 1)),
+        (f"jobs: {len(taxonomy):,}-keyword automaton", timed(lambda: jobs(taxonomy_automaton.find), 1)),
+    ])
+
+
+# =========================================================
+# SKILL TAXONOMY (5k entries)
+# =========================================================
+def bench_taxonomy(rows: int = 5_000):
+    rng = random.Random(42)
+    workdir = tempfile.mkdtemp(prefix="just-apply-bench-")
+    path = os.path.join(workdir, "taxonomy.json")
+
+    with open(DEFAULT_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    for i in range(rows - len(data["skills"])):
+        data["skills"].append({
+            "name": f"skill {i} platform",
+            "category": "generated",
+            "aliases": [f"sk{i}", f"skill{i}"],
+            "roles": [rng.choice(data["role_priority"])],
+        })
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    start = time.perf_counter()
+    store = TaxonomyStore(path, reload_seconds=0)
+    taxonomy = store.get()
+    compile_ms = (time.perf_counter() - start) * 1000
+    taxonomy.skills.find_loose("")
+
+    vocabulary = (
+        "the of and with team experience years developer engineer analyst remote "
+        "python k8s js power bi reactjs sk12 skill 40 platform skill4000"
+    ).split()
+    descriptions = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(40, 90))).lower()
+        for _ in range(1_000)
+    ]
+    cv_text = " ".join(rng.choice(vocabulary) for _ in range(8_000))
+    per_keyword = [entry["name"] for entry in data["skills"]]
+
+    def jobs(match):
+        for text in descriptions:
+            match(text)
+
+    report(f"Skill taxonomy ({len(taxonomy.skills):,} skills, 1,000 job descriptions)", [
+        ("compile taxonomy file", compile_ms),
+        ("jobs: per-keyword `in` scan (names only)", timed(lambda: jobs(
+            lambda t: [kw for kw in per_keyword if kw in t]
+        ), 3)),
+        ("jobs: taxonomy.skills.find (names + aliases)", timed(lambda: jobs(taxonomy.skills.find), 3)),
+        ("CV: taxonomy.skills.find_loose (8k words)", timed(lambda: taxonomy.skills.find_loose(cv_text), 20)),
+        ("hot-reload check, file unchanged", timed(store.get, 1_000)),
+    ])
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+# =========================================================
+# PDF EXTRACTION (serial vs page-parallel)
+# =========================================================
+def make_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    # A plain multi-page text PDF, written by hand so the benchmark needs
+    # nothing beyond PyPDF2 to read it back.
+    words = SKILL_KEYWORDS + ["experience", "team", "delivered", "project", "built"]
+    rng = random.Random(13)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+
+    for _ in range(pages):
+        lines = [" ".join(rng.choice(words) for _ in range(10)) for _ in range(lines_per_page)]
+        stream = "BT /F1 10 Tf 14 TL 40 800 Td " + " ".join(
+            f"({line}) '" for line in lines
+        ) + " ET"
+        content = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(len(objects))
+
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), pages
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def bench_pdf(rows: int = 200):
+    data = make_pdf(rows)
+    queue = LocalJobQueue(parse_workers=os.cpu_count() or 2)
+    workers = queue.parse_workers
+    full = PdfExtractor(queue.submit_parse, workers, max_pages=rows, time_budget=300, target_chars=0)
+    budgeted = PdfExtractor(queue.submit_parse, workers)
+
+    serial = extract_text_from_pdf(io.BytesIO(data))
+    assert full.extract(data) == serial, "page-parallel extraction differs from the serial reader"
+    assert serial.startswith(budgeted.extract(data)), "budgeted extraction is not a prefix of the full text"
+    print(f"{rows}-page PDF, {len(data) // 1024} KB, {len(serial)} chars, {queue.parse_workers} workers")
+
+    report("PDF text extraction", [
+        ("serial PdfReader, every page", timed(lambda: extract_text_from_pdf(io.BytesIO(data)), 3)),
+        ("PdfExtractor, every page in parallel", timed(lambda: full.extract(data), 3)),
+        ("PdfExtractor, default budgets (early stop)", timed(lambda: budgeted.extract(data), 3)),
+    ])
+
+    queue.close()
+
+
+# =========================================================
+# LOCAL JOB MATCHING (/api/match-jobs at dataset scale)
+# =========================================================
+def make_postings(rows: int, rng: random.Random) -> list[dict]:
+    # Shaped like jobPosts/jobposts.csv, skills column and all.
+    titles = ["data scientist", "data analyst", "frontend developer", "cloud engineer", "software engineer", "product manager"]
+    skills = SKILL_KEYWORDS + ["spark", "scala", "tableau", "hadoop"]
+    return [
+        {
+            "job_title": rng.choice(titles),
+            "company": f"company_{i:05d}",
+            "location": rng.choice(["Austin, TX", "New York, NY", "Remote"]),
+            "industry": rng.choice(["Technology", "Finance", "Retail"]),
+            "skills": str(rng.sample(skills, rng.randint(0, 9))),
+        }
+        for i in range(rows)
+    ]
+
+
+def reference_local_match(postings: list[dict], skills: list, quals: list, top_n: int) -> list[tuple]:
+    # One posting at a time with Python sets, the way normalize_adzuna_job
+    # scores, then a full stable sort.
+    user_skills = {_taxonomy.skills.canonical(s) for s in skills}
+    user_quals = {_taxonomy.qualifications.canonical(q) for q in quals}
+    scored = []
+
+    for i, posting in enumerate(postings):
+        job_skills = list(dict.fromkeys(_taxonomy.skills.canonical(s) for s in parse_skill_list(posting["skills"])))
+        job_quals = _taxonomy.qualifications.find(f"{posting['job_title']} {posting['industry']}")
+        matched = [s for s in job_skills if s in user_skills]
+        bonus = title_bonus(posting["job_title"], user_skills)
+        total = len(matched) * 2 + sum(1 for q in job_quals if q in user_quals) + bonus
+        percentage = round(len(matched) / len(job_skills) * 100) if job_skills else 15
+        if bonus > 0 and percentage < 35:
+            percentage = 35
+        if total > 0:
+            scored.append((percentage, total, len(matched), i))
+
+    scored.sort(key=lambda row: row[:3], reverse=True)
+    return [(f"dataset-{i}", percentage, total) for percentage, total, _, i in scored[:top_n]]
+
+
+def bench_local_match(rows: int = 100_000):
+    rng = random.Random(42)
+    postings = make_postings(rows, rng)
+    profiles = [
+        (["python", "sql", "power bi"], ["bsc"]),
+        (["react", "javascript", "css", "html", "typescript"], []),
+        (["aws", "docker", "kubernetes", "terraform", "python", "java"], ["aws certified"]),
+        ([], []),
+    ]
+
+    start = time.perf_counter()
+    index = LocalJobIndex.from_rows(postings, _taxonomy)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    sample = postings[:5_000]
+    sample_index = LocalJobIndex.from_rows(sample, _taxonomy)
+    for skills, quals in profiles:
+        jobs, _ = sample_index.match(skills, quals, 50)
+        got = [(job["job_id"], job["match_percentage"], job["total_score"]) for job in jobs]
+        assert got == reference_local_match(sample, skills, quals, 50), skills
+    print(f"Equivalence: {len(profiles)} profiles rank 5,000 postings the same as per-posting scoring")
+
+    skills, quals = profiles[0]
+    report(f"Local job matching ({rows:,} postings, top 10)", [
+        ("build index (parse skills column once)", build_ms),
+        ("per-posting Python scoring + full sort", timed(lambda: reference_local_match(postings, skills, quals, 10), 1)),
+    ] + [
+        (f"LocalJobIndex.match, {len(s)} skills", timed(lambda s=s, q=q: index.match(s, q, 10), 50))
+        for s, q in profiles
+    ])
+
+
+# =========================================================
+# JOB SCORING (per-job loops vs JobBatch bitsets)
+# =========================================================
+def reference_job_score(text: str, title: str, user_skills: list, user_quals: list) -> tuple:
+    # normalize_adzuna_job's scoring, one job at a time.
+    skills = [str(skill).lower().strip() for skill in user_skills]
+    quals = [str(q).lower().strip() for q in user_quals]
+    job_skills = _taxonomy.skills.find(text)
+    job_quals = set(_taxonomy.qualifications.find(text))
+    user_skill_set = {_taxonomy.skills.canonical(skill) for skill in skills if skill}
+    found_skills = set(get_matcher(tuple(skills)).find(text))
+    found_quals = set(get_matcher(tuple(quals)).find(text))
+
+    matched = [
+        skill for skill in skills
+        if skill and (skill in found_skills or _taxonomy.skills.canonical(skill) in job_skills)
+    ]
+    missing = [skill for skill in job_skills if skill not in user_skill_set]
+    bonus = title_bonus(title, user_skill_set)
+    qual_score = sum(
+        1 for q in quals
+        if q and (q in found_quals or _taxonomy.qualifications.canonical(q) in job_quals)
+    )
+    total = len(matched) * 2 + qual_score + bonus
+    relevant = len(matched) + len(missing)
+    percentage = round(len(matched) / relevant * 100) if relevant else 15
+    if bonus > 0 and percentage < 35:
+        percentage = 35
+    return percentage, total, len(matched), qual_score
+
+
+def make_job_texts(rows: int, rng: random.Random) -> tuple[list[str], list[str]]:
+    surfaces = list(_taxonomy.skills._canonical) + list(_taxonomy.qualifications._canonical)
+    filler = "the team role remote hybrid experience json delivery stakeholders agile".split()
+    titles = [
+        rng.choice(["Data Analyst", "Frontend Developer", "Cloud Engineer", "Software Engineer", "Chef"])
+        for _ in range(rows)
+    ]
+    texts = [
+        f"{title} " + " ".join(
+            rng.choice(surfaces) if rng.random() < 0.15 else rng.choice(filler)
+            for _ in range(rng.randint(40, 90))
+        )
+        for title in titles
+    ]
+    return [text.lower() for text in texts], titles
+
+
+def check_scoring_equivalence(rng: random.Random, cases: int = 200):
+    words = list(_taxonomy.skills._canonical) + ["json", "excel", "", " Python ", "JS"]
+    quals = list(_taxonomy.qualifications._canonical) + ["", "BSc"]
+
+    for _ in range(cases):
+        texts, titles = make_job_texts(rng.randint(0, 40), rng)
+        user_skills = [rng.choice(words) for _ in range(rng.randint(0, 8))]
+        user_quals = [rng.choice(quals) for _ in range(rng.randint(0, 3))]
+
+        scores = JobBatch(texts, titles, _taxonomy).score(user_skills, user_quals)
+        expected = [reference_job_score(text, title, user_skills, user_quals) for text, title in zip(texts, titles)]
+        got = list(zip(
+            scores["match_percentage"].tolist(), scores["total_score"].tolist(),
+            scores["skill_score"].tolist(), scores["qual_score"].tolist(),
+        ))
+        assert got == expected, (user_skills, user_quals)
+
+        order = sorted(range(len(expected)), key=lambda i: expected[i][:3], reverse=True)[:20]
+        assert rank(scores, 20).tolist() == order, (user_skills, user_quals)
+
+    print(f"Equivalence: {cases} random job sets score and rank the same as per-job scoring")
+
+
+def bench_scoring(rows: int = 100_000):
+    rng = random.Random(42)
+    check_scoring_equivalence(rng)
+
+    user_skills = ["python", "sql", "power bi", "js", "docker", "excel"]
+    user_quals = ["bsc", "aws certified"]
+
+    for size in sorted({1_000, 10_000, rows}):
+        if size > rows:
+            continue
+        texts, titles = make_job_texts(size, rng)
+        start = time.perf_counter()
+        batch = JobBatch(texts, titles, _taxonomy)
+        build_ms = (time.perf_counter() - start) * 1000
+        batch.score(user_skills, user_quals)
+
+        report(f"Job scoring ({size:,} jobs, {len(user_skills)} skills)", [
+            ("per-job scoring (normalize_adzuna_job rules)", timed(lambda: [
+                reference_job_score(text, title, user_skills, user_quals) for text, title in zip(texts, titles)
+            ], 1)),
+            ("JobBatch build (once per job set)", build_ms),
+            ("JobBatch.score, one user", timed(lambda: batch.score(user_skills, user_quals), 10)),
+            ("JobBatch.score + rank top 20", timed(lambda: rank(batch.score(user_skills, user_quals), 20), 10)),
+        ])
+
+
+def reference_relevance(documents: list[list[str]], query: str, k1: float = 1.2, b: float = 0.75) -> list[float]:
+    # BM25 one document at a time with Python dicts.
+    df: dict[str, int] = {}
+    for tokens in documents:
+        for term in set(tokens):
+            df[term] = df.get(term, 0) + 1
+    average = (sum(len(tokens) for tokens in documents) / len(documents)) or 1.0
+    terms = [term for term in dict.fromkeys(tokenize(query)) if term in df]
+
+    scores = []
+    for tokens in documents:
+        counts: dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        score = 0.0
+        for term in terms:
+            tf = counts.get(term, 0)
+            if tf:
+                idf = math.log1p((len(documents) - df[term] + 0.5) / (df[term] + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / average))
+        scores.append(score)
+    return scores
+
+
+def bench_relevance(rows: int = 100_000):
+    rng = random.Random(42)
+    postings = make_postings(rows, rng)
+    documents = [
+        f"{p['job_title']} {p['industry']} {' '.join(parse_skill_list(p['skills']))}" for p in postings
+    ]
+    query = (
+        "Data analyst with three years of Python, SQL and Power BI experience, "
+        "building Tableau dashboards on AWS for retail and finance teams. BSc Computer Science."
+    )
+
+    start = time.perf_counter()
+    index = BM25Index(documents)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    tokens = [tokenize(document) for document in documents]
+    expected = reference_relevance(tokens[:5_000], query)
+    got = BM25Index(documents[:5_000]).scores(query)
+    assert all(abs(a - b) <= 1e-4 * max(1.0, abs(b)) for a, b in zip(got, expected))
+    print("Equivalence: BM25Index scores 5,000 postings the same as per-document BM25")
+
+    report(f"BM25 relevance ({rows:,} postings, {index.stats()['terms']} terms)", [
+        ("build index (once per job set)", build_ms),
+        ("per-document Python BM25 + full sort", timed(lambda: sorted(
+            enumerate(reference_relevance(tokens, query)), key=lambda row: -row[1]
+        )[:20], 1)),
+        ("BM25Index.scores", timed(lambda: index.scores(query), 20)),
+        ("BM25Index.scores + top 20", timed(lambda: top_relevant(index.scores(query), 20), 20)),
+    ])
+
+
+def bench_dataset(rows: int = 100_000):
+    import pandas as pd
+
+    rng = random.Random(42)
+    postings = make_postings(rows, rng)
+    for posting in postings:
+        low = rng.randint(20_000, 150_000)
+        posting["salary"] = rng.choice([f"€{low:,}", f"€{low:,} - €{low + rng.randint(1, 90_000):,}", ""])
+        posting["company_size"] = f"{rng.randint(10, 90_000):,}"
+        posting["revenue"] = rng.choice(["€3.45B", "Public", "€120.5M"])
+
+    tmp = tempfile.mkdtemp(prefix="justapply-bench-")
+    try:
+        csv_path = os.path.join(tmp, "jobposts.csv")
+        cache_dir = os.path.join(tmp, "columnar")
+        pd.DataFrame(postings).to_csv(csv_path, index=False)
+
+        start = time.perf_counter()
+        load_job_dataset(csv_path, cache_dir)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        def from_csv():
+            LocalJobIndex.from_rows(pd.read_csv(csv_path).to_dict("records"), _taxonomy)
+
+        def from_cache():
+            LocalJobIndex.from_dataset(load_job_dataset(csv_path, cache_dir), _taxonomy)
+
+        report(f"Job dataset startup ({rows:,} postings)", [
+            ("columnar build (once per CSV change)", build_ms),
+            ("read_csv only", timed(lambda: pd.read_csv(csv_path), 3)),
+            ("open memory-mapped columns", timed(lambda: load_job_dataset(csv_path, cache_dir), 3)),
+            ("read_csv + LocalJobIndex (parse skills)", timed(from_csv, 3)),
+            ("mapped columns + LocalJobIndex", timed(from_cache, 3)),
+        ])
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+BENCHMARKS = {
+    "indexes": bench_indexes,
+    "analytics": bench_analytics,
+    "matcher": bench_matcher,
+    "taxonomy": bench_taxonomy,
+    "pdf": bench_pdf,
+    "match": bench_local_match,
+    "scoring": bench_scoring,
+    "relevance": bench_relevance,
+    "dataset": bench_dataset,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Just Apply backend benchmarks")
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--rows", type=int, default=None)
+    args = parser.parse_args()
+
+    bench = BENCHMARKS[args.name]
+    if args.rows:
+        bench(rows=args.rows)
+    else:
+        bench()
@@ -0,0 +1,161 @@
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import quote
+
+# =========================================================
+# CV BLOB STORAGE
+# =========================================================
+# Stored CV files go through a backend with a single upload(name, data) ->
+# url method:
+#   - AzureBlobBackend: Azure Blob Storage, or Azurite when given its
+#     connection string. Files above the SDK's single-put size are sent as
+#     blocks, max_concurrency at a time.
+#   - FilesystemBlobBackend: a directory on local disk, for working offline.
+# BlobUploader runs uploads on a background thread pool, retries failures
+# with exponential backoff, and reports each URL through a callback so the
+# CV upload request does not wait on blob storage.
+
+
+class AzureBlobBackend:
+    name = "azure"
+
+    def __init__(self, container_client, max_concurrency: int = 4):
+        self.container_client = container_client
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    def upload(self, name: str, data: bytes) -> str:
+        blob_client = self.container_client.get_blob_client(name)
+        blob_client.upload_blob(
+            data,
+            length=len(data),
+            overwrite=True,
+            max_concurrency=self.max_concurrency,
+        )
+        return blob_client.url
+
+
+class FilesystemBlobBackend:
+    name = "filesystem"
+
+    def __init__(self, root: str, base_url: str = ""):
+        # base_url is what the stored URLs start with (e.g. a static file
+        # server in front of root); without one they are file:// URLs.
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/")
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name: str) -> Path:
+        path = (self.root / name).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Blob name '{name}' escapes the storage directory")
+        return path
+
+    def upload(self, name: str, data: bytes) -> str:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename, so a reader never sees half a file.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if self.base_url:
+            return f"{self.base_url}/{quote(name)}"
+        return path.as_uri()
+
+
+class BlobUploader:
+    def __init__(
+        self,
+        backend,
+        workers: int = 2,
+        retries: int = 3,
+        backoff_seconds: float = 0.5,
+    ):
+        self.backend = backend
+        self.retries = max(0, int(retries))
+        self.backoff_seconds = max(0.0, float(backoff_seconds))
+        self._executor = ThreadPoolExecutor(max(1, int(workers)), thread_name_prefix="blob-upload")
+        self._lock = threading.Lock()
+
+        self.pending = 0
+        self.uploaded = 0
+        self.failed = 0
+        self.retried = 0
+        self.bytes_uploaded = 0
+
+    def upload(self, name: str, data: bytes) -> str:
+        # Blocking upload with retries, for callers already off the request.
+        attempt = 0
+        while True:
+            try:
+                url = self.backend.upload(name, data)
+            except Exception as e:
+                if attempt >= self.retries:
+                    raise
+                attempt += 1
+                delay = self.backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                print(f"[BLOB] Upload of {name} failed ({e}), retry {attempt}/{self.retries} in {delay:.2f}s")
+                with self._lock:
+                    self.retried += 1
+                time.sleep(delay)
+                continue
+
+            with self._lock:
+                self.bytes_uploaded += len(data)
+            return url
+
+    def submit(self, name: str, data: bytes, on_done: Optional[Callable[[Optional[str]], None]] = None) -> Future:
+        # on_done(url) runs on the uploader thread once the blob is stored,
+        # or on_done(None) when every attempt failed.
+        with self._lock:
+            self.pending += 1
+
+        def run():
+            url = None
+            try:
+                url = self.upload(name, data)
+            except Exception as e:
+                print(f"[BLOB] Giving up on {name}:", e)
+
+            with self._lock:
+                self.pending -= 1
+                if url is None:
+                    self.failed += 1
+                else:
+                    self.uploaded += 1
+
+            if on_done is not None:
+                try:
+                    on_done(url)
+                except Exception as e:
+                    print(f"[BLOB] Callback for {name} failed:", e)
+            return url
+
+        return self._executor.submit(run)
+
+    def close(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.backend.name,
+                "pending": self.pending,
+                "uploaded": self.uploaded,
+                "failed": self.failed,
+                "retried": self.retried,
+                "bytes_uploaded": self.bytes_uploaded,
+            }
@@ -0,0 +1,166 @@
+import math
+import re
+from collections import Counter
+from typing import Iterable, Optional
+
+import numpy as np
+
+# =========================================================
+# BM25 RELEVANCE INDEX
+# =========================================================
+# The "relevance" rank mode: jobs are ordered by the Okapi BM25 relevance of
+# their text to a query (usually the CV text) instead of by skill match, so
+# a rare term the CV shares with a job counts for more than a common one and
+# scores seldom tie.
+#
+# The index is a sparse term x job matrix in CSR form, held in three NumPy
+# arrays (indptr, jobs, weights) with every entry's BM25 weight computed up
+# front. Scoring a query sums the rows of its distinct terms with one
+# np.bincount, so the cost follows how many jobs share the query's terms.
+#
+# BM25Corpus is the incremental form for a set of documents that keeps
+# changing (the Adzuna jobs seen so far): documents are added and removed
+# one at a time with their term counts, and any of them is scored with the
+# document frequencies and average length of the whole set. For the same
+# documents it gives the same scores as BM25Index.
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Words and numbers, keeping "c++", "c#", "node.js" and "asp.net" whole.
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(str(text or "").lower())
+
+
+class BM25Index:
+    def __init__(self, documents: Iterable[str], k1: float = BM25_K1, b: float = BM25_B):
+        self.vocabulary: dict[str, int] = {}
+        term_ids: list[int] = []
+        lengths: list[int] = []
+
+        for document in documents:
+            tokens = tokenize(document)
+            lengths.append(len(tokens))
+            term_ids.extend(self.vocabulary.setdefault(token, len(self.vocabulary)) for token in tokens)
+
+        self.size = len(lengths)
+        size = max(1, self.size)
+        doc_lengths = np.array(lengths, dtype=np.int64)
+        jobs = np.repeat(np.arange(self.size, dtype=np.int64), doc_lengths)
+
+        # One entry per distinct (term, job), sorted by term then job, which
+        # is CSR order for a term-major matrix.
+        keys, tf = np.unique(np.array(term_ids, dtype=np.int64) * size + jobs, return_counts=True)
+        rows = keys // size
+        self.jobs = (keys % size).astype(np.int32)
+
+        df = np.bincount(rows, minlength=len(self.vocabulary))
+        self.indptr = np.concatenate(([0], np.cumsum(df)))
+
+        idf = np.log1p((self.size - df + 0.5) / (df + 0.5))
+        average = doc_lengths.mean() if doc_lengths.sum() else 1.0
+        norm = k1 * (1 - b + b * doc_lengths / average)
+        self.weights = (idf[rows] * tf * (k1 + 1) / (tf + norm[self.jobs])).astype(np.float32)
+
+    def scores(self, query: str) -> np.ndarray:
+        # BM25 score of every job; each distinct query term counts once.
+        rows = [self.vocabulary[term] for term in dict.fromkeys(tokenize(query)) if term in self.vocabulary]
+        if not rows:
+            return np.zeros(self.size)
+
+        spans = [slice(self.indptr[row], self.indptr[row + 1]) for row in rows]
+        return np.bincount(
+            np.concatenate([self.jobs[span] for span in spans]),
+            weights=np.concatenate([self.weights[span] for span in spans]),
+            minlength=self.size,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "documents": self.size,
+            "terms": len(self.vocabulary),
+            "entries": len(self.jobs),
+        }
+
+
+class BM25Corpus:
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._docs: dict = {}
+        self._df: Counter = Counter()
+        self._total_length = 0
+
+    def add(self, doc, tokens: list[str]):
+        self.remove(doc)
+        counts = Counter(tokens)
+        self._docs[doc] = (counts, len(tokens))
+        self._df.update(counts.keys())
+        self._total_length += len(tokens)
+
+    def remove(self, doc):
+        counts, length = self._docs.pop(doc, (None, 0))
+        if counts is None:
+            return
+        self._df.subtract(counts.keys())
+        for term in counts:
+            if self._df[term] <= 0:
+                del self._df[term]
+        self._total_length -= length
+
+    def __contains__(self, doc) -> bool:
+        return doc in self._docs
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def scores(self, docs: list, query: str, texts: Optional[list[str]] = None) -> np.ndarray:
+        # BM25 score of each doc; a doc that is not held is scored from
+        # its entry in texts (0 without one) against the held corpus.
+        size = len(self._docs)
+        idf = {}
+        for term in dict.fromkeys(tokenize(query)):
+            df = self._df.get(term, 0)
+            idf[term] = math.log1p((size - df + 0.5) / (df + 0.5))
+
+        result = np.zeros(len(docs))
+        if not idf:
+            return result
+
+        average = self._total_length / size if self._total_length else 1.0
+        for i, doc in enumerate(docs):
+            entry = self._docs.get(doc)
+            if entry is None:
+                tokens = tokenize(texts[i]) if texts is not None else []
+                entry = (Counter(tokens), len(tokens))
+            counts, length = entry
+            norm = self.k1 * (1 - self.b + self.b * length / average)
+            result[i] = sum(
+                idf[term] * counts[term] * (self.k1 + 1) / (counts[term] + norm)
+                for term in counts.keys() & idf.keys()
+            )
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._docs),
+            "terms": len(self._df),
+        }
+
+
+def top_relevant(scores: np.ndarray, top_n: int) -> np.ndarray:
+    # Indexes of the top_n jobs with a positive score, best first; ties go
+    # to the earlier job.
+    hits = np.flatnonzero(scores > 0)
+    if not len(hits) or top_n <= 0:
+        return hits[:0]
+
+    values = scores[hits]
+    if len(hits) > top_n:
+        threshold = -np.partition(-values, top_n - 1)[top_n - 1]
+        keep = values >= threshold
+        hits, values = hits[keep], values[keep]
+    return hits[np.lexsort((hits, -values))][:top_n]
@@ -0,0 +1,184 @@
+import csv
+import io
+import os
+import time
+import zipfile
+from typing import Callable, Optional
+
+# =========================================================
+# BULK CV INGESTION
+# =========================================================
+# Finds the CVs in a zip archive or a directory and works out whose each
+# one is. server.ingest_cv_files() does the parsing and saving; this module
+# only deals with the files and the report.
+#
+# Owners come from a manifest.csv at the top level (columns: file, email),
+# or else from the file's folder or its name, e.g. jane@uni.ac.uk/cv.pdf or
+# jane@uni.ac.uk.pdf. Files nobody owns are reported as failures.
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+MANIFEST_NAME = "manifest.csv"
+
+
+class IngestFile:
+    def __init__(self, name: str, size: int, load: Callable[[], bytes], email: str = ""):
+        self.name = name
+        self.size = size
+        self.load = load
+        self.email = email
+        self.started = 0.0
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.name)[1].lower()
+
+    @property
+    def original_name(self) -> str:
+        return os.path.basename(self.name)
+
+
+def _zip_entries(archive: zipfile.ZipFile) -> list[IngestFile]:
+    entries = []
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+        entries.append(IngestFile(
+            info.filename,
+            info.file_size,
+            lambda info=info: archive.read(info),
+        ))
+    return entries
+
+
+def _directory_entries(root: str) -> list[IngestFile]:
+    entries = []
+    for folder, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            path = os.path.join(folder, filename)
+
+            def load(path=path) -> bytes:
+                with open(path, "rb") as f:
+                    return f.read()
+
+            name = os.path.relpath(path, root).replace(os.sep, "/")
+            entries.append(IngestFile(name, os.path.getsize(path), load))
+    return sorted(entries, key=lambda entry: entry.name)
+
+
+def read_manifest(data: bytes) -> dict[str, str]:
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8-sig")))
+    owners = {}
+    for row in reader:
+        row = {str(key).strip().lower(): str(value or "").strip() for key, value in row.items() if key}
+        if row.get("file") and row.get("email"):
+            owners[row["file"].lstrip("./")] = row["email"].lower()
+    return owners
+
+
+def owner_from_path(name: str) -> str:
+    parts = name.split("/")
+    for candidate in [os.path.splitext(parts[-1])[0]] + parts[-2::-1]:
+        if "@" in candidate:
+            return candidate.strip().lower()
+    return ""
+
+
+def _hidden(name: str) -> bool:
+    return any(part.startswith(".") or part == "__MACOSX" for part in name.split("/"))
+
+
+def collect_files(
+    source,
+    max_files: int = 1000,
+    max_file_bytes: int = 10 * 1024 * 1024,
+    max_total_bytes: int = 500 * 1024 * 1024,
+    report: Optional["IngestReport"] = None,
+) -> list[IngestFile]:
+    # source is a directory path, a zip path or a binary file object holding
+    # a zip. Sizes come from the zip directory, so nothing is decompressed
+    # before the limits have been checked.
+    if isinstance(source, str) and os.path.isdir(source):
+        entries = _directory_entries(source)
+    else:
+        try:
+            entries = _zip_entries(zipfile.ZipFile(source))
+        except zipfile.BadZipFile:
+            raise ValueError("Expected a zip archive or a directory of CVs")
+
+    entries = [entry for entry in entries if not _hidden(entry.name)]
+    report = report if report is not None else IngestReport()
+
+    owners = {}
+    manifest = next((entry for entry in entries if entry.name.lower() == MANIFEST_NAME), None)
+    if manifest is not None:
+        owners = read_manifest(manifest.load())
+
+    files = []
+    total_bytes = 0
+
+    for entry in entries:
+        if entry is manifest:
+            continue
+        if entry.extension not in SUPPORTED_EXTENSIONS:
+            report.skip(entry, f"Unsupported file type '{entry.extension or entry.name}'")
+            continue
+
+        entry.email = owners.get(entry.name) or owner_from_path(entry.name)
+        if not entry.email:
+            report.fail(entry, "No owner email (add it to manifest.csv or the file/folder name)")
+            continue
+        if entry.size > max_file_bytes:
+            report.fail(entry, f"File is larger than {max_file_bytes / 1048576:g} MB")
+            continue
+        if len(files) >= max_files:
+            report.fail(entry, f"More than {max_files} files in one batch")
+            continue
+        if total_bytes + entry.size > max_total_bytes:
+            report.fail(entry, f"Batch is larger than {max_total_bytes / 1048576:g} MB")
+            continue
+
+        total_bytes += entry.size
+        files.append(entry)
+
+    return files
+
+
+class IngestReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.files: list[dict] = []
+
+    def _add(self, entry: IngestFile, status: str, **fields):
+        row = {"file": entry.name, "email": entry.email, "status": status, "bytes": entry.size}
+        row.update(fields)
+        self.files.append(row)
+
+    def ok(self, entry: IngestFile, ms: float, chars: int, skills: int, qualifications: int, cached: bool):
+        # chars == 0 usually means a scanned or broken file worth a look.
+        self._add(
+            entry, "ok",
+            ms=round(ms, 1), chars=chars, skills=skills, qualifications=qualifications, cached=cached,
+        )
+
+    def fail(self, entry: IngestFile, error: str):
+        self._add(entry, "failed", error=error)
+
+    def skip(self, entry: IngestFile, error: str):
+        self._add(entry, "skipped", error=error)
+
+    def to_dict(self) -> dict:
+        seconds = time.perf_counter() - self.started
+        succeeded = [row for row in self.files if row["status"] == "ok"]
+        ingested_bytes = sum(row["bytes"] for row in succeeded)
+
+        return {
+            "files": self.files,
+            "total": len(self.files),
+            "succeeded": len(succeeded),
+            "failed": sum(1 for row in self.files if row["status"] == "failed"),
+            "skipped": sum(1 for row in self.files if row["status"] == "skipped"),
+            "users": len({row["email"] for row in succeeded}),
+            "seconds": round(seconds, 3),
+            "files_per_second": round(len(succeeded) / seconds, 2) if seconds else 0,
+            "mb_per_second": round(ingested_bytes / 1048576 / seconds, 2) if seconds else 0,
+        }
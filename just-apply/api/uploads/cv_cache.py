@@ -0,0 +1,173 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from db import SQLiteThreadPool, apply_sqlite_pragmas
+
+# =========================================================
+# CV PARSE CACHE
+# =========================================================
+# Content-addressed cache of CV parsing results, keyed by the SHA-256 of the
+# uploaded bytes plus the file extension (the same bytes parse differently
+# as .pdf and .txt). It is a local SQLite file shared by every worker on the
+# host. Entries are evicted least-recently-used once the cache holds more
+# than max_entries rows or max_bytes of extracted text. Only the parse
+# result is shared: the same bytes uploaded by two users are still stored as
+# two files, one per user.
+#
+# Skills depend on the taxonomy as well as the text, so each entry records
+# the taxonomy fingerprint it was extracted with and callers re-run the
+# (cheap) extraction when it no longer matches.
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cv_parse_cache (
+    cache_key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    qualifications TEXT NOT NULL,
+    taxonomy_fingerprint TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+)
+"""
+
+
+def content_key(data: bytes, extension: str) -> str:
+    return f"{hashlib.sha256(data).hexdigest()}{extension.lower()}"
+
+
+class CVParseCache:
+    def __init__(self, path: str, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self._pool = SQLiteThreadPool(self._connect, name="cv-cache")
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        conn.row_factory = sqlite3.Row
+        apply_sqlite_pragmas(conn, cache_size_kb=2000, mmap_size=0)
+        return conn
+
+    def _conn(self):
+        conn = self._pool.acquire()
+        if not self._schema_ready:
+            with self._schema_lock:
+                conn.execute(CACHE_SCHEMA)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_cv_parse_cache_last_used "
+                    "ON cv_parse_cache (last_used_at)"
+                )
+                conn.commit()
+                self._schema_ready = True
+        return conn
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT text, skills, qualifications, taxonomy_fingerprint "
+                "FROM cv_parse_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            conn.execute(
+                "UPDATE cv_parse_cache SET hits = hits + 1, last_used_at = ? WHERE cache_key = ?",
+                (time.time(), key),
+            )
+            conn.commit()
+
+        self.hits += 1
+        return {
+            "text": row["text"],
+            "skills": json.loads(row["skills"]),
+            "qualifications": json.loads(row["qualifications"]),
+            "taxonomy_fingerprint": row["taxonomy_fingerprint"],
+        }
+
+    def put(self, key: str, text: str, skills: list, qualifications: list, taxonomy_fingerprint: str):
+        now = time.time()
+        size_bytes = len(text.encode("utf-8"))
+
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO cv_parse_cache (
+                    cache_key, text, skills, qualifications, taxonomy_fingerprint,
+                    size_bytes, created_at, last_used_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    skills = excluded.skills,
+                    qualifications = excluded.qualifications,
+                    taxonomy_fingerprint = excluded.taxonomy_fingerprint,
+                    last_used_at = excluded.last_used_at
+                """,
+                (
+                    key, text, json.dumps(skills), json.dumps(qualifications),
+                    taxonomy_fingerprint, size_bytes, now, now,
+                ),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        entries, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM cv_parse_cache"
+        ).fetchone()
+
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = conn.execute(
+            "SELECT cache_key, size_bytes FROM cv_parse_cache ORDER BY last_used_at"
+        ).fetchall()
+
+        # Never evict the entry just written (the newest), even if it alone
+        # is over max_bytes.
+        for row in rows[:-1]:
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM cv_parse_cache WHERE cache_key = ?", (row["cache_key"],))
+            entries -= 1
+            total_bytes -= row["size_bytes"]
+            evicted += 1
+
+        self.evictions += evicted
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cv_parse_cache")
+            conn.commit()
+
+    def stats(self) -> dict:
+        with self._conn() as conn:
+            entries, total_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM cv_parse_cache"
+            ).fetchone()
+
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,157 @@
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+# =========================================================
+# CV UPLOAD JOBS
+# =========================================================
+# In-process backend for asynchronous CV uploads. A job runs on a small
+# thread pool (blob upload, database writes) and hands the CPU-bound text
+# extraction to a process pool, so a slow PDF neither holds a request open
+# nor competes for the GIL with the web workers.
+#
+# Job state lives in the cv_upload_jobs table rather than here, so under
+# gunicorn the status request can land on any worker. The queue itself is
+# per process and needs no broker; jobs still queued when a worker exits
+# are lost and stay "queued" in the table.
+
+JOB_QUEUED = "queued"
+JOB_PROCESSING = "processing"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ParseFailed(Exception):
+    pass
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+class LocalJobQueue:
+    def __init__(self, io_workers: int = 4, parse_workers: int = 2, max_pending: int = 100):
+        # parse_workers=0 parses in the I/O thread instead of a process.
+        self.io_workers = max(1, int(io_workers))
+        self.parse_workers = max(0, int(parse_workers))
+        self.max_pending = max(1, int(max_pending))
+
+        self._io = ThreadPoolExecutor(self.io_workers, thread_name_prefix="cv-jobs")
+        self._parse = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _parse_pool(self) -> ProcessPoolExecutor:
+        # Started on first use. "spawn" because the web process is threaded
+        # and forking it could copy a held lock into the child. Each child
+        # imports the parent's main script once (server.py when run
+        # directly); its __main__ block does not run there.
+        with self._lock:
+            if self._parse is None:
+                self._parse = ProcessPoolExecutor(
+                    self.parse_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._parse
+
+    def submit_parse(self, fn: Callable, *args) -> Future:
+        # Runs fn(*args) in the process pool; fn must be a module-level
+        # function. With parse_workers=0 it runs right here instead.
+        if self.parse_workers == 0:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        pool = self._parse_pool()
+        try:
+            return pool.submit(fn, *args)
+        except BrokenProcessPool:
+            return self._restart_parse_pool(pool).submit(fn, *args)
+
+    def _restart_parse_pool(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        # A crashed child breaks the whole pool, and every later submit to
+        # it fails, so it is replaced.
+        print("[CV JOBS] Parse worker died, restarting the pool")
+        with self._lock:
+            if self._parse is broken:
+                self._parse = None
+        broken.shutdown(wait=False)
+        return self._parse_pool()
+
+    def parse(self, fn: Callable, *args, timeout: Optional[float] = None):
+        # Raises ParseFailed when the worker does not answer within timeout.
+        future = None
+        try:
+            future = self.submit_parse(fn, *args)
+            return future.result(timeout=timeout)
+        except BrokenProcessPool:
+            # Retry this one call in-thread rather than fail the upload; the
+            # next submit_parse() replaces the pool.
+            return fn(*args)
+        except FutureTimeout:
+            future.cancel()
+            raise ParseFailed(f"CV parsing took longer than {timeout:g} seconds")
+
+    def submit(self, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("CV job queue is closed")
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise QueueFull(f"{self._pending} CV jobs already pending")
+            self._pending += 1
+            self.submitted += 1
+
+        future = self._io.submit(fn, *args)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def close(self, wait: bool = True):
+        with self._lock:
+            self._closed = True
+            parse = self._parse
+            self._parse = None
+
+        self._io.shutdown(wait=wait)
+        if parse is not None:
+            parse.shutdown(wait=wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "local",
+                "io_workers": self.io_workers,
+                "parse_workers": self.parse_workers,
+                "parse_pool_started": self._parse is not None,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
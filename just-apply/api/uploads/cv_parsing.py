@@ -0,0 +1,243 @@
+import io
+import signal
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Callable
+
+from PyPDF2 import PdfReader
+from docx import Document
+
+# =========================================================
+# CV TEXT EXTRACTION
+# =========================================================
+# Plain functions with no Flask or database state, so they can run in a
+# worker process (see cv_jobs.py) as well as in the request thread. Each one
+# takes a file path or a binary file object.
+
+
+def extract_text_from_pdf(source) -> str:
+    try:
+        reader = PdfReader(source)
+        return "\n".join((page.extract_text() or "") for page in reader.pages)
+    except Exception as e:
+        print("PDF parse error:", e)
+        return ""
+
+
+def extract_text_from_docx(source) -> str:
+    try:
+        doc = Document(source)
+        return "\n".join(p.text for p in doc.paragraphs)
+    except Exception as e:
+        print("DOCX parse error:", e)
+        return ""
+
+
+def extract_text_generic(source) -> str:
+    try:
+        if isinstance(source, str):
+            with open(source, "r", encoding="utf-8", errors="ignore") as f:
+                return f.read()
+        return source.read().decode("utf-8", errors="ignore")
+    except Exception as e:
+        print("Generic text parse error:", e)
+        return ""
+
+
+def extract_text_by_extension(source, ext: str) -> str:
+    if ext == ".pdf":
+        return extract_text_from_pdf(source)
+    if ext == ".docx":
+        return extract_text_from_docx(source)
+    return extract_text_generic(source)
+
+
+def extract_text_from_bytes(data: bytes, ext: str) -> str:
+    return extract_text_by_extension(io.BytesIO(data), ext)
+
+
+def extract_document(data: bytes, ext: str, max_pages: int, time_budget: float, target_chars: int) -> str:
+    # One task per file for bulk ingestion, which spreads whole files rather
+    # than pages over the pool; PDFs keep the page, time and text budgets.
+    if ext == ".pdf":
+        _, texts, _ = extract_pdf_pages(data, 0, max_pages, time.time() + time_budget, target_chars)
+        return "\n".join(texts)
+    return extract_text_from_bytes(data, ext)
+
+# =========================================================
+# PDF EXTRACTION ENGINE
+# =========================================================
+# PdfExtractor reads the first pages_per_task pages, then splits the rest
+# into one batch per worker and submits the batches to a process pool
+# through a submit(fn, *args) -> Future callable (see
+# cv_jobs.LocalJobQueue.submit_parse). Pages are joined in order, exactly as
+# extract_text_from_pdf() joins them, but within three budgets:
+#   - max_bytes: larger files are refused with ExtractionLimit;
+#   - max_pages: only the first max_pages pages are read;
+#   - time_budget: wall-clock seconds for the whole document. Workers stop
+#     themselves with SIGALRM at the deadline, even mid-page, and batches
+#     not yet started are cancelled.
+# Reading also stops once target_chars of text have been gathered, which is
+# far more than the 1200-character preview and a typical CV need.
+
+
+class ExtractionLimit(ValueError):
+    pass
+
+
+class _Deadline(BaseException):
+    # BaseException so PyPDF2's broad "except Exception" blocks cannot
+    # swallow it.
+    pass
+
+
+def _raise_deadline(signum, frame):
+    raise _Deadline()
+
+
+@contextmanager
+def _time_limit(deadline: float):
+    # Only possible on the main thread of a process with SIGALRM, which is
+    # where pool workers run; inline callers rely on the deadline checks
+    # between pages.
+    remaining = deadline - time.time()
+    if (
+        not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+        or remaining <= 0
+    ):
+        yield
+        return
+
+    previous = signal.signal(signal.SIGALRM, _raise_deadline)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def extract_pdf_pages(data: bytes, start: int, stop: int, deadline: float, target_chars: int) -> tuple:
+    # Worker task: text of pages [start, stop). Returns
+    # (page_count, texts, timed_out); texts may stop short of stop when the
+    # deadline passes or target_chars is reached.
+    page_count = 0
+    texts = []
+    timed_out = False
+
+    try:
+        with _time_limit(deadline):
+            reader = PdfReader(io.BytesIO(data))
+            page_count = len(reader.pages)
+            gathered = 0
+
+            for number in range(start, min(stop, page_count)):
+                if time.time() >= deadline:
+                    timed_out = True
+                    break
+                text = reader.pages[number].extract_text() or ""
+                texts.append(text)
+                gathered += len(text)
+                if target_chars and gathered >= target_chars:
+                    break
+    except _Deadline:
+        timed_out = True
+    except Exception as e:
+        print("PDF parse error:", e)
+
+    return page_count, texts, timed_out
+
+
+class PdfExtractor:
+    def __init__(
+        self,
+        submit: Callable,
+        workers: int = 2,
+        max_pages: int = 50,
+        max_bytes: int = 10 * 1024 * 1024,
+        time_budget: float = 20.0,
+        target_chars: int = 20000,
+        pages_per_task: int = 4,
+    ):
+        self.submit = submit
+        self.workers = max(1, int(workers))
+        self.max_pages = max(1, int(max_pages))
+        self.max_bytes = max(1, int(max_bytes))
+        self.time_budget = float(time_budget)
+        self.target_chars = max(0, int(target_chars))
+        self.pages_per_task = max(1, int(pages_per_task))
+
+    def _wait(self, future, deadline: float):
+        # Workers enforce the deadline themselves; the extra second covers
+        # handing the result back.
+        try:
+            return future.result(timeout=max(0.0, deadline - time.time()) + 1.0)
+        except FutureTimeout:
+            future.cancel()
+            print("[PDF] Worker did not answer before the deadline")
+        except Exception as e:
+            print("[PDF] Extraction task failed:", e)
+        return None
+
+    def check(self, data: bytes):
+        if len(data) > self.max_bytes:
+            raise ExtractionLimit(
+                f"PDF is {len(data) / 1048576:.1f} MB, the limit is {self.max_bytes / 1048576:.1f} MB"
+            )
+
+    def extract(self, data: bytes) -> str:
+        self.check(data)
+
+        deadline = time.time() + self.time_budget
+        step = self.pages_per_task
+        target = self.target_chars
+
+        # The first batch also reports the page count, and for most CVs it
+        # is the only batch.
+        first = self._wait(
+            self.submit(extract_pdf_pages, data, 0, min(step, self.max_pages), deadline, target),
+            deadline,
+        )
+        if first is None:
+            return ""
+
+        page_count, texts, timed_out = first
+        pages = list(texts)
+        gathered = sum(len(text) for text in texts)
+        last_page = min(page_count, self.max_pages)
+
+        if not timed_out and (not target or gathered < target) and last_page > step:
+            # Every batch re-opens the PDF, so the rest is cut into one batch
+            # per worker rather than many small ones.
+            size = max(step, -(-(last_page - step) // self.workers))
+            futures = [
+                self.submit(extract_pdf_pages, data, start, min(start + size, last_page), deadline, target)
+                for start in range(step, last_page, size)
+            ]
+
+            for future in futures:
+                result = self._wait(future, deadline)
+                if result is None:
+                    timed_out = True
+                    break
+
+                _, texts, batch_timed_out = result
+                pages.extend(texts)
+                gathered += sum(len(text) for text in texts)
+                if batch_timed_out:
+                    timed_out = True
+                    break
+                if target and gathered >= target:
+                    break
+
+            for future in futures:
+                future.cancel()
+
+        if timed_out or len(pages) < page_count:
+            reason = "time budget reached" if timed_out else "page or text limit reached"
+            print(f"[PDF] Read {len(pages)} of {page_count} pages ({reason})")
+
+        return "\n".join(pages)
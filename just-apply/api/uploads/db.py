@@ -0,0 +1,505 @@
+import abc
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+# =========================================================
+# CONNECTION POOLING
+# =========================================================
+# Pools hand out PooledConnection proxies. Calling close() on a proxy
+# returns the connection to its pool instead of closing it, so helpers
+# written as connect -> cursor -> close keep working unchanged.
+#
+# Checkouts are re-entrant per thread: while a thread holds a connection,
+# any nested acquire() returns the same underlying connection. Wrapping a
+# request in `with pool.session():` therefore borrows exactly one
+# connection no matter how many helpers it calls.
+
+
+class PoolTimeoutError(RuntimeError):
+    pass
+
+
+class PooledConnection:
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+        self._closed = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    @property
+    def raw(self):
+        return self._conn
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._pool._release(self._conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _SessionScope:
+    def __init__(self, pool):
+        self._pool = pool
+        self._proxy = None
+
+    def __enter__(self):
+        self._proxy = self._pool.acquire()
+        return self._proxy
+
+    def __exit__(self, exc_type, exc, tb):
+        self._proxy.close()
+
+
+class _BasePool(abc.ABC):
+    def __init__(self):
+        self._local = threading.local()
+
+    def _held(self):
+        return getattr(self._local, "conn", None)
+
+    def acquire(self) -> PooledConnection:
+        held = self._held()
+        if held is not None:
+            self._local.depth += 1
+            return PooledConnection(self, held)
+
+        conn = self._checkout()
+        self._local.conn = conn
+        self._local.depth = 1
+        return PooledConnection(self, conn)
+
+    def session(self) -> _SessionScope:
+        return _SessionScope(self)
+
+    def _release(self, conn):
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+
+        self._local.conn = None
+        self._checkin(conn)
+
+    @abc.abstractmethod
+    def _checkout(self):
+        ...
+
+    @abc.abstractmethod
+    def _checkin(self, conn):
+        ...
+
+
+def _reset_connection(conn) -> bool:
+    # Discard any work a helper left uncommitted before the connection is
+    # reused. Returns False when the connection is no longer usable.
+    try:
+        if isinstance(conn, sqlite3.Connection):
+            if conn.in_transaction:
+                conn.rollback()
+        else:
+            conn.rollback()
+        return True
+    except Exception:
+        return False
+
+
+def _safe_close(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool(_BasePool):
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 5,
+        max_idle_seconds: float = 300,
+        checkout_timeout: float = 30,
+        ping_after_seconds: float = 30,
+        ping_sql: str = "SELECT 1",
+        name: str = "db",
+    ):
+        super().__init__()
+        self._factory = factory
+        self.max_size = max(1, int(max_size))
+        self.max_idle_seconds = max_idle_seconds
+        self.checkout_timeout = checkout_timeout
+        self.ping_after_seconds = ping_after_seconds
+        self.ping_sql = ping_sql
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._idle: list[tuple[Any, float]] = []
+        self._open = 0
+
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def _evict_idle_locked(self, now: float):
+        if not self.max_idle_seconds:
+            return
+
+        keep = []
+        for conn, last_used in self._idle:
+            if now - last_used > self.max_idle_seconds:
+                _safe_close(conn)
+                self._open -= 1
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+
+    def _is_healthy(self, conn, idle_for: float) -> bool:
+        if idle_for < self.ping_after_seconds:
+            return True
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.ping_sql)
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception as e:
+            print(f"[DB POOL:{self.name}] Dropping dead connection: {e}")
+            return False
+
+    def _checkout(self):
+        deadline = time.monotonic() + self.checkout_timeout
+
+        while True:
+            conn = None
+            last_used = 0.0
+
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    self._evict_idle_locked(time.time())
+
+                    if self._idle:
+                        # LIFO keeps the hottest connections in use and lets
+                        # the rest age out through idle eviction.
+                        conn, last_used = self._idle.pop()
+                        break
+
+                    if self._open < self.max_size:
+                        self._open += 1
+                        break
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"Timed out waiting for a '{self.name}' connection "
+                            f"(pool size {self.max_size})."
+                        )
+                    self._cond.wait(remaining)
+
+            if conn is None:
+                try:
+                    conn = self._factory()
+                except Exception:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+                self.created += 1
+                return conn
+
+            if self._is_healthy(conn, time.time() - last_used):
+                self.reused += 1
+                return conn
+
+            self._discard(conn)
+
+    def _discard(self, conn):
+        _safe_close(conn)
+        self.discarded += 1
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def _checkin(self, conn):
+        if not _reset_connection(conn):
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.time()))
+            self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            for conn, _ in self._idle:
+                _safe_close(conn)
+            self._open -= len(self._idle)
+            self._idle = []
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "name": self.name,
+                "max_size": self.max_size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "created": self.created,
+                "reused": self.reused,
+                "discarded": self.discarded,
+            }
+
+
+class SQLiteThreadPool(_BasePool):
+    # SQLite connections are cheap to keep but must not be shared between
+    # threads mid-transaction, so each thread keeps its own connection open.
+    def __init__(
+        self,
+        factory: Callable[[], sqlite3.Connection],
+        max_idle_seconds: float = 300,
+        name: str = "sqlite",
+    ):
+        super().__init__()
+        self._factory = factory
+        self.max_idle_seconds = max_idle_seconds
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._conns: dict[int, list] = {}
+
+        self.created = 0
+        self.reused = 0
+
+    def _evict_locked(self, now: float, current: int):
+        alive = {t.ident for t in threading.enumerate()}
+
+        for ident in list(self._conns):
+            if ident == current:
+                continue
+
+            conn, last_used, in_use = self._conns[ident]
+            dead_thread = ident not in alive
+            expired = self.max_idle_seconds and now - last_used > self.max_idle_seconds
+
+            if dead_thread or (expired and not in_use):
+                _safe_close(conn)
+                del self._conns[ident]
+
+    def _checkout(self):
+        ident = threading.get_ident()
+        now = time.time()
+
+        with self._lock:
+            self._evict_locked(now, ident)
+            entry = self._conns.get(ident)
+
+            if entry is not None:
+                entry[1] = now
+                entry[2] = True
+                self.reused += 1
+                return entry[0]
+
+        conn = self._factory()
+
+        with self._lock:
+            self._conns[ident] = [conn, now, True]
+            self.created += 1
+
+        return conn
+
+    def _checkin(self, conn):
+        ident = threading.get_ident()
+        healthy = _reset_connection(conn)
+
+        with self._lock:
+            entry = self._conns.get(ident)
+            if entry is None or entry[0] is not conn:
+                _safe_close(conn)
+                return
+
+            if not healthy:
+                _safe_close(conn)
+                del self._conns[ident]
+                return
+
+            entry[1] = time.time()
+            entry[2] = False
+
+    def close_all(self):
+        with self._lock:
+            for conn, _, _ in self._conns.values():
+                _safe_close(conn)
+            self._conns = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "open": len(self._conns),
+                "in_use": sum(1 for entry in self._conns.values() if entry[2]),
+                "created": self.created,
+                "reused": self.reused,
+            }
+
+
+def create_pool(mode: str, factory: Callable[[], Any], **options) -> _BasePool:
+    if mode == "sqlite":
+        return SQLiteThreadPool(
+            factory,
+            max_idle_seconds=options.get("max_idle_seconds", 300),
+        )
+
+    return ConnectionPool(factory, name=mode, **options)
+
+
+# =========================================================
+# SQLITE PRODUCTION MODE
+# =========================================================
+def apply_sqlite_pragmas(
+    conn: sqlite3.Connection,
+    busy_timeout_ms: int = 5000,
+    cache_size_kb: int = 20000,
+    mmap_size: int = 268435456,
+):
+    # WAL lets readers proceed while one writer commits, and with
+    # synchronous=NORMAL a commit only fsyncs at checkpoints. busy_timeout
+    # makes a writer wait for the lock instead of raising "database is
+    # locked" straight away when another gunicorn worker is mid-commit.
+    conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{int(cache_size_kb)}")
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+class WriteQueue:
+    # Single-writer queue for SQLite. Writes submitted from any thread are
+    # applied by one background thread, which drains whatever has piled up
+    # (up to max_batch, waiting at most flush_interval for more) and commits
+    # it as one transaction. Callers get a Future with the rowcount; if a
+    # batch fails it is replayed one statement per transaction so a single
+    # bad write only fails its own Future.
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        max_batch: int = 200,
+        flush_interval: float = 0.005,
+        name: str = "sqlite-writer",
+    ):
+        self._connect = connect
+        self.max_batch = max(1, int(max_batch))
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+
+        self.batches = 0
+        self.writes = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, sql: str, params: tuple = ()) -> Future:
+        if self._closed:
+            raise RuntimeError("Write queue is closed.")
+
+        future: Future = Future()
+        self._queue.put((sql, params, future))
+        return future
+
+    def execute(self, sql: str, params: tuple = (), wait: bool = True):
+        future = self.submit(sql, params)
+        return future.result() if wait else future
+
+    def call(self, work: Callable[[sqlite3.Connection], Any]):
+        # Runs work(conn) on the writer thread inside the batch's
+        # transaction and returns its result. work must not commit; if it
+        # raises, only its own statements are rolled back.
+        return self.execute(work)
+
+    def flush(self, timeout: Optional[float] = None):
+        done = self.submit("SELECT 1")
+        done.result(timeout=timeout)
+
+    def close(self, timeout: float = 5):
+        if self._closed:
+            return
+        self.flush(timeout=timeout)
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+    def _drain(self, first) -> list:
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _apply(self, conn, batch: list):
+        conn.execute("BEGIN IMMEDIATE")
+        results = []
+        for sql, params, _ in batch:
+            if callable(sql):
+                results.append(sql(conn))
+            else:
+                results.append(conn.execute(sql, params).rowcount)
+        conn.commit()
+        return results
+
+    def _run(self):
+        conn = self._connect()
+
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = self._drain(first)
+
+            try:
+                results = self._apply(conn, batch)
+                for (_, _, future), rowcount in zip(batch, results):
+                    future.set_result(rowcount)
+            except Exception:
+                _reset_connection(conn)
+                for item in batch:
+                    try:
+                        item[2].set_result(self._apply(conn, [item])[0])
+                    except Exception as e:
+                        _reset_connection(conn)
+                        item[2].set_exception(e)
+
+            self.batches += 1
+            self.writes += len(batch)
+
+        _safe_close(conn)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize(),
+            "batches": self.batches,
+            "writes": self.writes,
+        }
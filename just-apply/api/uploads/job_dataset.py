@@ -0,0 +1,252 @@
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from job_matching import DATASET_COLUMNS, parse_skill_list
+
+# =========================================================
+# COLUMNAR JOB DATASET
+# =========================================================
+# jobPosts/jobposts.csv converted once into typed columns, one .npy file
+# each, that every worker opens with np.load(mmap_mode="r"): the pages are
+# shared through the OS page cache instead of each worker parsing the CSV.
+#
+#   skills                 parsed lists: int32 codes into a vocabulary,
+#                          plus int64 offsets per row
+#   salary_min/max         euros as float64 ("€100,472 - €200,938"), NaN
+#                          when the posting has no salary
+#   employees, revenue_eur company_size and revenue as float64; rows
+#                          where the two were scraped into each other's
+#                          column are swapped back
+#   location_normalized    the places in location, without work-mode
+#                          markers ("Hybrid") or "+ 1 More"
+#   text columns           UTF-8 bytes plus int64 offsets
+#
+# A build lives in <cache dir>/<csv name>-<size>-<mtime>-v<version>/, so a
+# changed CSV (or a new format) gets a fresh directory and older ones are
+# removed. Builds go to a temp directory first and are renamed into place;
+# when two workers race, one rename wins and the other uses its result.
+
+DATASET_CACHE_VERSION = 1
+
+TEXT_COLUMNS = DATASET_COLUMNS + ("location_normalized",)
+NUMBER_COLUMNS = ("salary_min", "salary_max", "employees", "revenue_eur")
+
+MONEY_PATTERN = re.compile(r"[€$£]\s*([\d,]+(?:\.\d+)?)\s*([kmbt])?", re.IGNORECASE)
+COUNT_PATTERN = re.compile(r"^\d{1,3}(?:,\d{3})*$|^\d+$")
+MONEY_SCALE = {"": 1, "k": 1e3, "m": 1e6, "b": 1e9, "t": 1e12}
+LOCATION_MARKERS = {"hybrid", "remote", "on-site", "onsite"}
+MORE_PATTERN = re.compile(r"\+\s*\d+\s+more$", re.IGNORECASE)
+
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value).strip()
+
+
+def parse_money(value) -> list[float]:
+    # Every amount in the text: "€100,472 - €200,938" -> [100472.0, 200938.0]
+    return [
+        float(number.replace(",", "")) * MONEY_SCALE[(suffix or "").lower()]
+        for number, suffix in MONEY_PATTERN.findall(_text(value))
+    ]
+
+
+def parse_salary(value) -> tuple[float, float]:
+    amounts = parse_money(value)
+    if not amounts:
+        return math.nan, math.nan
+    return min(amounts), max(amounts)
+
+
+def parse_count(value) -> float:
+    text = _text(value)
+    return float(text.replace(",", "")) if COUNT_PATTERN.match(text) else math.nan
+
+
+def parse_company(size, revenue) -> tuple[float, float]:
+    # (employees, revenue in euros); "€352.44B" sometimes sits in
+    # company_size with the head count in revenue.
+    if parse_money(size) and not parse_money(revenue):
+        size, revenue = revenue, size
+    amounts = parse_money(revenue)
+    return parse_count(size), amounts[0] if amounts else math.nan
+
+
+def normalize_location(value) -> str:
+    places = []
+    for part in _text(value).split(" . "):
+        part = MORE_PATTERN.sub("", part).strip()
+        if part and part.lower() not in LOCATION_MARKERS:
+            places.append(part)
+    return "; ".join(places)
+
+
+def source_fingerprint(csv_path: str) -> str:
+    stat = os.stat(csv_path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}-v{DATASET_CACHE_VERSION}"
+
+
+def _encode_text(values: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def build_columns(df: pd.DataFrame) -> tuple[dict[str, np.ndarray], list[str]]:
+    # (arrays by file name, skill vocabulary) for a raw jobposts frame.
+    records = df.to_dict("records")
+    arrays: dict[str, np.ndarray] = {}
+
+    for column in TEXT_COLUMNS:
+        if column == "location_normalized":
+            values = [normalize_location(row.get("location")) for row in records]
+        else:
+            values = [_text(row.get(column)) for row in records]
+        arrays[f"{column}.bytes"], arrays[f"{column}.offsets"] = _encode_text(values)
+
+    salaries = [parse_salary(row.get("salary")) for row in records]
+    companies = [parse_company(row.get("company_size"), row.get("revenue")) for row in records]
+    arrays["salary_min"] = np.array([low for low, _ in salaries], dtype=np.float64)
+    arrays["salary_max"] = np.array([high for _, high in salaries], dtype=np.float64)
+    arrays["employees"] = np.array([size for size, _ in companies], dtype=np.float64)
+    arrays["revenue_eur"] = np.array([revenue for _, revenue in companies], dtype=np.float64)
+
+    vocabulary: dict[str, int] = {}
+    parsed: dict[str, list[int]] = {}
+    codes: list[int] = []
+    offsets = [0]
+    for row in records:
+        raw = _text(row.get("skills"))
+        row_codes = parsed.get(raw)
+        if row_codes is None:
+            row_codes = parsed[raw] = [
+                vocabulary.setdefault(skill, len(vocabulary)) for skill in parse_skill_list(raw)
+            ]
+        codes.extend(row_codes)
+        offsets.append(len(codes))
+    arrays["skills.codes"] = np.array(codes, dtype=np.int32)
+    arrays["skills.offsets"] = np.array(offsets, dtype=np.int64)
+
+    return arrays, list(vocabulary)
+
+
+class JobDataset:
+    def __init__(self, arrays: dict[str, np.ndarray], skill_names: list[str], source: str = "", rows=None):
+        # rows optionally selects (and orders) a subset of the arrays' rows.
+        self.arrays = arrays
+        self.skill_names = skill_names
+        self.source = source
+        total = len(arrays["salary_min"])
+        self.rows = np.arange(total) if rows is None else np.asarray(rows, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_csv(cls, csv_path: str) -> "JobDataset":
+        arrays, skill_names = build_columns(pd.read_csv(csv_path))
+        return cls(arrays, skill_names, source=csv_path)
+
+    @classmethod
+    def load(cls, path: str) -> "JobDataset":
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in meta["arrays"]
+        }
+        return cls(arrays, meta["skill_names"], source=path)
+
+    def save(self, path: str, csv_path: str):
+        for name, array in self.arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "version": DATASET_CACHE_VERSION,
+                "source": os.path.abspath(csv_path),
+                "source_fingerprint": source_fingerprint(csv_path),
+                "built_at": time.time(),
+                "rows": len(self.arrays["salary_min"]),
+                "arrays": sorted(self.arrays),
+                "skill_names": self.skill_names,
+            }, f)
+
+    def sample(self, n: int, random_state: int = 42) -> "JobDataset":
+        # The same rows, in the same order, as DataFrame.sample(n, random_state).
+        picks = np.random.RandomState(random_state).choice(len(self.rows), size=n, replace=False)
+        return JobDataset(self.arrays, self.skill_names, self.source, self.rows[picks])
+
+    def text(self, column: str) -> list[str]:
+        data = bytes(self.arrays[f"{column}.bytes"])
+        offsets = self.arrays[f"{column}.offsets"].tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in self.rows.tolist()]
+
+    def numbers(self, column: str) -> np.ndarray:
+        return np.asarray(self.arrays[column][self.rows])
+
+    def skills(self) -> list[list[str]]:
+        names = [self.skill_names[code] for code in self.arrays["skills.codes"].tolist()]
+        offsets = self.arrays["skills.offsets"].tolist()
+        return [names[offsets[i]:offsets[i + 1]] for i in self.rows.tolist()]
+
+    def stats(self) -> dict:
+        return {
+            "source": self.source,
+            "rows": len(self),
+            "skills": len(self.skill_names),
+            "mapped": any(isinstance(array, np.memmap) for array in self.arrays.values()),
+        }
+
+
+def _csv_stem(csv_path: str) -> str:
+    return os.path.splitext(os.path.basename(csv_path))[0]
+
+
+def build_job_dataset(csv_path: str, cache_dir: str) -> str:
+    # Converts the CSV unless an up-to-date build exists; returns its path.
+    os.makedirs(cache_dir, exist_ok=True)
+    stem = _csv_stem(csv_path)
+    target = os.path.join(cache_dir, f"{stem}-{source_fingerprint(csv_path)}")
+    if os.path.exists(os.path.join(target, "meta.json")):
+        return target
+
+    start = time.perf_counter()
+    staging = tempfile.mkdtemp(prefix=f".{stem}-", dir=cache_dir)
+    try:
+        JobDataset.from_csv(csv_path).save(staging, csv_path)
+        os.rename(staging, target)
+        print(f"[DATASET] Built {target} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.exists(os.path.join(target, "meta.json")):
+            raise
+
+    # Older builds of this CSV; workers that still map them keep their
+    # open files.
+    for name in os.listdir(cache_dir):
+        if name.startswith(f"{stem}-") and os.path.join(cache_dir, name) != target:
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+    return target
+
+
+def load_job_dataset(csv_path: str, cache_dir: Optional[str] = None) -> JobDataset:
+    # The memory-mapped build for csv_path, (re)built when missing or out of
+    # date; parsed in memory when there is no cache_dir or it can't be
+    # written.
+    if cache_dir:
+        try:
+            return JobDataset.load(build_job_dataset(csv_path, cache_dir))
+        except OSError as e:
+            print(f"[DATASET] Columnar cache unavailable, parsing {csv_path} in memory:", e)
+    return JobDataset.from_csv(csv_path)
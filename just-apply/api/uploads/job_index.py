@@ -0,0 +1,157 @@
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from bm25 import BM25Corpus, tokenize
+from job_scoring import TITLE_BONUS_RULES
+
+# =========================================================
+# JOB INVERTED INDEX
+# =========================================================
+# Maps terms to the jobs carrying them, so ranking only scores jobs that
+# share something with the CV:
+#   skill:<canonical skill>   qual:<canonical qualification>
+#   title:<word>              the title contains a title-bonus word
+# user_terms() lists the terms a user can score on; a job sharing none of
+# them has no matched skills, qualifications or title bonus.
+#
+# LocalJobIndex (job_matching.py) keeps the dataset's postings as NumPy
+# arrays. AdzunaJobIndex keeps the Adzuna jobs searches have returned, with
+# the skills the taxonomy found in them, so each job's text is matched once
+# rather than on every search that returns it. It also holds their BM25 term
+# counts, so the "relevance" rank mode weighs a live job's terms by how rare
+# they are across every job held, not just the few in one search's results.
+
+TITLE_WORDS = tuple(dict.fromkeys(word for words, _ in TITLE_BONUS_RULES for word in words))
+
+
+def job_terms(skills: Iterable[str], quals: Iterable[str], title: str) -> list[str]:
+    title = title.lower()
+    terms = [f"skill:{skill}" for skill in skills] + [f"qual:{q}" for q in quals]
+    terms += [f"title:{word}" for word in TITLE_WORDS if word in title]
+    return terms
+
+
+def user_terms(user_skill_set: set, user_qual_set: set) -> set:
+    terms = {f"skill:{skill}" for skill in user_skill_set} | {f"qual:{q}" for q in user_qual_set}
+    for words, skills in TITLE_BONUS_RULES:
+        if any(skill in user_skill_set for skill in skills):
+            terms.update(f"title:{word}" for word in words)
+    return terms
+
+
+class InvertedIndex:
+    def __init__(self):
+        self._postings: dict[str, set] = {}
+        self._docs: dict = {}
+
+    def add(self, doc, terms: Iterable[str]):
+        self.remove(doc)
+        terms = tuple(set(terms))
+        self._docs[doc] = terms
+        for term in terms:
+            self._postings.setdefault(term, set()).add(doc)
+
+    def remove(self, doc):
+        for term in self._docs.pop(doc, ()):
+            posting = self._postings[term]
+            posting.discard(doc)
+            if not posting:
+                del self._postings[term]
+
+    def postings(self, term: str) -> set:
+        return self._postings.get(term, set())
+
+    def candidates(self, terms: Iterable[str], within: Optional[set] = None) -> set:
+        found = set()
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting:
+                found |= posting if within is None else posting & within
+        return found
+
+    def __contains__(self, doc) -> bool:
+        return doc in self._docs
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def term_count(self) -> int:
+        return len(self._postings)
+
+
+class AdzunaJobIndex:
+    def __init__(self, max_jobs: int = 5000):
+        self.max_jobs = max(1, int(max_jobs))
+        self._features: OrderedDict[str, tuple[list, list]] = OrderedDict()
+        self._index = InvertedIndex()
+        self._corpus = BM25Corpus()
+        self._lock = threading.Lock()
+        self._fingerprint = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def features(self, job_id: Optional[str], title: str, text: str, taxonomy) -> tuple[list, list]:
+        # (skills, qualifications) the taxonomy finds in the job's text.
+        # Jobs without an id are matched every time and never indexed.
+        with self._lock:
+            if taxonomy.fingerprint != self._fingerprint:
+                self._features.clear()
+                self._index = InvertedIndex()
+                self._corpus = BM25Corpus()
+                self._fingerprint = taxonomy.fingerprint
+
+            found = self._features.get(job_id) if job_id is not None else None
+            if found is not None:
+                self._features.move_to_end(job_id)
+                self.hits += 1
+                return found
+            self.misses += 1
+
+        found = (taxonomy.skills.find(text), taxonomy.qualifications.find(text))
+        if job_id is None:
+            return found
+        tokens = tokenize(text)
+
+        with self._lock:
+            if taxonomy.fingerprint == self._fingerprint:
+                self._features[job_id] = found
+                self._features.move_to_end(job_id)
+                self._index.add(job_id, job_terms(found[0], found[1], title))
+                self._corpus.add(job_id, tokens)
+                while len(self._features) > self.max_jobs:
+                    evicted, _ = self._features.popitem(last=False)
+                    self._index.remove(evicted)
+                    self._corpus.remove(evicted)
+                    self.evictions += 1
+        return found
+
+    def candidates(self, terms: Iterable[str], within: set) -> set:
+        # The ids in within sharing a term with the user, plus any that are
+        # not (or no longer) indexed, so an eviction never hides a match.
+        with self._lock:
+            return self._index.candidates(terms, within) | {
+                job_id for job_id in within if job_id not in self._index
+            }
+
+    def relevance(self, job_ids: list, texts: list[str], query: str) -> np.ndarray:
+        # BM25 score of each job against every job held; jobs that are not
+        # held are scored from their text.
+        with self._lock:
+            return self._corpus.scores(job_ids, query, texts)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "jobs": len(self._features),
+                "terms": self._index.term_count(),
+                "relevance_terms": self._corpus.stats()["terms"],
+                "max_jobs": self.max_jobs,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,269 @@
+import ast
+import threading
+from typing import Optional
+
+import numpy as np
+
+from bm25 import BM25Index, top_relevant
+from job_index import job_terms, user_terms
+from job_scoring import TITLE_BONUS_POINTS, TITLE_BONUS_RULES, match_percentages, rank
+
+# =========================================================
+# LOCAL JOB MATCHING
+# =========================================================
+# Ranks the postings in jobPosts/jobposts.csv against a CV's skills and
+# qualifications without calling Adzuna. It backs /api/match-jobs and
+# stands in for /api/live-jobs when Adzuna cannot be reached.
+#
+# The dataset is indexed once: every posting's skills column (a Python list
+# literal) is parsed and mapped to canonical taxonomy names, and each
+# job_index term (skill, qualification, title word) keeps a sorted array of
+# the postings carrying it. A match merges the arrays of the user's own
+# terms into the candidate postings, scores those alone, and builds result
+# dicts for the top_n of them. Postings outside the candidates share
+# nothing with the CV and would score zero.
+#
+# Scores follow the rules in job_scoring.py, like Adzuna results. Given a
+# query (the CV text), match ranks by BM25 relevance to each posting's
+# title, seniority, industry and skills instead; that index is built on the
+# first such match.
+
+DATASET_COLUMNS = (
+    "job_title", "seniority_level", "status", "company", "location", "post_date",
+    "headquarter", "industry", "ownership", "company_size", "revenue", "salary",
+)
+# Only known when built from job_dataset.JobDataset; None otherwise.
+PARSED_COLUMNS = ("location_normalized", "salary_min", "salary_max")
+
+
+def parse_skill_list(value) -> list[str]:
+    # "['spark', 'r', 'python']" -> ["spark", "r", "python"]; anything that
+    # is not a list literal is read as comma-separated.
+    if isinstance(value, (list, tuple)):
+        items = value
+    else:
+        text = str(value if value is not None else "").strip()
+        if not text or text.lower() == "nan":
+            return []
+        try:
+            items = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            items = text.strip("[]").split(",")
+        if isinstance(items, str):
+            items = [items]
+
+    skills = []
+    for item in items:
+        skill = str(item).strip().strip("'\"").lower()
+        if skill:
+            skills.append(skill)
+    return skills
+
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value).strip()
+
+
+def _dedupe(values) -> list:
+    return list(dict.fromkeys(values))
+
+
+class LocalJobIndex:
+    def __init__(self, columns: dict[str, list], skills: list[list[str]], taxonomy):
+        # columns holds DATASET_COLUMNS (and optionally PARSED_COLUMNS) as
+        # lists of cleaned values; skills is each posting's parsed skill list.
+        self.taxonomy = taxonomy
+        self.fingerprint = taxonomy.fingerprint
+        self.size = len(skills)
+        self.columns = {column: columns.get(column) or [""] * self.size for column in DATASET_COLUMNS}
+        self.parsed = {column: columns.get(column) or [None] * self.size for column in PARSED_COLUMNS}
+
+        self.job_skills: list[list[str]] = []
+        self.job_quals: list[list[str]] = []
+        postings: dict[str, list[int]] = {}
+
+        # Skill lists and title/industry pairs repeat a lot, so each
+        # distinct one is mapped to the taxonomy once.
+        canonical_skills: dict[tuple, list[str]] = {}
+        found_quals: dict[str, list[str]] = {}
+        titles = self.columns["job_title"]
+        industries = self.columns["industry"]
+
+        for i, names in enumerate(skills):
+            key = tuple(names)
+            job_skills = canonical_skills.get(key)
+            if job_skills is None:
+                job_skills = canonical_skills[key] = _dedupe(taxonomy.skills.canonical(skill) for skill in names)
+
+            # The dataset has no qualifications column; whatever the title
+            # and industry mention is all a posting asks for.
+            text = f"{titles[i]} {industries[i]}"
+            quals = found_quals.get(text)
+            if quals is None:
+                quals = found_quals[text] = taxonomy.qualifications.find(text)
+            self.job_skills.append(job_skills)
+            self.job_quals.append(quals)
+
+            for term in job_terms(job_skills, quals, titles[i]):
+                postings.setdefault(term, []).append(i)
+
+        self._postings = {term: np.array(ids, dtype=np.int32) for term, ids in postings.items()}
+        self.skill_counts = np.array([len(job_skills) for job_skills in self.job_skills], dtype=np.int64)
+
+        self._relevance = None
+        self._relevance_lock = threading.Lock()
+
+    @classmethod
+    def from_rows(cls, rows: list[dict], taxonomy) -> "LocalJobIndex":
+        # Rows shaped like jobposts.csv records, skills as list literals.
+        columns = {column: [_text(row.get(column)) for row in rows] for column in DATASET_COLUMNS}
+        parsed: dict[str, list[str]] = {}
+        skills = []
+        for row in rows:
+            raw = _text(row.get("skills"))
+            if raw not in parsed:
+                parsed[raw] = parse_skill_list(raw)
+            skills.append(parsed[raw])
+        return cls(columns, skills, taxonomy)
+
+    @classmethod
+    def from_dataset(cls, dataset, taxonomy) -> "LocalJobIndex":
+        # A job_dataset.JobDataset, whose columns are already parsed.
+        if dataset is None:
+            return cls({}, [], taxonomy)
+        columns = {column: dataset.text(column) for column in DATASET_COLUMNS + ("location_normalized",)}
+        for column in ("salary_min", "salary_max"):
+            columns[column] = [None if value != value else value for value in dataset.numbers(column).tolist()]
+        return cls(columns, dataset.skills(), taxonomy)
+
+    def _arrays(self, terms) -> list[np.ndarray]:
+        return [self._postings[term] for term in terms if term in self._postings]
+
+    def candidates(self, user_skills: set, user_quals: set) -> np.ndarray:
+        # Sorted postings carrying any of the user's terms.
+        arrays = self._arrays(user_terms(user_skills, user_quals))
+        if not arrays:
+            return np.zeros(0, dtype=np.int64)
+        seen = np.zeros(self.size, dtype=bool)
+        for array in arrays:
+            seen[array] = True
+        return np.flatnonzero(seen)
+
+    def _hits(self, jobs: np.ndarray, terms) -> np.ndarray:
+        # How many of the terms each candidate carries.
+        arrays = self._arrays(terms)
+        if not arrays:
+            return np.zeros(len(jobs), dtype=np.int64)
+        return np.bincount(np.concatenate(arrays), minlength=self.size)[jobs]
+
+    def relevance(self) -> BM25Index:
+        with self._relevance_lock:
+            if self._relevance is None:
+                columns = self.columns
+                self._relevance = BM25Index(
+                    f"{columns['job_title'][i]} {columns['seniority_level'][i]} "
+                    f"{columns['industry'][i]} {' '.join(self.job_skills[i])}"
+                    for i in range(self.size)
+                )
+            return self._relevance
+
+    def scores(self, user_skills: set, user_quals: set, jobs: Optional[np.ndarray] = None) -> dict:
+        # Scores for the given postings (by default the candidates), as
+        # arrays lined up with scores["jobs"]; user_skills and user_quals
+        # are canonical names.
+        if jobs is None:
+            jobs = self.candidates(user_skills, user_quals)
+        matched = self._hits(jobs, [f"skill:{skill}" for skill in user_skills])
+        quals = self._hits(jobs, [f"qual:{q}" for q in user_quals])
+
+        bonus = np.zeros(len(jobs), dtype=np.int64)
+        for words, skills in TITLE_BONUS_RULES:
+            if any(skill in user_skills for skill in skills):
+                bonus += TITLE_BONUS_POINTS * (self._hits(jobs, [f"title:{word}" for word in words]) > 0)
+
+        return {
+            "jobs": jobs,
+            "skill_score": matched,
+            "qual_score": quals,
+            "title_bonus": bonus,
+            "total_score": matched * 2 + quals + bonus,
+            "match_percentage": match_percentages(matched, self.skill_counts[jobs], bonus),
+        }
+
+    def job(self, row: int, scores: dict, user_skills: set, user_quals: set) -> dict:
+        # row indexes the scores arrays; i is the posting.
+        i = int(scores["jobs"][row])
+        title = self.columns["job_title"][i] or "Untitled role"
+        skills = self.job_skills[i]
+
+        return {
+            "job_id": f"dataset-{i}",
+            "source_name": "Dataset",
+            "title": title,
+            "job_title": title,
+            "company": self.columns["company"][i],
+            "location": self.columns["location"][i],
+            "industry": self.columns["industry"][i],
+            "seniority_level": self.columns["seniority_level"][i],
+            "work_mode": self.columns["status"][i],
+            "salary": self.columns["salary"][i],
+            "salary_min": self.parsed["salary_min"][i],
+            "salary_max": self.parsed["salary_max"][i],
+            "location_normalized": self.parsed["location_normalized"][i],
+            "post_date": self.columns["post_date"][i],
+            "total_score": int(scores["total_score"][row]),
+            "skill_score": int(scores["skill_score"][row]),
+            "qual_score": int(scores["qual_score"][row]),
+            "match_percentage": int(scores["match_percentage"][row]),
+            "matched_skills": [skill for skill in skills if skill in user_skills],
+            "missing_skills": [skill for skill in skills if skill not in user_skills][:8],
+            "missing_qualifications": [q for q in self.job_quals[i] if q not in user_quals][:5],
+        }
+
+    def match(self, skills: list, qualifications: list, top_n: int = 10, query: str = "") -> tuple[list[dict], dict]:
+        user_skills = {self.taxonomy.skills.canonical(s) for s in skills if str(s).strip()}
+        user_quals = {self.taxonomy.qualifications.canonical(q) for q in qualifications if str(q).strip()}
+
+        if query:
+            return self._match_relevance(query, user_skills, user_quals, top_n)
+
+        scores = self.scores(user_skills, user_quals)
+        best = rank(scores, top_n, matched_only=True)
+
+        jobs = [self.job(row, scores, user_skills, user_quals) for row in best]
+        return jobs, {
+            "total_jobs_loaded": self.size,
+            "jobs_with_matches": int(np.count_nonzero(scores["total_score"] > 0)),
+            "candidates": len(scores["jobs"]),
+            "top_n": top_n,
+            "rank_mode": "match",
+        }
+
+    def _match_relevance(self, query: str, user_skills: set, user_quals: set, top_n: int) -> tuple[list[dict], dict]:
+        relevance = self.relevance().scores(query)
+        best = top_relevant(relevance, top_n)
+        scores = self.scores(user_skills, user_quals, best)
+
+        jobs = []
+        for row, i in enumerate(best):
+            job = self.job(row, scores, user_skills, user_quals)
+            job["relevance_score"] = round(float(relevance[i]), 4)
+            jobs.append(job)
+        return jobs, {
+            "total_jobs_loaded": self.size,
+            "jobs_with_matches": int(np.count_nonzero(relevance > 0)),
+            "top_n": top_n,
+            "rank_mode": "relevance",
+        }
+
+    def stats(self) -> dict:
+        return {
+            "postings": self.size,
+            "skills": sum(term.startswith("skill:") for term in self._postings),
+            "qualifications": sum(term.startswith("qual:") for term in self._postings),
+            "terms": len(self._postings),
+            "relevance": self._relevance.stats() if self._relevance else None,
+            "taxonomy_fingerprint": self.fingerprint,
+        }
@@ -0,0 +1,254 @@
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+from matcher import get_matcher
+
+# =========================================================
+# JOB SCORING RULES
+# =========================================================
+# How a job is scored against a user's skills and qualifications, shared by
+# score_job (one job at a time, for normalize_adzuna_job), JobBatch (many
+# jobs at once) and the local dataset index in job_matching.py:
+#   - a user skill matches when it occurs in the job text or the job asks
+#     for the same canonical taxonomy skill; qualifications likewise
+#   - total_score = 2 per matched skill + 1 per matched qualification
+#     + TITLE_BONUS_POINTS per title rule the user qualifies for
+#   - match_percentage = matched / (matched + missing skills), 15 when the
+#     job lists no skills, and at least 35 with a title bonus
+#
+# JobBatch keeps each job's taxonomy skills and qualifications as bitsets,
+# one bit per taxonomy entry packed into bytes, so scoring a user against
+# every job is a handful of AND + popcount passes over a small matrix.
+
+# A job title containing any of the words earns TITLE_BONUS_POINTS when the
+# user has any of the skills.
+TITLE_BONUS_POINTS = 2
+TITLE_BONUS_RULES = (
+    (("data",), ("python", "sql", "data analysis", "data analytics", "power bi")),
+    (("frontend",), ("react", "javascript", "typescript", "html", "css")),
+    (("cloud",), ("aws", "azure", "cloud", "docker", "kubernetes")),
+    (("software", "engineer"), ("java", "python", "flask", "django", "node.js")),
+)
+
+
+def title_bonus(title: str, user_skill_set: set) -> int:
+    title = title.lower()
+    return sum(
+        TITLE_BONUS_POINTS
+        for words, skills in TITLE_BONUS_RULES
+        if any(word in title for word in words) and any(skill in user_skill_set for skill in skills)
+    )
+
+
+def score_job(text: str, title: str, taxonomy, user_skills: list, user_quals: list) -> dict:
+    # One job at a time (normalize_adzuna_job); text is the job's
+    # lower-cased searchable text.
+    skills = [str(skill).lower().strip() for skill in user_skills]
+    quals = [str(q).lower().strip() for q in user_quals]
+
+    # Skills are compared by canonical taxonomy name, so a CV listing "k8s"
+    # covers a job asking for Kubernetes and vice versa.
+    job_skills = taxonomy.skills.find(text)
+    job_quals = taxonomy.qualifications.find(text)
+    job_skill_set = set(job_skills)
+    job_qual_set = set(job_quals)
+    user_skill_set = {taxonomy.skills.canonical(skill) for skill in skills if skill}
+    user_qual_set = {taxonomy.qualifications.canonical(q) for q in quals if q}
+    found_skills = set(get_matcher(tuple(skills)).find(text))
+    found_quals = set(get_matcher(tuple(quals)).find(text))
+
+    matched_skills = [
+        skill for skill in skills
+        if skill and (skill in found_skills or taxonomy.skills.canonical(skill) in job_skill_set)
+    ]
+    missing_skills = [skill for skill in job_skills if skill not in user_skill_set]
+    missing_qualifications = [qual for qual in job_quals if qual not in user_qual_set]
+
+    bonus = title_bonus(title, user_skill_set)
+    skill_score = len(matched_skills)
+    qual_score = sum(
+        1 for q in quals
+        if q and (q in found_quals or taxonomy.qualifications.canonical(q) in job_qual_set)
+    )
+
+    total_relevant = len(matched_skills) + len(missing_skills)
+    match_percentage = round(skill_score / total_relevant * 100) if total_relevant > 0 else 15
+    if bonus > 0 and match_percentage < 35:
+        match_percentage = 35
+
+    return {
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills,
+        "missing_qualifications": missing_qualifications,
+        "skill_score": skill_score,
+        "qual_score": qual_score,
+        "title_bonus": bonus,
+        "total_score": skill_score * 2 + qual_score + bonus,
+        "match_percentage": match_percentage,
+    }
+
+
+def title_rule_flags(titles: list[str]) -> np.ndarray:
+    # (rules x jobs) booleans: does the title contain any of the rule's words.
+    titles = [title.lower() for title in titles]
+    return np.array(
+        [[any(word in title for word in words) for title in titles] for words, _ in TITLE_BONUS_RULES],
+        dtype=bool,
+    ).reshape(len(TITLE_BONUS_RULES), len(titles))
+
+
+def bonus_scores(flags: np.ndarray, user_skill_set: set) -> np.ndarray:
+    bonus = np.zeros(flags.shape[1], dtype=np.int64)
+    for rule, (_, skills) in enumerate(TITLE_BONUS_RULES):
+        if any(skill in user_skill_set for skill in skills):
+            bonus += TITLE_BONUS_POINTS * flags[rule]
+    return bonus
+
+
+def match_percentages(matched: np.ndarray, relevant: np.ndarray, bonus: np.ndarray) -> np.ndarray:
+    ratio = np.divide(matched, relevant, out=np.zeros(len(matched)), where=relevant > 0)
+    percentage = np.where(relevant > 0, np.round(ratio * 100), 15).astype(np.int64)
+    percentage[(bonus > 0) & (percentage < 35)] = 35
+    return percentage
+
+
+def rank(scores: dict, top_n: int, matched_only: bool = False) -> np.ndarray:
+    # Indexes of the top_n jobs by (match_percentage, total_score, matched
+    # skills), best first; ties go to the earlier job, as with a stable
+    # sort. matched_only drops jobs whose total_score is zero.
+    if matched_only:
+        candidates = np.flatnonzero(scores["total_score"] > 0)
+    else:
+        candidates = np.arange(len(scores["total_score"]))
+    if not len(candidates) or top_n <= 0:
+        return candidates[:0]
+
+    # One int64 key per job: percentage in the top bits, then total,
+    # matched count and finally the reversed position.
+    key = (
+        (scores["match_percentage"][candidates] << 52)
+        | (np.minimum(scores["total_score"][candidates], 0xFFFF) << 36)
+        | (np.minimum(scores["skill_score"][candidates], 0xFFF) << 24)
+        | (0xFFFFFF - np.minimum(candidates, 0xFFFFFF))
+    )
+    if len(candidates) > top_n:
+        keep = np.argpartition(-key, top_n - 1)[:top_n]
+        candidates, key = candidates[keep], key[keep]
+    return candidates[np.argsort(-key, kind="stable")]
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+
+
+class JobBatch:
+    # texts are each job's lower-cased searchable text (title, description,
+    # category); everything here is independent of the user and can be kept
+    # while many users are scored against the same jobs.
+    def __init__(
+        self,
+        texts: list[str],
+        titles: list[str],
+        taxonomy,
+        job_skills: Optional[list[list[str]]] = None,
+        job_quals: Optional[list[list[str]]] = None,
+    ):
+        # job_skills / job_quals are what taxonomy.skills.find and
+        # taxonomy.qualifications.find return for each text, when the
+        # caller already has them (see job_index.AdzunaJobIndex).
+        self.taxonomy = taxonomy
+        self.texts = [str(text or "").lower() for text in texts]
+        self.size = len(self.texts)
+
+        self._skill_ids = {name: i for i, name in enumerate(taxonomy.skills.names)}
+        self._qual_ids = {name: i for i, name in enumerate(taxonomy.qualifications.names)}
+        if job_skills is None:
+            job_skills = [taxonomy.skills.find(text) for text in self.texts]
+        if job_quals is None:
+            job_quals = [taxonomy.qualifications.find(text) for text in self.texts]
+        self.job_skills = job_skills
+        self.job_quals = job_quals
+
+        self.skill_bits = self._pack(self.job_skills, self._skill_ids)
+        self.qual_bits = self._pack(self.job_quals, self._qual_ids)
+        self.skill_counts = _popcount(self.skill_bits)
+        self._title_rules = title_rule_flags(titles)
+        self._contains: dict[str, np.ndarray] = {}
+
+    def _pack(self, names_per_job: list[list[str]], ids: dict) -> np.ndarray:
+        dense = np.zeros((self.size, max(1, len(ids))), dtype=bool)
+        for i, names in enumerate(names_per_job):
+            dense[i, [ids[name] for name in names]] = True
+        return np.packbits(dense, axis=1)
+
+    def _mask(self, columns, width: int) -> np.ndarray:
+        dense = np.zeros(max(1, width), dtype=bool)
+        dense[list(columns)] = True
+        return np.packbits(dense)
+
+    @staticmethod
+    def _column(bits: np.ndarray, column: int) -> np.ndarray:
+        return (bits[:, column >> 3] >> (7 - (column & 7))) & 1
+
+    def contains(self, phrase: str) -> np.ndarray:
+        # Plain substring test against every job, cached per phrase.
+        hits = self._contains.get(phrase)
+        if hits is None:
+            hits = np.fromiter((phrase in text for text in self.texts), dtype=bool, count=self.size)
+            self._contains[phrase] = hits
+        return hits
+
+    def _matches(self, entries: list[str], index, ids: dict, bits: np.ndarray) -> np.ndarray:
+        # How many of the user's entries (duplicates count twice) match each
+        # job. An entry that is a canonical name only ever matches through
+        # its bit, since the name occurring in the text sets that bit; other
+        # entries (aliases, unknown words) need their own substring test.
+        total = np.zeros(self.size, dtype=np.int64)
+        named = Counter()
+
+        for entry in entries:
+            canonical = index.canonical(entry)
+            column = ids.get(canonical)
+            if entry == canonical and column is not None:
+                named[column] += 1
+                continue
+
+            hits = self.contains(entry)
+            if column is not None:
+                hits = hits | self._column(bits, column).astype(bool)
+            total += hits
+
+        if named:
+            total += _popcount(bits & self._mask(named, len(ids)))
+            for column, count in named.items():
+                if count > 1:
+                    total += (count - 1) * self._column(bits, column)
+        return total
+
+    def score(self, user_skills: list, user_quals: list) -> dict:
+        skills = [str(skill).lower().strip() for skill in user_skills]
+        quals = [str(q).lower().strip() for q in user_quals]
+        skills = [skill for skill in skills if skill]
+        quals = [q for q in quals if q]
+
+        taxonomy = self.taxonomy
+        user_skill_set = {taxonomy.skills.canonical(skill) for skill in skills}
+
+        matched = self._matches(skills, taxonomy.skills, self._skill_ids, self.skill_bits)
+        qual_score = self._matches(quals, taxonomy.qualifications, self._qual_ids, self.qual_bits)
+
+        known = [self._skill_ids[name] for name in user_skill_set if name in self._skill_ids]
+        shared = _popcount(self.skill_bits & self._mask(known, len(self._skill_ids)))
+        missing = self.skill_counts - shared
+
+        bonus = bonus_scores(self._title_rules, user_skill_set)
+        return {
+            "skill_score": matched,
+            "missing_count": missing,
+            "qual_score": qual_score,
+            "title_bonus": bonus,
+            "total_score": matched * 2 + qual_score + bonus,
+            "match_percentage": match_percentages(matched, matched + missing, bonus),
+        }
@@ -0,0 +1,89 @@
+import argparse
+import json
+import sys
+
+import server
+from job_dataset import JobDataset, build_job_dataset
+
+# =========================================================
+# MAINTENANCE COMMANDS
+# =========================================================
+# Run from this directory with the same .env as the API, e.g.
+#   python manage.py analytics-rebuild [--user EMAIL]
+#   python manage.py analytics-check [--user EMAIL]
+#   python manage.py cvs-ingest PATH [--batch-size N] [--json]
+#   python manage.py dataset-build
+
+
+def analytics_rebuild(args) -> int:
+    server.rebuild_user_analytics(args.user)
+    return 0
+
+
+def analytics_check(args) -> int:
+    mismatches = server.check_user_analytics(args.user)
+
+    if not mismatches:
+        print("[ANALYTICS] Summary matches a full recompute")
+        return 0
+
+    print(json.dumps(mismatches, indent=2))
+    print(f"[ANALYTICS] {len(mismatches)} user(s) out of sync; run analytics-rebuild to fix")
+    return 1
+
+
+def cvs_ingest(args) -> int:
+    # PATH is a zip or a directory; see bulk_ingest.py for how owners are
+    # worked out.
+    if not args.path:
+        print("cvs-ingest needs a zip file or directory")
+        return 2
+
+    report = server.ingest_cv_source(args.path, batch_size=args.batch_size)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for row in report["files"]:
+            if row["status"] == "ok":
+                print(
+                    f"[OK]   {row['file']} -> {row['email']} "
+                    f"({row['chars']} chars, {row['skills']} skills, {row['ms']} ms)"
+                )
+            else:
+                print(f"[{row['status'].upper()}] {row['file']}: {row['error']}")
+        print(
+            f"{report['succeeded']} ingested, {report['failed']} failed, {report['skipped']} skipped "
+            f"in {report['seconds']}s ({report['files_per_second']} files/s, {report['mb_per_second']} MB/s)"
+        )
+
+    return 1 if report["failed"] else 0
+
+
+def dataset_build(args) -> int:
+    # Importing server has usually (re)built it already; this also works
+    # with JOB_DATASET_CACHE=false, e.g. as a deploy step.
+    path = build_job_dataset(server.JOB_CSV_PATH, server.JOB_DATASET_CACHE_DIR)
+    print(f"[DATASET] {server.JOB_CSV_PATH} -> {path}")
+    print(json.dumps(JobDataset.load(path).stats(), indent=2))
+    return 0
+
+
+COMMANDS = {
+    "analytics-rebuild": analytics_rebuild,
+    "analytics-check": analytics_check,
+    "cvs-ingest": cvs_ingest,
+    "dataset-build": dataset_build,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Just Apply maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("path", nargs="?", help="cvs-ingest: zip file or directory of CVs")
+    parser.add_argument("--user", default=None, help="Only this user's email")
+    parser.add_argument("--batch-size", type=int, default=None, help="cvs-ingest: rows per transaction")
+    parser.add_argument("--json", action="store_true", help="cvs-ingest: print the full report as JSON")
+    args = parser.parse_args()
+
+    sys.exit(COMMANDS[args.command](args))
@@ -0,0 +1,175 @@
+from collections import deque
+from functools import lru_cache
+
+# =========================================================
+# KEYWORD MATCHING
+# =========================================================
+# Finds every keyword of a fixed list that occurs as a substring of a text.
+# Large keyword lists are compiled into an Aho–Corasick automaton, which
+# reads the text once no matter how many keywords there are. For short lists
+# one C-level `in` scan per keyword is still quicker than stepping through
+# the text in Python (see `python benchmarks.py matcher`), so below
+# AUTOMATON_MIN_KEYWORDS the matcher scans instead. Both paths return the
+# same result.
+#
+# Keywords flagged whole_word only count when the characters either side of
+# the hit are not letters, digits or underscores, so a short alias such as
+# "js" does not fire inside "json".
+
+AUTOMATON_MIN_KEYWORDS = 100
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    if start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if end < len(text) and _is_word_char(text[end]):
+        return False
+    return True
+
+
+def _contains_word(text: str, pattern: str) -> bool:
+    start = text.find(pattern)
+    while start != -1:
+        if _is_whole_word(text, start, start + len(pattern)):
+            return True
+        start = text.find(pattern, start + 1)
+    return False
+
+
+class _Automaton:
+    def __init__(self, patterns: list[str], whole_word: frozenset = frozenset()):
+        goto: list[dict] = [{}]
+        outputs: list[set] = [set()]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state].add(pattern_id)
+
+        # Breadth-first pass: fail links, inherited outputs, and a full
+        # transition table per state so search() never follows fail links.
+        fail = [0] * len(goto)
+        delta: list[dict] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = delta[fail[state]].get(ch, 0) if state else 0
+                fail[nxt] = fallback if fallback != nxt else 0
+                outputs[nxt] |= outputs[fail[nxt]]
+
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs = [frozenset(out - whole_word) for out in outputs]
+        # Whole-word patterns need the hit position, so they are kept apart
+        # with their lengths and checked only when their state is reached.
+        self._bounded = [
+            tuple((pid, len(patterns[pid])) for pid in sorted(out & whole_word))
+            for out in outputs
+        ]
+        self._has_bounded = bool(whole_word)
+
+    def search(self, text: str) -> set:
+        delta = self._delta
+        outputs = self._outputs
+        bounded = self._bounded
+        state = 0
+        found = set(outputs[0])
+
+        if not self._has_bounded:
+            for ch in text:
+                state = delta[state].get(ch, 0)
+                if outputs[state]:
+                    found |= outputs[state]
+            return found
+
+        for end, ch in enumerate(text, 1):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+            if bounded[state]:
+                for pid, length in bounded[state]:
+                    if pid not in found and _is_whole_word(text, end - length, end):
+                        found.add(pid)
+
+        return found
+
+
+class KeywordMatcher:
+    # Keywords are matched lower-cased and stripped. With ignore_spaces the
+    # keyword and the text both have their spaces removed first, so
+    # "power bi" still matches "powerbi" or "p ower bi" from broken PDFs.
+    def __init__(
+        self,
+        keywords,
+        ignore_spaces: bool = False,
+        automaton_min_keywords: int = AUTOMATON_MIN_KEYWORDS,
+        whole_word=(),
+    ):
+        # whole_word is a collection of keywords (as given) to match as
+        # whole words only; it makes no sense once spaces are stripped.
+        self.keywords = list(keywords)
+        self.ignore_spaces = ignore_spaces
+
+        whole_word = set(whole_word)
+        if whole_word and ignore_spaces:
+            raise ValueError("whole_word matching is not supported with ignore_spaces")
+
+        self._patterns = [
+            (self._prepare(str(kw).strip()), kw in whole_word)
+            for kw in self.keywords
+        ]
+        unique = list(dict.fromkeys(self._patterns))
+
+        self._automaton = None
+        if len(unique) >= automaton_min_keywords:
+            self._automaton = _Automaton(
+                [pattern for pattern, _ in unique],
+                frozenset(i for i, (_, bounded) in enumerate(unique) if bounded),
+            )
+            pattern_ids = {pattern: i for i, pattern in enumerate(unique)}
+            self._keyword_indexes = [[] for _ in unique]
+            for i, pattern in enumerate(self._patterns):
+                self._keyword_indexes[pattern_ids[pattern]].append(i)
+
+    def _prepare(self, text: str) -> str:
+        text = text.lower()
+        return text.replace(" ", "") if self.ignore_spaces else text
+
+    def find(self, text: str) -> list:
+        # Matching keywords in their original order, duplicates included.
+        text = self._prepare(text or "")
+
+        if self._automaton is None:
+            return [
+                kw for kw, (pattern, bounded) in zip(self.keywords, self._patterns)
+                if (_contains_word(text, pattern) if bounded else pattern in text)
+            ]
+
+        # Only the hits are mapped back, so the cost stays proportional to
+        # the text and the number of matches, not the size of the list.
+        found = self._automaton.search(text)
+        indexes = sorted(i for pattern_id in found for i in self._keyword_indexes[pattern_id])
+        return [self.keywords[i] for i in indexes]
+
+
+@lru_cache(maxsize=128)
+def get_matcher(keywords: tuple, ignore_spaces: bool = False) -> KeywordMatcher:
+    return KeywordMatcher(keywords, ignore_spaces=ignore_spaces)
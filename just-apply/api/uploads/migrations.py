@@ -0,0 +1,452 @@
+from typing import Optional
+
+# =========================================================
+# SCHEMA MIGRATIONS
+# =========================================================
+# Each migration is (version, name, {dialect: [statements]}). Applied
+# versions are recorded in schema_migrations, so run_migrations() is cheap to
+# call on every start and safe to call from several workers at once: the
+# migration lock serialises them and each version is re-checked under it.
+
+
+def create_index(dialect: str, name: str, table: str, columns: str, unique: bool = False) -> str:
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+
+    if dialect == "sqlite":
+        return f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({columns})"
+
+    return (
+        f"IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = '{name}' "
+        f"AND object_id = OBJECT_ID('{table}')) "
+        f"CREATE {kind} {name} ON {table} ({columns})"
+    )
+
+
+def dedupe(table: str, columns: str) -> str:
+    # Unique indexes cannot be built over existing duplicates; keep the
+    # oldest row of each group, which is the one the old SELECT-then-INSERT
+    # helpers would have found first.
+    return f"""
+        DELETE FROM {table}
+        WHERE id NOT IN (
+            SELECT keep_id FROM (
+                SELECT MIN(id) AS keep_id FROM {table} GROUP BY {columns}
+            ) AS keepers
+        )
+    """
+
+
+def both(build) -> dict:
+    return {"sqlite": build("sqlite"), "azure": build("azure")}
+
+
+INITIAL_SQLITE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS saved_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        job_id TEXT NOT NULL,
+        title TEXT,
+        company TEXT,
+        location TEXT,
+        industry TEXT,
+        total_score INTEGER,
+        skill_score INTEGER,
+        qual_score INTEGER,
+        match_percentage INTEGER,
+        matched_skills TEXT,
+        missing_skills TEXT,
+        missing_qualifications TEXT,
+        raw_job_json TEXT NOT NULL,
+        saved_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_cvs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        original_name TEXT NOT NULL,
+        stored_filename TEXT,
+        azure_blob_url TEXT,
+        extracted_skills TEXT,
+        extracted_qualifications TEXT,
+        text_preview TEXT,
+        uploaded_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS job_applications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        external_job_id TEXT NOT NULL,
+        source_name TEXT NOT NULL,
+        title TEXT,
+        company TEXT,
+        location TEXT,
+        apply_url TEXT,
+        status TEXT NOT NULL DEFAULT 'Applied',
+        notes TEXT,
+        applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_career_targets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT UNIQUE NOT NULL,
+        target_role TEXT NOT NULL,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS email_alert_preferences (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT UNIQUE NOT NULL,
+        alerts_enabled INTEGER NOT NULL DEFAULT 1,
+        frequency TEXT NOT NULL DEFAULT 'daily',
+        preferred_location TEXT,
+        jobs_per_email INTEGER NOT NULL DEFAULT 5,
+        last_sent_at TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS emailed_jobs_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        external_job_id TEXT NOT NULL,
+        title TEXT,
+        emailed_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+INITIAL_AZURE_SCHEMA = [
+    """
+    IF NOT EXISTS (
+        SELECT * FROM sysobjects WHERE name='users' AND xtype='U'
+    )
+    CREATE TABLE users (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        name NVARCHAR(255) NOT NULL,
+        email NVARCHAR(255) UNIQUE NOT NULL,
+        password_hash NVARCHAR(255) NOT NULL,
+        created_at DATETIME DEFAULT GETDATE()
+    )
+    """,
+    """
+    IF NOT EXISTS (
+        SELECT * FROM sysobjects WHERE name='saved_jobs' AND xtype='U'
+    )
+    CREATE TABLE saved_jobs (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        user_email NVARCHAR(255) NOT NULL,
+        job_id NVARCHAR(255) NOT NULL,
+        title NVARCHAR(255) NULL,
+        company NVARCHAR(255) NULL,
+        location NVARCHAR(255) NULL,
+        industry NVARCHAR(255) NULL,
+        total_score INT NULL,
+        skill_score INT NULL,
+        qual_score INT NULL,
+        match_percentage INT NULL,
+        matched_skills NVARCHAR(MAX) NULL,
+        missing_skills NVARCHAR(MAX) NULL,
+        missing_qualifications NVARCHAR(MAX) NULL,
+        raw_job_json NVARCHAR(MAX) NOT NULL,
+        saved_at DATETIME DEFAULT GETDATE()
+    )
+    """,
+    """
+    IF NOT EXISTS (
+        SELECT * FROM sysobjects WHERE name='user_cvs' AND xtype='U'
+    )
+    CREATE TABLE user_cvs (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        user_email NVARCHAR(255) NOT NULL,
+        original_name NVARCHAR(255) NOT NULL,
+        stored_filename NVARCHAR(255) NULL,
+        azure_blob_url NVARCHAR(MAX) NULL,
+        extracted_skills NVARCHAR(MAX) NULL,
+        extracted_qualifications NVARCHAR(MAX) NULL,
+        text_preview NVARCHAR(MAX) NULL,
+        uploaded_at DATETIME DEFAULT GETDATE()
+    )
+    """,
+    """
+    IF NOT EXISTS (
+        SELECT * FROM sysobjects WHERE name='job_applications' AND xtype='U'
+    )
+    CREATE TABLE job_applications (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        user_email NVARCHAR(255) NOT NULL,
+        external_job_id NVARCHAR(255) NOT NULL,
+        source_name NVARCHAR(100) NOT NULL,
+        title NVARCHAR(255) NULL,
+        company NVARCHAR(255) NULL,
+        location NVARCHAR(255) NULL,
+        apply_url NVARCHAR(MAX) NULL,
+        status NVARCHAR(50) NOT NULL DEFAULT 'Applied',
+        notes NVARCHAR(MAX) NULL,
+        applied_at DATETIME DEFAULT GETDATE()
+    )
+    """,
+    """
+    IF NOT EXISTS (
+        SELECT * FROM sysobjects WHERE name='user_career_targets' AND xtype='U'
+    )
+    CREATE TABLE user_career_targets (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        user_email NVARCHAR(255) UNIQUE NOT NULL,
+        target_role NVARCHAR(255) NOT NULL,
+        updated_at DATETIME DEFAULT GETDATE()
+    )
+    """,
+    """
+    IF NOT EXISTS (
+        SELECT * FROM sysobjects WHERE name='email_alert_preferences' AND xtype='U'
+    )
+    CREATE TABLE email_alert_preferences (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        user_email NVARCHAR(255) UNIQUE NOT NULL,
+        alerts_enabled BIT NOT NULL DEFAULT 1,
+        frequency NVARCHAR(50) NOT NULL DEFAULT 'daily',
+        preferred_location NVARCHAR(255) NULL,
+        jobs_per_email INT NOT NULL DEFAULT 5,
+        last_sent_at DATETIME NULL,
+        created_at DATETIME DEFAULT GETDATE(),
+        updated_at DATETIME DEFAULT GETDATE()
+    )
+    """,
+    """
+    IF NOT EXISTS (
+        SELECT * FROM sysobjects WHERE name='emailed_jobs_history' AND xtype='U'
+    )
+    CREATE TABLE emailed_jobs_history (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        user_email NVARCHAR(255) NOT NULL,
+        external_job_id NVARCHAR(255) NOT NULL,
+        title NVARCHAR(255) NULL,
+        emailed_at DATETIME DEFAULT GETDATE()
+    )
+    """,
+]
+
+MIGRATIONS = [
+    (1, "initial schema", {
+        "sqlite": INITIAL_SQLITE_SCHEMA,
+        "azure": INITIAL_AZURE_SCHEMA,
+    }),
+    (2, "saved_jobs per-user indexes", both(lambda d: [
+        dedupe("saved_jobs", "user_email, job_id"),
+        create_index(d, "ux_saved_jobs_user_job", "saved_jobs", "user_email, job_id", unique=True),
+        create_index(d, "ix_saved_jobs_user_saved_at", "saved_jobs", "user_email, saved_at"),
+    ])),
+    (3, "job_applications per-user indexes", both(lambda d: [
+        dedupe("job_applications", "user_email, external_job_id"),
+        create_index(
+            d, "ux_job_applications_user_job", "job_applications",
+            "user_email, external_job_id", unique=True,
+        ),
+        create_index(d, "ix_job_applications_user_applied_at", "job_applications", "user_email, applied_at"),
+    ])),
+    (4, "user_cvs per-user index", both(lambda d: [
+        create_index(d, "ix_user_cvs_user_uploaded_at", "user_cvs", "user_email, uploaded_at"),
+    ])),
+    (5, "emailed_jobs_history dedupe index", both(lambda d: [
+        dedupe("emailed_jobs_history", "user_email, external_job_id"),
+        create_index(
+            d, "ux_emailed_jobs_user_job", "emailed_jobs_history",
+            "user_email, external_job_id", unique=True,
+        ),
+    ])),
+    (6, "user_list_versions", {
+        "sqlite": [
+            """
+            CREATE TABLE IF NOT EXISTS user_list_versions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_email TEXT NOT NULL,
+                list_name TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+            """,
+            create_index("sqlite", "ux_user_list_versions", "user_list_versions", "user_email, list_name", unique=True),
+        ],
+        "azure": [
+            """
+            IF NOT EXISTS (
+                SELECT * FROM sysobjects WHERE name='user_list_versions' AND xtype='U'
+            )
+            CREATE TABLE user_list_versions (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                user_email NVARCHAR(255) NOT NULL,
+                list_name NVARCHAR(50) NOT NULL,
+                version INT NOT NULL DEFAULT 0
+            )
+            """,
+            create_index("azure", "ux_user_list_versions", "user_list_versions", "user_email, list_name", unique=True),
+        ],
+    }),
+    (7, "user_analytics summary", {
+        "sqlite": [
+            """
+            CREATE TABLE IF NOT EXISTS user_analytics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_email TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value INTEGER NOT NULL DEFAULT 0
+            )
+            """,
+            create_index("sqlite", "ux_user_analytics", "user_analytics", "user_email, metric, name", unique=True),
+        ],
+        "azure": [
+            """
+            IF NOT EXISTS (
+                SELECT * FROM sysobjects WHERE name='user_analytics' AND xtype='U'
+            )
+            CREATE TABLE user_analytics (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                user_email NVARCHAR(255) NOT NULL,
+                metric NVARCHAR(50) NOT NULL,
+                name NVARCHAR(255) NOT NULL,
+                value INT NOT NULL DEFAULT 0
+            )
+            """,
+            create_index("azure", "ux_user_analytics", "user_analytics", "user_email, metric, name", unique=True),
+        ],
+    }),
+    (8, "cv_upload_jobs", {
+        "sqlite": [
+            """
+            CREATE TABLE IF NOT EXISTS cv_upload_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                user_email TEXT NOT NULL,
+                original_name TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                result_json TEXT,
+                error TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            create_index("sqlite", "ux_cv_upload_jobs_job_id", "cv_upload_jobs", "job_id", unique=True),
+        ],
+        "azure": [
+            """
+            IF NOT EXISTS (
+                SELECT * FROM sysobjects WHERE name='cv_upload_jobs' AND xtype='U'
+            )
+            CREATE TABLE cv_upload_jobs (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                job_id NVARCHAR(64) NOT NULL,
+                user_email NVARCHAR(255) NOT NULL,
+                original_name NVARCHAR(255) NOT NULL,
+                status NVARCHAR(20) NOT NULL DEFAULT 'queued',
+                result_json NVARCHAR(MAX) NULL,
+                error NVARCHAR(MAX) NULL,
+                created_at DATETIME DEFAULT GETDATE(),
+                updated_at DATETIME DEFAULT GETDATE()
+            )
+            """,
+            create_index("azure", "ux_cv_upload_jobs_job_id", "cv_upload_jobs", "job_id", unique=True),
+        ],
+    }),
+    (9, "user_cvs stored_filename index", both(lambda d: [
+        create_index(d, "ix_user_cvs_stored_filename", "user_cvs", "stored_filename"),
+    ])),
+]
+
+# Migrations that need a data backfill the server runs once they apply.
+ANALYTICS_SUMMARY_VERSION = 7
+
+SCHEMA_MIGRATIONS_DDL = {
+    "sqlite": """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "azure": """
+    IF NOT EXISTS (
+        SELECT * FROM sysobjects WHERE name='schema_migrations' AND xtype='U'
+    )
+    CREATE TABLE schema_migrations (
+        version INT PRIMARY KEY,
+        name NVARCHAR(255) NOT NULL,
+        applied_at DATETIME DEFAULT GETDATE()
+    )
+    """,
+}
+
+MIGRATION_LOCK = {
+    "sqlite": "BEGIN IMMEDIATE",
+    "azure": (
+        "EXEC sp_getapplock @Resource = 'schema_migrations', "
+        "@LockMode = 'Exclusive', @LockOwner = 'Transaction', @LockTimeout = 60000"
+    ),
+}
+
+
+def applied_versions(cursor) -> set[int]:
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {int(row[0]) for row in cursor.fetchall()}
+
+
+def run_migrations(conn, dialect: str, target: Optional[int] = None) -> list[int]:
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_MIGRATIONS_DDL[dialect])
+    conn.commit()
+
+    applied = []
+
+    for version, name, steps in MIGRATIONS:
+        if target is not None and version > target:
+            break
+
+        # sqlite3 only opens transactions implicitly before DML, so the write
+        # lock is taken explicitly; concurrent workers queue up here.
+        cursor.execute(MIGRATION_LOCK[dialect])
+
+        if version in applied_versions(cursor):
+            conn.rollback()
+            continue
+
+        try:
+            for statement in steps[dialect]:
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                (version, name),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            cursor.close()
+            raise
+
+        applied.append(version)
+        print(f"[MIGRATIONS] Applied {version}: {name}")
+
+    cursor.close()
+    return applied
+
+
+def current_version(conn) -> int:
+    cursor = conn.cursor()
+    try:
+        versions = applied_versions(cursor)
+    finally:
+        cursor.close()
+    return max(versions) if versions else 0
@@ -1,7 +1,7 @@
 import re
 import nltk
+from taxonomy import get_taxonomy
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 
 try:
     stopwords.words("english")
@@ -16,25 +16,7 @@ except LookupError:
 EN_STOPWORDS = set(stopwords.words("english"))
 
 # KEYWORDS
-SKILL_KEYWORDS = [
-    "python", "java", "javascript", "typescript", "c#", "c++",
-    "react", "next.js", "html", "css", "django", "flask", "node.js",
-    "sql", "mysql", "postgresql", "azure", "aws", "docker",
-    "git", "linux", "power bi", "nlp", "natural language processing",
-    "machine learning", "data analysis", "data analytics",
-    "ui", "ux", "figma", "cloud", "kubernetes", "devops", "terraform"
-]
-
-QUALIFICATION_KEYWORDS = [
-    "bsc", "b.sc", "bachelor", "bachelors", "ba", "b.a",
-    "msc", "m.sc", "master", "masters", "ma", "m.a",
-    "phd", "doctorate",
-    "bachelor of science", "bachelor of engineering",
-    "bachelor of arts", "master of science", "master of engineering",
-    "master of arts", "honours", "hons", "higher diploma",
-    "postgraduate diploma", "aws certified", "azure certification",
-    "oracle certified", "microsoft certified", "ccna", "comptia"
-]
+# Skills and qualifications come from skill_taxonomy.json (see taxonomy.py).
 
 # TEXT CLEANING
 def clean_extracted_text(text: str) -> str:
@@ -55,51 +37,9 @@ def clean_extracted_text(text: str) -> str:
 
     return text.strip()
 
-# TOKENIZATION
-def normalize_tokens(text: str) -> list[str]:
-    text = clean_extracted_text(text)
-    tokens = word_tokenize(text)
-
-    clean = []
-    for tok in tokens:
-        lower = tok.lower().strip()
-        if lower and lower not in EN_STOPWORDS:
-            clean.append(lower)
-
-    return clean
-
-def keyword_match(text: str, keywords: list[str]) -> list[str]:
-    text = clean_extracted_text(text).lower()
-
-    found = []
-
-    for kw in keywords:
-        kw_lower = kw.lower().strip()
-
-        # match word boundaries (more accurate)
-        if re.search(rf"\b{re.escape(kw_lower)}\b", text):
-            found.append(kw)
-            continue
-
-        # fallback: loose match (handles broken PDFs)
-        if kw_lower.replace(" ", "") in text.replace(" ", ""):
-            found.append(kw)
-
-    # remove duplicates
-    seen = set()
-    unique = []
-
-    for item in found:
-        key = item.lower()
-        if key not in seen:
-            seen.add(key)
-            unique.append(item)
-
-    return unique
-
 def extract_skills(text: str) -> list[str]:
-    return keyword_match(text, SKILL_KEYWORDS)
+    return get_taxonomy().skills.find_loose(clean_extracted_text(text))
 
 
 def extract_qualifications(text: str) -> list[str]:
-    return keyword_match(text, QUALIFICATION_KEYWORDS)
\ No newline at end of file
+    return get_taxonomy().qualifications.find_loose(clean_extracted_text(text))
\ No newline at end of file
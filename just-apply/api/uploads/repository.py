@@ -0,0 +1,1016 @@
+import abc
+import base64
+import json
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from analytics import (
+    application_deltas,
+    count_profile,
+    counters_from_deltas,
+    cv_deltas,
+    diff_counters,
+    saved_job_deltas,
+)
+
+# =========================================================
+# DIALECTS
+# =========================================================
+# Queries are written once with {placeholders} for the few bits of syntax
+# that differ between SQLite and SQL Server. Each dialect renders a query
+# template exactly once (lru_cache) so the same statement text is reused on
+# every call, which is what lets sqlite3's per-connection statement cache and
+# SQL Server's parameterised plan cache hit.
+
+
+class Dialect(abc.ABC):
+    name = ""
+    now = ""
+    limit = ""
+    timestamp_param = "?"
+    # Joins a JSON array column as rows: FROM t{json_items}(t.col) AS item
+    json_items = ""
+    # Table hint for reads inside Repository.transaction() that the same
+    # transaction is about to write back: FROM t{lock} WHERE ...
+    lock = ""
+    # Statement that opens a transaction holding the write lock, or "" when
+    # the driver already runs every statement inside one.
+    begin = ""
+
+    def __init__(self):
+        self.sql = lru_cache(maxsize=256)(self._render)
+        self.upsert = lru_cache(maxsize=64)(self._upsert)
+
+    def _render(self, template: str) -> str:
+        return template.format(
+            now=self.now,
+            limit=self.limit,
+            ts=self.timestamp_param,
+            json_items=self.json_items,
+            lock=self.lock,
+        )
+
+    def cursor_timestamp(self, value: Any) -> str:
+        return as_text(value)
+
+    @abc.abstractmethod
+    def _upsert(
+        self,
+        table: str,
+        keys: tuple,
+        columns: tuple,
+        update: tuple = (),
+        touch: tuple = (),
+        increment: tuple = (),
+        accumulate: tuple = (),
+    ) -> str:
+        # Single-statement insert-or-update keyed on a unique index (see
+        # migrations.py). With no update/touch/increment/accumulate columns
+        # it is insert-if-absent and the rowcount tells the caller whether a
+        # row was inserted. accumulate adds the supplied value to the stored
+        # one.
+        ...
+
+
+class SQLiteDialect(Dialect):
+    name = "sqlite"
+    now = "CURRENT_TIMESTAMP"
+    limit = "LIMIT ?"
+    json_items = ", json_each"
+    # SQLite locks the whole database, so the lock is taken up front.
+    begin = "BEGIN IMMEDIATE"
+
+    def _upsert(self, table, keys, columns, update=(), touch=(), increment=(), accumulate=()):
+        assignments = [f"{col} = excluded.{col}" for col in update]
+        assignments += [f"{col} = {self.now}" for col in touch]
+        assignments += [f"{col} = {col} + 1" for col in increment]
+        assignments += [f"{col} = {col} + excluded.{col}" for col in accumulate]
+        action = f"DO UPDATE SET {', '.join(assignments)}" if assignments else "DO NOTHING"
+
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT ({', '.join(keys)}) {action}"
+        )
+
+
+class SQLServerDialect(Dialect):
+    name = "azure"
+    now = "GETDATE()"
+    limit = "OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY"
+    json_items = " CROSS APPLY OPENJSON"
+    lock = " WITH (UPDLOCK, HOLDLOCK)"
+    # Cursor timestamps travel as ISO-8601 text; casting back to DATETIME
+    # keeps the keyset comparison exact for DATETIME's 1/300 s precision.
+    timestamp_param = "CAST(? AS DATETIME)"
+
+    def cursor_timestamp(self, value: Any) -> str:
+        if isinstance(value, datetime):
+            return value.isoformat(timespec="milliseconds")
+        return as_text(value)
+
+    def _upsert(self, table, keys, columns, update=(), touch=(), increment=(), accumulate=()):
+        assignments = [f"{col} = source.{col}" for col in update]
+        assignments += [f"{col} = {self.now}" for col in touch]
+        assignments += [f"{col} = target.{col} + 1" for col in increment]
+        assignments += [f"{col} = target.{col} + source.{col}" for col in accumulate]
+        matched = f"WHEN MATCHED THEN UPDATE SET {', '.join(assignments)} " if assignments else ""
+
+        return (
+            f"MERGE INTO {table} WITH (HOLDLOCK) AS target "
+            f"USING (SELECT {', '.join(f'? AS {col}' for col in columns)}) AS source "
+            f"ON {' AND '.join(f'target.{key} = source.{key}' for key in keys)} "
+            f"{matched}"
+            f"WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) "
+            f"VALUES ({', '.join(f'source.{col}' for col in columns)});"
+        )
+
+
+SQLITE = SQLiteDialect()
+SQLSERVER = SQLServerDialect()
+
+
+def get_dialect(mode: str) -> Dialect:
+    return SQLITE if mode == "sqlite" else SQLSERVER
+
+
+def as_text(value: Any) -> str:
+    # SQL Server hands back datetime objects, SQLite hands back strings.
+    return str(value) if value else ""
+
+
+def load_json_list(value: Optional[str]) -> list:
+    return json.loads(value) if value else []
+
+
+def encode_cursor(timestamp: str, row_id: int) -> str:
+    raw = json.dumps([timestamp, int(row_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(timestamp), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def saved_job_id(job: dict) -> str:
+    job_id = (
+        job.get("job_id")
+        or job.get("external_job_id")
+        or job.get("id")
+        or job.get("title")
+        or job.get("job_title")
+    )
+    return str(job_id or f"job-{datetime.now().timestamp()}")
+
+
+# =========================================================
+# REPOSITORY
+# =========================================================
+CV_COLUMNS = (
+    "original_name, stored_filename, azure_blob_url, "
+    "extracted_skills, extracted_qualifications, text_preview, uploaded_at"
+)
+APPLICATION_COLUMNS = (
+    "id, external_job_id, source_name, title, company, location, "
+    "apply_url, status, notes, applied_at"
+)
+
+SAVED_JOBS_LIST = "saved_jobs"
+APPLICATIONS_LIST = "applications"
+
+SAVED_JOB_COLUMNS = (
+    "user_email", "job_id", "title", "company", "location", "industry",
+    "total_score", "skill_score", "qual_score", "match_percentage",
+    "matched_skills", "missing_skills", "missing_qualifications", "raw_job_json",
+)
+
+class Repository:
+    def __init__(self, connect: Callable[[], Any], dialect: Dialect, write_queue=None):
+        # connect() must return a connection whose close() hands it back to
+        # its owner (see db.PooledConnection). When a db.WriteQueue is given,
+        # every write goes through it and is group-committed with others.
+        self._connect = connect
+        self.dialect = dialect
+        self.write_queue = write_queue
+
+    @contextmanager
+    def _cursor(self):
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            try:
+                yield conn, cursor
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _rows(cursor, rows) -> list[dict]:
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def fetch_one(self, template: str, params: tuple = ()) -> Optional[dict]:
+        with self._cursor() as (_, cursor):
+            cursor.execute(self.dialect.sql(template), params)
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return self._rows(cursor, [row])[0]
+
+    def fetch_all(self, template: str, params: tuple = ()) -> list[dict]:
+        with self._cursor() as (_, cursor):
+            cursor.execute(self.dialect.sql(template), params)
+            return self._rows(cursor, cursor.fetchall())
+
+    def execute(self, template: str, params: tuple = (), wait: bool = True) -> int:
+        # wait=False lets a queued write return immediately; it is used for
+        # bookkeeping rows nobody reads back within the same request.
+        if self.write_queue is not None:
+            result = self.write_queue.execute(self.dialect.sql(template), params, wait=wait)
+            return result if wait else 0
+
+        with self._cursor() as (conn, cursor):
+            cursor.execute(self.dialect.sql(template), params)
+            conn.commit()
+            return cursor.rowcount
+
+    def execute_many(self, template: str, rows: list[tuple]):
+        # One transaction for the whole batch (or one group commit when the
+        # write queue is on) instead of a commit per row.
+        if not rows:
+            return
+
+        sql = self.dialect.sql(template)
+
+        if self.write_queue is not None:
+            futures = [self.write_queue.submit(sql, params) for params in rows]
+            for future in futures:
+                future.result()
+            return
+
+        with self._cursor() as (conn, cursor):
+            cursor.executemany(sql, rows)
+            conn.commit()
+
+    def transaction(self, work: Callable[["Transaction"], Any]) -> Any:
+        # Runs work(tx) as one transaction on one connection and returns its
+        # result. tx is a Repository whose reads and writes all go through
+        # that transaction, so a read-modify-write (old status -> write ->
+        # analytics delta) cannot interleave with another one. With the
+        # write queue on it runs on the writer thread inside its batch.
+        if self.write_queue is not None:
+            return self.write_queue.call(
+                lambda conn: self._run_transaction(conn, work, begin=False)
+            )
+
+        with self._cursor() as (conn, _):
+            return self._run_transaction(conn, work, begin=True)
+
+    def _run_transaction(self, conn, work, begin: bool) -> Any:
+        cursor = conn.cursor()
+        try:
+            if begin and self.dialect.begin:
+                cursor.execute(self.dialect.begin)
+            result = work(Transaction(cursor, self.dialect))
+            if begin:
+                conn.commit()
+            return result
+        except Exception:
+            if begin:
+                conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def fetch_page(
+        self,
+        columns: str,
+        table: str,
+        timestamp_column: str,
+        user_email: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        # Keyset pagination, newest first, on (timestamp, id). Each page is a
+        # range scan on the (user_email, timestamp) index no matter how deep
+        # the client has paged, unlike OFFSET.
+        params: list = [user_email]
+        after = ""
+
+        if cursor:
+            timestamp, row_id = decode_cursor(cursor)
+            after = (
+                f"AND ({timestamp_column} < {{ts}} "
+                f"OR ({timestamp_column} = {{ts}} AND id < ?))"
+            )
+            params += [timestamp, timestamp, row_id]
+
+        params.append(limit + 1)
+        rows = self.fetch_all(f"""
+            SELECT {columns}, id AS page_id, {timestamp_column} AS page_ts
+            FROM {table}
+            WHERE user_email = ? {after}
+            ORDER BY {timestamp_column} DESC, id DESC
+            {{limit}}
+        """, tuple(params))
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(self.dialect.cursor_timestamp(last["page_ts"]), last["page_id"])
+
+        for row in rows:
+            row.pop("page_id", None)
+            row.pop("page_ts", None)
+
+        return rows, next_cursor
+
+    def count_for_user(self, table: str, user_email: str) -> int:
+        row = self.fetch_one(f"SELECT COUNT(*) AS total FROM {table} WHERE user_email = ?", (user_email,))
+        return int(row["total"]) if row else 0
+
+    # -----------------------------------------------------
+    # USERS
+    # -----------------------------------------------------
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        return self.fetch_one(
+            "SELECT id, name, email, password_hash FROM users WHERE email = ?",
+            (email,),
+        )
+
+    def create_user(self, name: str, email: str, password_hash: str) -> dict:
+        self.execute(
+            "INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)",
+            (name, email, password_hash),
+        )
+        self.ensure_email_preferences(email)
+        return self.get_user_by_email(email)
+
+    # -----------------------------------------------------
+    # SAVED JOBS
+    # -----------------------------------------------------
+    @staticmethod
+    def _saved_jobs(rows: list[dict]) -> list:
+        jobs = []
+        for row in rows:
+            try:
+                jobs.append(json.loads(row["raw_job_json"]))
+            except Exception:
+                pass
+        return jobs
+
+    def get_saved_jobs(self, user_email: str) -> list:
+        rows = self.fetch_all("""
+            SELECT raw_job_json
+            FROM saved_jobs
+            WHERE user_email = ?
+            ORDER BY saved_at DESC, id DESC
+        """, (user_email,))
+        return self._saved_jobs(rows)
+
+    def get_saved_jobs_page(self, user_email: str, limit: int, cursor: Optional[str] = None):
+        rows, next_cursor = self.fetch_page(
+            "raw_job_json", "saved_jobs", "saved_at", user_email, limit, cursor
+        )
+        return self._saved_jobs(rows), next_cursor
+
+    def count_saved_jobs(self, user_email: str) -> int:
+        return self.count_for_user("saved_jobs", user_email)
+
+    def save_job(self, user_email: str, job: dict, job_id: Optional[str] = None) -> bool:
+        job_id = job_id or saved_job_id(job)
+
+        params = (
+            user_email,
+            str(job_id),
+            job.get("title") or job.get("job_title") or "",
+            job.get("company") or "",
+            job.get("location") or "",
+            job.get("industry") or "",
+            int(job.get("total_score", 0) or 0),
+            int(job.get("skill_score", 0) or 0),
+            int(job.get("qual_score", 0) or 0),
+            int(job.get("match_percentage", 0) or 0),
+            json.dumps(job.get("matched_skills", [])),
+            json.dumps(job.get("missing_skills", [])),
+            json.dumps(job.get("missing_qualifications", [])),
+            json.dumps(job),
+        )
+
+        def work(tx) -> bool:
+            inserted = tx.execute(tx.dialect.upsert(
+                "saved_jobs",
+                ("user_email", "job_id"),
+                SAVED_JOB_COLUMNS,
+            ), params)
+
+            if inserted:
+                tx.bump_list_version(user_email, SAVED_JOBS_LIST)
+                tx.apply_analytics_deltas(user_email, saved_job_deltas(job))
+            return inserted > 0
+
+        return self.transaction(work)
+
+    def remove_saved_job(self, user_email: str, job_id: str) -> bool:
+        def work(tx) -> bool:
+            row = tx.fetch_one("""
+                SELECT raw_job_json
+                FROM saved_jobs{lock}
+                WHERE user_email = ? AND job_id = ?
+            """, (user_email, str(job_id)))
+
+            removed = tx.execute("""
+                DELETE FROM saved_jobs
+                WHERE user_email = ? AND job_id = ?
+            """, (user_email, str(job_id)))
+
+            if removed:
+                tx.bump_list_version(user_email, SAVED_JOBS_LIST)
+                jobs = tx._saved_jobs([row]) if row else []
+                if jobs:
+                    tx.apply_analytics_deltas(user_email, saved_job_deltas(jobs[0], sign=-1))
+            return removed > 0
+
+        return self.transaction(work)
+
+    # -----------------------------------------------------
+    # CV HISTORY
+    # -----------------------------------------------------
+    def save_cv(
+        self,
+        user_email: str,
+        original_name: str,
+        stored_filename: str,
+        azure_blob_url: Optional[str],
+        skills: list[str],
+        qualifications: list[str],
+        text_preview: str,
+    ):
+        self.save_cvs([{
+            "user_email": user_email,
+            "original_name": original_name,
+            "stored_filename": stored_filename,
+            "azure_blob_url": azure_blob_url,
+            "skills": skills,
+            "qualifications": qualifications,
+            "text_preview": text_preview,
+        }])
+
+    def save_cvs(self, cvs: list[dict]):
+        # Many CVs, possibly for many users, in one transaction together
+        # with one analytics update per user (bulk ingestion).
+        self.transaction(lambda tx: tx._save_cvs(cvs))
+
+    def _save_cvs(self, cvs: list[dict]):
+        self.execute_many("""
+            INSERT INTO user_cvs (
+                user_email, original_name, stored_filename,
+                azure_blob_url, extracted_skills, extracted_qualifications,
+                text_preview
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                cv["user_email"],
+                cv["original_name"],
+                cv["stored_filename"],
+                cv["azure_blob_url"] or "",
+                json.dumps(cv["skills"] or []),
+                json.dumps(cv["qualifications"] or []),
+                cv["text_preview"] or "",
+            )
+            for cv in cvs
+        ])
+
+        deltas = {}
+        for cv in cvs:
+            deltas.setdefault(cv["user_email"], Counter()).update(
+                cv_deltas(cv["skills"], cv["qualifications"])
+            )
+        for user_email, user_deltas in deltas.items():
+            self.apply_analytics_deltas(user_email, user_deltas)
+
+    @staticmethod
+    def _cv(row: dict) -> dict:
+        return {
+            "original_name": row["original_name"],
+            "stored_filename": row["stored_filename"],
+            "azure_blob_url": row["azure_blob_url"],
+            "skills": load_json_list(row["extracted_skills"]),
+            "qualifications": load_json_list(row["extracted_qualifications"]),
+            "text_preview": row["text_preview"] or "",
+            "uploaded_at": as_text(row["uploaded_at"]),
+        }
+
+    def get_uploaded_cvs(self, user_email: str) -> list:
+        rows = self.fetch_all("""
+            SELECT original_name, stored_filename, azure_blob_url,
+                   extracted_skills, extracted_qualifications,
+                   text_preview, uploaded_at
+            FROM user_cvs
+            WHERE user_email = ?
+            ORDER BY uploaded_at DESC, id DESC
+        """, (user_email,))
+        return [self._cv(row) for row in rows]
+
+    def get_uploaded_cvs_page(self, user_email: str, limit: int, cursor: Optional[str] = None):
+        rows, next_cursor = self.fetch_page(
+            CV_COLUMNS, "user_cvs", "uploaded_at", user_email, limit, cursor
+        )
+        return [self._cv(row) for row in rows], next_cursor
+
+    def count_uploaded_cvs(self, user_email: str) -> int:
+        return self.count_for_user("user_cvs", user_email)
+
+    def set_cv_blob_url(self, stored_filename: str, azure_blob_url: str):
+        # Every row pointing at the blob, including re-uploads of the same
+        # file that reused it while it was still on its way.
+        self.execute("""
+            UPDATE user_cvs
+            SET azure_blob_url = ?
+            WHERE stored_filename = ? AND COALESCE(azure_blob_url, '') = ''
+        """, (azure_blob_url, stored_filename))
+
+    # -----------------------------------------------------
+    # CV UPLOAD JOBS
+    # -----------------------------------------------------
+    def create_cv_upload_job(self, user_email: str, job_id: str, original_name: str, status: str):
+        self.execute("""
+            INSERT INTO cv_upload_jobs (job_id, user_email, original_name, status)
+            VALUES (?, ?, ?, ?)
+        """, (job_id, user_email, original_name, status))
+
+    def update_cv_upload_job(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+    ):
+        self.execute("""
+            UPDATE cv_upload_jobs
+            SET status = ?,
+                result_json = ?,
+                error = ?,
+                updated_at = {now}
+            WHERE job_id = ?
+        """, (status, json.dumps(result) if result is not None else None, error, job_id))
+
+    def get_cv_upload_job(self, user_email: str, job_id: str) -> Optional[dict]:
+        row = self.fetch_one("""
+            SELECT job_id, original_name, status, result_json, error, created_at, updated_at
+            FROM cv_upload_jobs
+            WHERE job_id = ? AND user_email = ?
+        """, (job_id, user_email))
+
+        if row is None:
+            return None
+
+        return {
+            "job_id": row["job_id"],
+            "original_name": row["original_name"],
+            "status": row["status"],
+            "result": json.loads(row["result_json"]) if row["result_json"] else None,
+            "error": row["error"],
+            "created_at": as_text(row["created_at"]),
+            "updated_at": as_text(row["updated_at"]),
+        }
+
+    # -----------------------------------------------------
+    # APPLICATIONS
+    # -----------------------------------------------------
+    def save_job_application(self, user_email: str, job: dict, status: str = "Applied") -> str:
+        external_job_id = str(
+            job.get("external_job_id")
+            or job.get("id")
+            or job.get("job_id")
+            or f"adzuna-{datetime.now().timestamp()}"
+        )
+
+        source_name = str(job.get("source_name") or "Adzuna")
+        title = str(job.get("title") or job.get("job_title") or "")
+        company = str(job.get("company") or "")
+        location = str(job.get("location") or "")
+        apply_url = str(job.get("apply_url") or job.get("redirect_url") or "")
+        notes = str(job.get("notes") or "")
+
+        def work(tx):
+            previous = tx.fetch_one("""
+                SELECT status
+                FROM job_applications{lock}
+                WHERE user_email = ? AND external_job_id = ?
+            """, (user_email, external_job_id))
+
+            tx.execute(tx.dialect.upsert(
+                "job_applications",
+                ("user_email", "external_job_id"),
+                (
+                    "user_email", "external_job_id", "source_name", "title", "company",
+                    "location", "apply_url", "status", "notes",
+                ),
+                update=("status", "notes", "apply_url", "title", "company", "location"),
+            ), (
+                user_email, external_job_id, source_name, title, company,
+                location, apply_url, status, notes
+            ))
+            tx.bump_list_version(user_email, APPLICATIONS_LIST)
+            tx.apply_analytics_deltas(
+                user_email,
+                application_deltas(previous["status"] if previous else None, status),
+            )
+
+        self.transaction(work)
+        return external_job_id
+
+    @staticmethod
+    def _application(row: dict) -> dict:
+        row["notes"] = row["notes"] or ""
+        row["applied_at"] = as_text(row["applied_at"])
+        return row
+
+    def get_job_applications(self, user_email: str) -> list:
+        rows = self.fetch_all("""
+            SELECT id, external_job_id, source_name, title, company, location,
+                   apply_url, status, notes, applied_at
+            FROM job_applications
+            WHERE user_email = ?
+            ORDER BY applied_at DESC, id DESC
+        """, (user_email,))
+        return [self._application(row) for row in rows]
+
+    def get_job_applications_page(self, user_email: str, limit: int, cursor: Optional[str] = None):
+        rows, next_cursor = self.fetch_page(
+            APPLICATION_COLUMNS, "job_applications", "applied_at", user_email, limit, cursor
+        )
+        return [self._application(row) for row in rows], next_cursor
+
+    def count_job_applications(self, user_email: str) -> int:
+        return self.count_for_user("job_applications", user_email)
+
+    def get_job_application(
+        self,
+        user_email: str,
+        application_id: Optional[int] = None,
+        external_job_id: Optional[str] = None,
+    ) -> Optional[dict]:
+        if application_id is not None:
+            row = self.fetch_one("""
+                SELECT id, external_job_id, source_name, title, company, location,
+                       apply_url, status, notes, applied_at
+                FROM job_applications
+                WHERE id = ? AND user_email = ?
+            """, (application_id, user_email))
+        else:
+            row = self.fetch_one("""
+                SELECT id, external_job_id, source_name, title, company, location,
+                       apply_url, status, notes, applied_at
+                FROM job_applications
+                WHERE user_email = ? AND external_job_id = ?
+            """, (user_email, str(external_job_id)))
+        return self._application(row) if row else None
+
+    def update_application_status(self, user_email: str, application_id: int, status: str) -> bool:
+        def work(tx) -> bool:
+            previous = tx.fetch_one("""
+                SELECT status
+                FROM job_applications{lock}
+                WHERE id = ? AND user_email = ?
+            """, (application_id, user_email))
+
+            updated = tx.execute("""
+                UPDATE job_applications
+                SET status = ?
+                WHERE id = ? AND user_email = ?
+            """, (status, application_id, user_email))
+
+            if updated:
+                tx.bump_list_version(user_email, APPLICATIONS_LIST)
+                if previous:
+                    tx.apply_analytics_deltas(user_email, application_deltas(previous["status"], status))
+            return updated > 0
+
+        return self.transaction(work)
+
+    def update_application_notes(self, user_email: str, application_id: int, notes: str) -> bool:
+        updated = self.execute("""
+            UPDATE job_applications
+            SET notes = ?
+            WHERE id = ? AND user_email = ?
+        """, (notes, application_id, user_email))
+
+        if updated:
+            self.bump_list_version(user_email, APPLICATIONS_LIST)
+        return updated > 0
+
+    # -----------------------------------------------------
+    # LIST VERSIONS
+    # -----------------------------------------------------
+    # Every mutation of a user's saved jobs or applications bumps a counter
+    # so clients applying delta responses can tell whether they missed a
+    # change (version != their version + 1) and need a full refetch.
+    def bump_list_version(self, user_email: str, list_name: str):
+        self.execute(self.dialect.upsert(
+            "user_list_versions",
+            ("user_email", "list_name"),
+            ("user_email", "list_name", "version"),
+            increment=("version",),
+        ), (user_email, list_name, 1))
+
+    def get_list_version(self, user_email: str, list_name: str) -> int:
+        row = self.fetch_one("""
+            SELECT version
+            FROM user_list_versions
+            WHERE user_email = ? AND list_name = ?
+        """, (user_email, list_name))
+        return int(row["version"]) if row else 0
+
+    # -----------------------------------------------------
+    # ANALYTICS SUMMARY
+    # -----------------------------------------------------
+    # user_analytics holds the counters from analytics.py, one row per
+    # (user, metric, name). Every write above applies its delta here, in the
+    # same transaction as the write, so the profile page reads a handful of
+    # rows instead of recounting history.
+    def apply_analytics_deltas(self, user_email: str, deltas):
+        sql = self.dialect.upsert(
+            "user_analytics",
+            ("user_email", "metric", "name"),
+            ("user_email", "metric", "name", "value"),
+            accumulate=("value",),
+        )
+        self.execute_many(sql, [
+            (user_email, metric, name, delta)
+            for (metric, name), delta in sorted(deltas.items())
+            if delta
+        ])
+
+    def get_user_analytics(self, user_email: str) -> dict:
+        rows = self.fetch_all("""
+            SELECT metric, name, value
+            FROM user_analytics
+            WHERE user_email = ? AND value <> 0
+        """, (user_email,))
+        return counters_from_deltas({(row["metric"], row["name"]): int(row["value"]) for row in rows})
+
+    def aggregate_user_analytics(self, user_email: str) -> dict:
+        # The same counters as analytics.count_profile(), computed by the
+        # database from the typed saved_jobs / user_cvs / job_applications
+        # columns in one round trip, without decoding raw_job_json.
+        rows = self.fetch_all("""
+            SELECT 'total' AS metric, 'saved_jobs' AS name, COUNT(*) AS value
+            FROM saved_jobs WHERE user_email = ?
+            UNION ALL
+            SELECT 'total', 'match_rate', COALESCE(SUM(match_percentage), 0)
+            FROM saved_jobs WHERE user_email = ?
+            UNION ALL
+            SELECT 'total', bucket, COUNT(*)
+            FROM (
+                SELECT CASE
+                    WHEN match_percentage >= 80 THEN 'strong_matches'
+                    WHEN match_percentage >= 50 THEN 'good_matches'
+                    ELSE 'weak_matches'
+                END AS bucket
+                FROM saved_jobs WHERE user_email = ?
+            ) AS buckets
+            GROUP BY bucket
+            UNION ALL
+            SELECT 'role', role_name, COUNT(*)
+            FROM (
+                SELECT CASE
+                    WHEN COALESCE(title, '') = '' THEN 'Untitled role'
+                    ELSE title
+                END AS role_name
+                FROM saved_jobs WHERE user_email = ?
+            ) AS roles
+            GROUP BY role_name
+            UNION ALL
+            SELECT 'industry', industry, COUNT(*)
+            FROM saved_jobs WHERE user_email = ? AND industry <> ''
+            GROUP BY industry
+            UNION ALL
+            SELECT 'missing_skill', skill, COUNT(*)
+            FROM (
+                SELECT LOWER(TRIM(item.value)) AS skill
+                FROM saved_jobs{json_items}(saved_jobs.missing_skills) AS item
+                WHERE saved_jobs.user_email = ?
+            ) AS missing
+            WHERE skill <> ''
+            GROUP BY skill
+            UNION ALL
+            SELECT 'total', 'uploaded_cvs', COUNT(*)
+            FROM user_cvs WHERE user_email = ?
+            UNION ALL
+            SELECT 'skill', skill, COUNT(*)
+            FROM (
+                SELECT LOWER(TRIM(item.value)) AS skill
+                FROM user_cvs{json_items}(user_cvs.extracted_skills) AS item
+                WHERE user_cvs.user_email = ?
+            ) AS skills
+            WHERE skill <> ''
+            GROUP BY skill
+            UNION ALL
+            SELECT 'qualification', qualification, COUNT(*)
+            FROM (
+                SELECT LOWER(TRIM(item.value)) AS qualification
+                FROM user_cvs{json_items}(user_cvs.extracted_qualifications) AS item
+                WHERE user_cvs.user_email = ?
+            ) AS qualifications
+            WHERE qualification <> ''
+            GROUP BY qualification
+            UNION ALL
+            SELECT 'total', 'applications', COUNT(*)
+            FROM job_applications WHERE user_email = ?
+            UNION ALL
+            SELECT 'status', status, COUNT(*)
+            FROM job_applications WHERE user_email = ?
+            GROUP BY status
+        """, (user_email,) * 11)
+        return counters_from_deltas({(row["metric"], row["name"]): int(row["value"]) for row in rows})
+
+    def recompute_user_analytics(self, user_email: str) -> dict:
+        return count_profile(
+            self.get_saved_jobs(user_email),
+            self.get_uploaded_cvs(user_email),
+            self.get_job_applications(user_email),
+        )
+
+    def rebuild_user_analytics(self, user_email: str) -> dict:
+        counters = self.recompute_user_analytics(user_email)
+        self.execute("DELETE FROM user_analytics WHERE user_email = ?", (user_email,))
+        self.execute_many("""
+            INSERT INTO user_analytics (user_email, metric, name, value)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (user_email, metric, name, value)
+            for metric, names in sorted(counters.items())
+            for name, value in sorted(names.items())
+        ])
+        return counters
+
+    def check_user_analytics(self, user_email: str) -> list[dict]:
+        return diff_counters(
+            self.recompute_user_analytics(user_email),
+            self.get_user_analytics(user_email),
+        )
+
+    def get_user_emails(self) -> list[str]:
+        rows = self.fetch_all("SELECT email FROM users ORDER BY id")
+        return [row["email"] for row in rows]
+
+    # -----------------------------------------------------
+    # CAREER TARGETS
+    # -----------------------------------------------------
+    def get_career_target(self, user_email: str) -> str:
+        row = self.fetch_one("""
+            SELECT target_role
+            FROM user_career_targets
+            WHERE user_email = ?
+        """, (user_email,))
+        return row["target_role"] if row else ""
+
+    def save_career_target(self, user_email: str, target_role: str):
+        self.execute(self.dialect.upsert(
+            "user_career_targets",
+            ("user_email",),
+            ("user_email", "target_role"),
+            update=("target_role",),
+            touch=("updated_at",),
+        ), (user_email, target_role))
+
+    # -----------------------------------------------------
+    # EMAIL ALERT PREFERENCES / HISTORY
+    # -----------------------------------------------------
+    def ensure_email_preferences(self, user_email: str):
+        existing = self.fetch_one("""
+            SELECT id
+            FROM email_alert_preferences
+            WHERE user_email = ?
+        """, (user_email,))
+
+        if not existing:
+            self.execute(self.dialect.upsert(
+                "email_alert_preferences",
+                ("user_email",),
+                ("user_email", "alerts_enabled", "frequency", "preferred_location", "jobs_per_email"),
+            ), (user_email, 1, "daily", "", 5))
+
+    def get_email_preferences(self, user_email: str) -> dict:
+        self.ensure_email_preferences(user_email)
+
+        row = self.fetch_one("""
+            SELECT user_email, alerts_enabled, frequency, preferred_location,
+                   jobs_per_email, last_sent_at
+            FROM email_alert_preferences
+            WHERE user_email = ?
+        """, (user_email,))
+
+        if not row:
+            return {
+                "user_email": user_email,
+                "alerts_enabled": True,
+                "frequency": "daily",
+                "preferred_location": "",
+                "jobs_per_email": 5,
+                "last_sent_at": None,
+            }
+
+        return {
+            "user_email": row["user_email"],
+            "alerts_enabled": bool(row["alerts_enabled"]),
+            "frequency": row["frequency"] or "daily",
+            "preferred_location": row["preferred_location"] or "",
+            "jobs_per_email": int(row["jobs_per_email"] or 5),
+            "last_sent_at": as_text(row["last_sent_at"]) or None,
+        }
+
+    def update_email_preferences(
+        self,
+        user_email: str,
+        alerts_enabled: bool,
+        frequency: str,
+        preferred_location: str,
+        jobs_per_email: int,
+    ):
+        self.ensure_email_preferences(user_email)
+        self.execute("""
+            UPDATE email_alert_preferences
+            SET alerts_enabled = ?,
+                frequency = ?,
+                preferred_location = ?,
+                jobs_per_email = ?,
+                updated_at = {now}
+            WHERE user_email = ?
+        """, (
+            1 if alerts_enabled else 0,
+            frequency,
+            preferred_location,
+            jobs_per_email,
+            user_email,
+        ))
+
+    def update_email_last_sent(self, user_email: str):
+        self.execute("""
+            UPDATE email_alert_preferences
+            SET last_sent_at = {now},
+                updated_at = {now}
+            WHERE user_email = ?
+        """, (user_email,))
+
+    def get_alert_enabled_users(self) -> list[dict]:
+        return self.fetch_all("""
+            SELECT u.email, u.name
+            FROM users u
+            INNER JOIN email_alert_preferences p
+                ON u.email = p.user_email
+            WHERE p.alerts_enabled = 1
+        """)
+
+    def has_job_been_emailed(self, user_email: str, external_job_id: str) -> bool:
+        row = self.fetch_one("""
+            SELECT id
+            FROM emailed_jobs_history
+            WHERE user_email = ? AND external_job_id = ?
+        """, (user_email, external_job_id))
+        return row is not None
+
+    def record_emailed_job(self, user_email: str, external_job_id: str, title: str):
+        self.execute(self.dialect.upsert(
+            "emailed_jobs_history",
+            ("user_email", "external_job_id"),
+            ("user_email", "external_job_id", "title"),
+        ), (user_email, external_job_id, title), wait=False)
+
+
+class Transaction(Repository):
+    # The Repository handed to Repository.transaction() work: every query
+    # runs on the transaction's cursor and nothing is committed here.
+    def __init__(self, cursor, dialect: Dialect):
+        super().__init__(None, dialect)
+        self._tx_cursor = cursor
+
+    @contextmanager
+    def _cursor(self):
+        yield None, self._tx_cursor
+
+    def execute(self, template: str, params: tuple = (), wait: bool = True) -> int:
+        self._tx_cursor.execute(self.dialect.sql(template), params)
+        return self._tx_cursor.rowcount
+
+    def execute_many(self, template: str, rows: list[tuple]):
+        if rows:
+            self._tx_cursor.executemany(self.dialect.sql(template), rows)
+
+    def transaction(self, work):
+        return work(self)
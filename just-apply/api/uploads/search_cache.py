@@ -0,0 +1,269 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from db import SQLiteThreadPool, apply_sqlite_pragmas
+
+# =========================================================
+# SEARCH RESULTS CACHE
+# =========================================================
+# Raw Adzuna results, keyed by (country, query, where, page,
+# results_per_page) and stored before any per-user scoring, so every user
+# whose skills map to the same search shares one entry.
+#
+#   - younger than ttl_seconds: served as is
+#   - up to stale_seconds older than that: served as is, and refreshed
+#     on a background thread
+#   - older still, or missing: fetched while the caller waits
+#
+# Concurrent misses for the same key wait on one upstream call. Entries
+# live in a store with get/put/stats:
+#   - MemorySearchStore: an LRU dict private to this process
+#   - SQLiteSearchStore: a local SQLite file shared by every gunicorn
+#     worker on the host (coalescing still only happens within a worker)
+# Both evict least-recently-used entries past max_entries, and keep
+# expired entries until then so a caller can still fall back to them.
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    cache_key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+)
+"""
+
+
+def search_key(*parts) -> str:
+    return json.dumps([str(part).strip().lower() for part in parts])
+
+
+class MemorySearchStore:
+    name = "memory"
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[tuple[Any, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, value: Any, stored_at: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (value, stored_at or time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "store": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+            }
+
+
+class SQLiteSearchStore:
+    name = "sqlite"
+
+    def __init__(self, path: str, max_entries: int = 500):
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self._pool = SQLiteThreadPool(self._connect, name="search-cache")
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        apply_sqlite_pragmas(conn, cache_size_kb=2000, mmap_size=0)
+        return conn
+
+    def _conn(self):
+        conn = self._pool.acquire()
+        if not self._schema_ready:
+            with self._schema_lock:
+                conn.execute(STORE_SCHEMA)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_search_cache_last_used "
+                    "ON search_cache (last_used_at)"
+                )
+                conn.commit()
+                self._schema_ready = True
+        return conn
+
+    def get(self, key: str) -> Optional[tuple[Any, float]]:
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT value, stored_at FROM search_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE search_cache SET last_used_at = ? WHERE cache_key = ?",
+                (time.time(), key),
+            )
+            conn.commit()
+
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, value: Any, stored_at: Optional[float] = None):
+        now = time.time()
+
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO search_cache (cache_key, value, stored_at, last_used_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    value = excluded.value,
+                    stored_at = excluded.stored_at,
+                    last_used_at = excluded.last_used_at
+                """,
+                (key, json.dumps(value), stored_at or now, now),
+            )
+
+            (entries,) = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+            if entries > self.max_entries:
+                conn.execute(
+                    "DELETE FROM search_cache WHERE cache_key IN ("
+                    "SELECT cache_key FROM search_cache ORDER BY last_used_at LIMIT ?)",
+                    (entries - self.max_entries,),
+                )
+                self.evictions += entries - self.max_entries
+            conn.commit()
+
+    def stats(self) -> dict:
+        with self._conn() as conn:
+            (entries,) = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+
+        return {
+            "store": self.name,
+            "path": self.path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+        }
+
+
+class SearchCache:
+    def __init__(self, store, ttl_seconds: float = 900, stale_seconds: float = 3600, refresh_workers: int = 2):
+        self.store = store
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.stale_seconds = max(0.0, float(stale_seconds))
+        self._refresher = ThreadPoolExecutor(max(1, int(refresh_workers)), thread_name_prefix="search-refresh")
+        self._inflight: dict[str, Future] = {}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key: str, fetch: Callable[[], Any]) -> Any:
+        entry = self.store.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+
+            if age < self.ttl_seconds:
+                self._count("hits")
+                return value
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._count("stale_hits")
+                self._refresh(key, fetch)
+                return value
+
+        self._count("misses")
+        return self._load(key, fetch)
+
+    def peek(self, key: str) -> Optional[tuple[Any, float]]:
+        # Whatever is stored, however old, without fetching.
+        return self.store.get(key)
+
+    def _load(self, key: str, fetch: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = fetch()
+            self.store.put(key, value)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+        future.set_result(value)
+        return value
+
+    def _refresh(self, key: str, fetch: Callable[[], Any]):
+        # A key counts as refreshing from here, not only once its fetch has
+        # started, so a burst of stale hits queues a single refresh.
+        with self._lock:
+            if key in self._inflight or key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.refreshes += 1
+
+        def run():
+            try:
+                self._load(key, fetch)
+            except Exception as e:
+                self._count("refresh_failures")
+                print(f"[SEARCH CACHE] Refresh of {key} failed, keeping the stale entry:", e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresher.submit(run)
+
+    def close(self, wait: bool = False):
+        self._refresher.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> dict:
+        stats = self.store.stats()
+        with self._lock:
+            stats.update({
+                "ttl_seconds": self.ttl_seconds,
+                "stale_seconds": self.stale_seconds,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "in_flight": len(self._inflight),
+            })
+        return stats
@@ -1,29 +1,56 @@
 import os
 import json
+import atexit
 import sqlite3
 import smtplib
+import threading
+import time
+import heapq
+import shutil
+import uuid
+from collections import deque
+from functools import lru_cache
+from tempfile import SpooledTemporaryFile
 from nlp import extract_skills, extract_qualifications, clean_extracted_text
 from datetime import datetime, timedelta
-from typing import Optional, Any
+from typing import Any, Optional
 
-import requests
 import nltk
 import pyodbc
-import pandas as pd
 
-from flask import Flask, request, jsonify
+from flask import Flask, Request, request, jsonify
 from flask_cors import CORS
 from flasgger import Swagger
 
-from PyPDF2 import PdfReader
-from docx import Document
-
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 
 from azure.storage.blob import BlobServiceClient
 from dotenv import load_dotenv
 from ai_coach import ai_coach_bp
+from db import WriteQueue, apply_sqlite_pragmas, create_pool
+from repository import APPLICATIONS_LIST, SAVED_JOBS_LIST, Repository, get_dialect, saved_job_id
+from migrations import ANALYTICS_SUMMARY_VERSION, run_migrations
+from job_index import AdzunaJobIndex, user_terms
+from job_dataset import load_job_dataset
+from job_matching import LocalJobIndex
+from job_scoring import JobBatch, score_job
+from taxonomy import DEFAULT_TAXONOMY_PATH, configure_taxonomy, get_taxonomy
+from cv_cache import CVParseCache, content_key
+from blob_storage import AzureBlobBackend, BlobUploader, FilesystemBlobBackend
+from cv_parsing import ExtractionLimit, PdfExtractor, extract_document, extract_text_from_bytes
+from bulk_ingest import IngestReport, collect_files
+from adzuna import (
+    AdzunaUnavailable,
+    CircuitBreaker,
+    HttpClient,
+    QueryFanOut,
+    SQLiteTokenBucket,
+    TokenBucket,
+    guarded_get,
+)
+from search_cache import MemorySearchStore, SearchCache, SQLiteSearchStore, search_key
+from cv_jobs import JOB_DONE, JOB_FAILED, JOB_PROCESSING, JOB_QUEUED, LocalJobQueue, ParseFailed, QueueFull, new_job_id
+from analytics import count_profile, summarize as summarize_analytics
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import (
     JWTManager,
@@ -44,6 +71,20 @@ load_dotenv()
 AZURE_CONNECTION_STRING = os.getenv("AZURE_CONNECTION_STRING")
 AZURE_CONTAINER = os.getenv("AZURE_CONTAINER_NAME", "cv-uploads")
 
+# Where stored CV files go: "azure" (the default when
+# AZURE_CONNECTION_STRING is set; an Azurite connection string works too),
+# "filesystem" (BLOB_FILESYSTEM_PATH) or "none".
+BLOB_BACKEND = os.getenv("BLOB_BACKEND", "azure" if AZURE_CONNECTION_STRING else "none").lower()
+BLOB_FILESYSTEM_PATH = os.getenv("BLOB_FILESYSTEM_PATH", "")
+BLOB_FILESYSTEM_BASE_URL = os.getenv("BLOB_FILESYSTEM_BASE_URL", "")
+BLOB_UPLOAD_BACKGROUND = os.getenv("BLOB_UPLOAD_BACKGROUND", "true").lower() == "true"
+BLOB_UPLOAD_WORKERS = int(os.getenv("BLOB_UPLOAD_WORKERS", "2"))
+BLOB_UPLOAD_RETRIES = int(os.getenv("BLOB_UPLOAD_RETRIES", "3"))
+BLOB_UPLOAD_BACKOFF_SECONDS = float(os.getenv("BLOB_UPLOAD_BACKOFF_SECONDS", "0.5"))
+BLOB_UPLOAD_CONCURRENCY = int(os.getenv("BLOB_UPLOAD_CONCURRENCY", "4"))
+BLOB_BLOCK_SIZE_MB = float(os.getenv("BLOB_BLOCK_SIZE_MB", "1"))
+BLOB_SINGLE_PUT_MB = float(os.getenv("BLOB_SINGLE_PUT_MB", "2"))
+
 AZURE_SQL_SERVER = os.getenv("AZURE_SQL_SERVER")
 AZURE_SQL_DATABASE = os.getenv("AZURE_SQL_DATABASE")
 AZURE_SQL_USERNAME = os.getenv("AZURE_SQL_USERNAME")
@@ -52,6 +93,45 @@ AZURE_SQL_PASSWORD = os.getenv("AZURE_SQL_PASSWORD")
 ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID")
 ADZUNA_APP_KEY = os.getenv("ADZUNA_APP_KEY")
 ADZUNA_COUNTRY = os.getenv("ADZUNA_COUNTRY", "us")
+# The primary search runs on the request thread; fallback searches follow
+# only while more jobs are needed, ADZUNA_FANOUT_WIDTH at a time per search,
+# on ADZUNA_FANOUT_WORKERS threads shared by all searches.
+ADZUNA_FANOUT_WORKERS = int(os.getenv("ADZUNA_FANOUT_WORKERS", "16"))
+ADZUNA_FANOUT_WIDTH = int(os.getenv("ADZUNA_FANOUT_WIDTH", "2"))
+# Outbound Adzuna calls share one keep-alive connection pool per process.
+ADZUNA_POOL_CONNECTIONS = int(os.getenv("ADZUNA_POOL_CONNECTIONS", "4"))
+ADZUNA_POOL_MAXSIZE = int(os.getenv("ADZUNA_POOL_MAXSIZE", str(max(10, ADZUNA_FANOUT_WORKERS))))
+ADZUNA_CONNECT_TIMEOUT = float(os.getenv("ADZUNA_CONNECT_TIMEOUT", "5"))
+ADZUNA_READ_TIMEOUT = float(os.getenv("ADZUNA_READ_TIMEOUT", "30"))
+# Raw search results are cached in "memory" (per worker), "sqlite" (a file
+# shared by the workers on this host) or not at all ("none"). Entries older
+# than the TTL are still served for ADZUNA_CACHE_STALE_SECONDS while they
+# refresh in the background.
+ADZUNA_CACHE_BACKEND = os.getenv("ADZUNA_CACHE_BACKEND", "memory").lower()
+ADZUNA_CACHE_PATH = os.getenv("ADZUNA_CACHE_PATH", "")
+ADZUNA_CACHE_TTL_SECONDS = float(os.getenv("ADZUNA_CACHE_TTL_SECONDS", "900"))
+ADZUNA_CACHE_STALE_SECONDS = float(os.getenv("ADZUNA_CACHE_STALE_SECONDS", "3600"))
+ADZUNA_CACHE_MAX_ENTRIES = int(os.getenv("ADZUNA_CACHE_MAX_ENTRIES", "500"))
+# The skills found in each Adzuna job are kept for this many jobs, indexed
+# by skill, qualification and title word, so repeat results skip matching.
+ADZUNA_JOB_INDEX_MAX_JOBS = int(os.getenv("ADZUNA_JOB_INDEX_MAX_JOBS", "5000"))
+# Live and local jobs are ranked by skill match ("match") or by BM25
+# relevance to the CV text ("relevance"); requests can pick with rank_mode.
+JOB_RANK_MODES = ("match", "relevance")
+JOB_RANK_MODE = os.getenv("JOB_RANK_MODE", "match").lower()
+# Outbound calls are limited to ADZUNA_RATE_LIMIT_PER_MINUTE (0 = no limit)
+# with bursts of ADZUNA_RATE_LIMIT_BURST. The "sqlite" bucket is shared by
+# the workers on this host. After ADZUNA_BREAKER_FAILURES failed calls in a
+# row, searches stop calling Adzuna for ADZUNA_BREAKER_RESET_SECONDS and
+# serve whatever the cache still holds.
+ADZUNA_RATE_LIMIT_PER_MINUTE = float(os.getenv("ADZUNA_RATE_LIMIT_PER_MINUTE", "25"))
+ADZUNA_RATE_LIMIT_BURST = int(os.getenv("ADZUNA_RATE_LIMIT_BURST", "6"))
+ADZUNA_RATE_LIMIT_WAIT_SECONDS = float(os.getenv("ADZUNA_RATE_LIMIT_WAIT_SECONDS", "5"))
+ADZUNA_RATE_LIMIT_BACKEND = os.getenv(
+    "ADZUNA_RATE_LIMIT_BACKEND", "sqlite" if ADZUNA_CACHE_BACKEND == "sqlite" else "memory"
+).lower()
+ADZUNA_BREAKER_FAILURES = int(os.getenv("ADZUNA_BREAKER_FAILURES", "5"))
+ADZUNA_BREAKER_RESET_SECONDS = float(os.getenv("ADZUNA_BREAKER_RESET_SECONDS", "30"))
 
 EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
 EMAIL_APP_PASSWORD = os.getenv("EMAIL_APP_PASSWORD")
@@ -59,14 +139,75 @@ EMAIL_ALERTS_ENABLED = os.getenv("EMAIL_ALERTS_ENABLED", "true").lower() == "tru
 EMAIL_ALERTS_HOUR = int(os.getenv("EMAIL_ALERTS_HOUR", "9"))
 EMAIL_ALERTS_MINUTE = int(os.getenv("EMAIL_ALERTS_MINUTE", "0"))
 
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_MAX_IDLE_SECONDS = float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300"))
+DB_POOL_PING_AFTER_SECONDS = float(os.getenv("DB_POOL_PING_AFTER_SECONDS", "30"))
+
+SQLITE_PRODUCTION_MODE = os.getenv("SQLITE_PRODUCTION_MODE", "true").lower() == "true"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_WRITE_QUEUE = os.getenv("SQLITE_WRITE_QUEUE", "false").lower() == "true"
+SQLITE_WRITE_BATCH_SIZE = int(os.getenv("SQLITE_WRITE_BATCH_SIZE", "200"))
+SQLITE_WRITE_FLUSH_MS = float(os.getenv("SQLITE_WRITE_FLUSH_MS", "5"))
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "20"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "100"))
+
+TAXONOMY_PATH = os.getenv("TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+TAXONOMY_RELOAD_SECONDS = float(os.getenv("TAXONOMY_RELOAD_SECONDS", "30"))
+
+CV_CACHE_ENABLED = os.getenv("CV_CACHE_ENABLED", "true").lower() == "true"
+CV_CACHE_PATH = os.getenv("CV_CACHE_PATH", "")
+CV_CACHE_MAX_ENTRIES = int(os.getenv("CV_CACHE_MAX_ENTRIES", "1000"))
+CV_CACHE_MAX_MB = float(os.getenv("CV_CACHE_MAX_MB", "64"))
+
+# Uploads run in the background when the request asks for it (?async=true)
+# or, with CV_UPLOAD_ASYNC=true, unless it opts out (?async=false).
+CV_UPLOAD_ASYNC = os.getenv("CV_UPLOAD_ASYNC", "false").lower() == "true"
+CV_JOB_IO_WORKERS = int(os.getenv("CV_JOB_IO_WORKERS", "4"))
+CV_JOB_PARSE_WORKERS = int(os.getenv("CV_JOB_PARSE_WORKERS", "2"))
+CV_JOB_MAX_PENDING = int(os.getenv("CV_JOB_MAX_PENDING", "100"))
+CV_JOB_PARSE_TIMEOUT = float(os.getenv("CV_JOB_PARSE_TIMEOUT", "120"))
+
+# Upload bodies above CV_UPLOAD_MAX_MB are refused with 413. File parts are
+# held in memory up to CV_UPLOAD_SPOOL_MB and spill to an anonymous temp
+# file beyond that.
+CV_UPLOAD_MAX_MB = float(os.getenv("CV_UPLOAD_MAX_MB", "10"))
+CV_UPLOAD_SPOOL_MB = float(os.getenv("CV_UPLOAD_SPOOL_MB", "2"))
+
+# Bulk ingestion (POST /api/admin/bulk-cvs, python manage.py cvs-ingest) is
+# open to the comma-separated emails in BULK_INGEST_ADMINS.
+BULK_INGEST_ADMINS = {
+    email.strip().lower() for email in os.getenv("BULK_INGEST_ADMINS", "").split(",") if email.strip()
+}
+BULK_INGEST_MAX_FILES = int(os.getenv("BULK_INGEST_MAX_FILES", "1000"))
+BULK_INGEST_MAX_MB = float(os.getenv("BULK_INGEST_MAX_MB", "500"))
+BULK_INGEST_BATCH_SIZE = int(os.getenv("BULK_INGEST_BATCH_SIZE", "50"))
+
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_MB = float(os.getenv("PDF_MAX_MB", "10"))
+PDF_TIME_BUDGET_SECONDS = float(os.getenv("PDF_TIME_BUDGET_SECONDS", "20"))
+PDF_TARGET_CHARS = int(os.getenv("PDF_TARGET_CHARS", "20000"))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+
+# "summary" reads the incrementally maintained user_analytics counters,
+# "sql" aggregates the history tables with GROUP BY queries on every request,
+# "python" recounts every saved job, CV and application in Python.
+ANALYTICS_ENGINE = os.getenv("ANALYTICS_ENGINE", "summary").lower()
+
 # =========================================================
 # PATHS
 # =========================================================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 JOB_CSV_PATH = os.path.join(BASE_DIR, "jobPosts", "jobposts.csv")
+# jobposts.csv is converted into memory-mapped columns here on first start
+# (and again whenever it changes); JOB_DATASET_CACHE=false parses it in
+# memory in every worker instead.
+JOB_DATASET_CACHE = os.getenv("JOB_DATASET_CACHE", "true").lower() == "true"
+JOB_DATASET_CACHE_DIR = os.getenv("JOB_DATASET_CACHE_DIR", os.path.join(BASE_DIR, "jobPosts", ".columnar"))
 SQLITE_PATH = os.path.join(BASE_DIR, "just_apply_local.db")
 
 # =========================================================
@@ -82,8 +223,12 @@ cv_container_client = None
 
 if AZURE_CONNECTION_STRING:
     try:
+        # Files above BLOB_SINGLE_PUT_MB are sent as BLOB_BLOCK_SIZE_MB
+        # blocks, BLOB_UPLOAD_CONCURRENCY at a time.
         blob_service_client = BlobServiceClient.from_connection_string(
-            AZURE_CONNECTION_STRING
+            AZURE_CONNECTION_STRING,
+            max_block_size=int(BLOB_BLOCK_SIZE_MB * 1024 * 1024),
+            max_single_put_size=int(BLOB_SINGLE_PUT_MB * 1024 * 1024),
         )
         cv_container_client = blob_service_client.get_container_client(AZURE_CONTAINER)
         print("Azure Blob client ready.")
@@ -97,8 +242,19 @@ else:
 # =========================================================
 # FLASK APP
 # =========================================================
+class UploadRequest(Request):
+    # Spools uploaded files in memory up to CV_UPLOAD_SPOOL_MB instead of
+    # werkzeug's 500 KB. Larger ones roll over to an unlinked temp file, so
+    # nothing is left on disk whatever happens to the request.
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=int(CV_UPLOAD_SPOOL_MB * 1024 * 1024), mode="rb+")
+
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 app.register_blueprint(ai_coach_bp)
+# The multipart envelope around a CV adds a few hundred bytes at most.
+app.config["MAX_CONTENT_LENGTH"] = int(CV_UPLOAD_MAX_MB * 1024 * 1024) + 64 * 1024
 app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "dev-secret-change-me")
 app.config["JWT_TOKEN_LOCATION"] = ["headers"]
 app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(days=1)
@@ -131,25 +287,25 @@ swagger = Swagger(
 # =========================================================
 print("Looking for jobposts.csv at:", JOB_CSV_PATH)
 try:
-    job_df = pd.read_csv(JOB_CSV_PATH)
-    print(f"Loaded {len(job_df)} job postings from {JOB_CSV_PATH}")
+    job_dataset = load_job_dataset(JOB_CSV_PATH, JOB_DATASET_CACHE_DIR if JOB_DATASET_CACHE else None)
+    print(f"Loaded {len(job_dataset)} job postings from {job_dataset.source}")
 
     TEST_SAMPLE_SIZE = int(os.getenv("TEST_SAMPLE_SIZE", "50"))
 
-    if len(job_df) > TEST_SAMPLE_SIZE:
-        job_df = job_df.sample(TEST_SAMPLE_SIZE, random_state=42).reset_index(drop=True)
+    if len(job_dataset) > TEST_SAMPLE_SIZE:
+        job_dataset = job_dataset.sample(TEST_SAMPLE_SIZE, random_state=42)
         print(
-            f"[TEST MODE] Subsampled jobposts to {len(job_df)} rows "
+            f"[TEST MODE] Subsampled jobposts to {len(job_dataset)} rows "
             f"for testing (requested {TEST_SAMPLE_SIZE})."
         )
     else:
         print(
-            f"[TEST MODE] Dataset has {len(job_df)} rows "
+            f"[TEST MODE] Dataset has {len(job_dataset)} rows "
             f"(<= {TEST_SAMPLE_SIZE}), using all of them."
         )
 except Exception as e:
     print("ERROR loading jobposts.csv:", e)
-    job_df = None
+    job_dataset = None
 
 # =========================================================
 # NLTK
@@ -171,25 +327,10 @@ except LookupError:
 
 EN_STOPWORDS = set(stopwords.words("english"))
 
-SKILL_KEYWORDS = [
-    "python", "java", "javascript", "typescript", "c#", "c++",
-    "react", "next.js", "html", "css", "django", "flask", "node.js",
-    "sql", "mysql", "postgresql", "azure", "aws", "docker",
-    "git", "linux", "power bi", "nlp", "natural language processing",
-    "machine learning", "data analysis", "data analytics",
-    "ui", "ux", "figma", "cloud", "kubernetes", "devops", "terraform"
-]
-
-QUALIFICATION_KEYWORDS = [
-    "bsc", "b.sc", "bachelor", "bachelors", "ba", "b.a",
-    "msc", "m.sc", "master", "masters", "ma", "m.a",
-    "phd", "doctorate",
-    "bachelor of science", "bachelor of engineering",
-    "bachelor of arts", "master of science", "master of engineering",
-    "master of arts", "honours", "hons", "higher diploma",
-    "postgraduate diploma", "aws certified", "azure certification",
-    "oracle certified", "microsoft certified", "ccna", "comptia"
-]
+# Skills and qualifications live in skill_taxonomy.json and are re-read when
+# the file changes (checked every TAXONOMY_RELOAD_SECONDS, -1 disables).
+configure_taxonomy(TAXONOMY_PATH, TAXONOMY_RELOAD_SECONDS)
+get_taxonomy()
 
 ALLOWED_CAREER_TARGETS = {
     "Data Analyst",
@@ -206,6 +347,7 @@ ALERT_FREQUENCIES = {"daily", "weekly"}
 # =========================================================
 # DATABASE HELPERS
 # =========================================================
+@lru_cache(maxsize=1)
 def get_sql_driver():
     available = pyodbc.drivers()
 
@@ -221,7 +363,7 @@ def get_sql_driver():
     )
 
 
-def get_azure_connection():
+def connect_azure():
     driver = get_sql_driver()
     server = f"tcp:{AZURE_SQL_SERVER},1433"
 
@@ -239,22 +381,73 @@ def get_azure_connection():
     return pyodbc.connect(conn_str)
 
 
-def get_sqlite_connection():
-    conn = sqlite3.connect(SQLITE_PATH)
+def connect_sqlite():
+    # Each pooled SQLite connection is only ever used by one thread at a time;
+    # check_same_thread is off so the pool can close idle ones from elsewhere.
+    conn = sqlite3.connect(
+        SQLITE_PATH,
+        check_same_thread=False,
+        timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+    )
     conn.row_factory = sqlite3.Row
+
+    if SQLITE_PRODUCTION_MODE:
+        apply_sqlite_pragmas(
+            conn,
+            busy_timeout_ms=SQLITE_BUSY_TIMEOUT_MS,
+            cache_size_kb=SQLITE_CACHE_SIZE_KB,
+            mmap_size=SQLITE_MMAP_SIZE,
+        )
+
     return conn
 
 
-def db_is_sqlite() -> bool:
-    return DB_MODE == "sqlite"
+_db_pools = {}
+_db_pools_lock = threading.Lock()
+
+
+def get_db_pool(mode: Optional[str] = None):
+    mode = mode or DB_MODE
+
+    with _db_pools_lock:
+        pool = _db_pools.get(mode)
+        if pool is None:
+            if mode == "sqlite":
+                pool = create_pool(
+                    "sqlite",
+                    connect_sqlite,
+                    max_idle_seconds=DB_POOL_MAX_IDLE_SECONDS,
+                )
+            else:
+                pool = create_pool(
+                    "azure",
+                    connect_azure,
+                    max_size=DB_POOL_SIZE,
+                    max_idle_seconds=DB_POOL_MAX_IDLE_SECONDS,
+                    checkout_timeout=DB_POOL_TIMEOUT,
+                    ping_after_seconds=DB_POOL_PING_AFTER_SECONDS,
+                )
+            _db_pools[mode] = pool
+
+    return pool
+
+
+def get_azure_connection():
+    return get_db_pool("azure").acquire()
 
 
-def dict_from_row(row: Any) -> dict:
-    if row is None:
-        return {}
-    if isinstance(row, sqlite3.Row):
-        return dict(row)
-    return {}
+def get_sqlite_connection():
+    return get_db_pool("sqlite").acquire()
+
+
+def db_session():
+    # Holds one pooled connection for the duration of the block; every helper
+    # called inside it reuses that connection instead of borrowing its own.
+    return get_db_pool().session()
+
+
+def db_is_sqlite() -> bool:
+    return DB_MODE == "sqlite"
 
 
 def probe_db_mode():
@@ -275,499 +468,106 @@ def probe_db_mode():
         print("Azure SQL unavailable:", e)
 
 
-def init_db():
-    if db_is_sqlite():
-        init_sqlite_db()
-    else:
-        init_azure_db()
+_schema_ready = set()
 
 
-def init_azure_db():
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-    IF NOT EXISTS (
-        SELECT * FROM sysobjects WHERE name='users' AND xtype='U'
-    )
-    CREATE TABLE users (
-        id INT IDENTITY(1,1) PRIMARY KEY,
-        name NVARCHAR(255) NOT NULL,
-        email NVARCHAR(255) UNIQUE NOT NULL,
-        password_hash NVARCHAR(255) NOT NULL,
-        created_at DATETIME DEFAULT GETDATE()
-    )
-    """)
+def ensure_schema(mode: Optional[str] = None):
+    # Runs pending migrations once per process. gunicorn never executes the
+    # __main__ block, so the first repository access does it instead.
+    mode = mode or DB_MODE
+    if mode in _schema_ready:
+        return
 
-    cursor.execute("""
-    IF NOT EXISTS (
-        SELECT * FROM sysobjects WHERE name='saved_jobs' AND xtype='U'
-    )
-    CREATE TABLE saved_jobs (
-        id INT IDENTITY(1,1) PRIMARY KEY,
-        user_email NVARCHAR(255) NOT NULL,
-        job_id NVARCHAR(255) NOT NULL,
-        title NVARCHAR(255) NULL,
-        company NVARCHAR(255) NULL,
-        location NVARCHAR(255) NULL,
-        industry NVARCHAR(255) NULL,
-        total_score INT NULL,
-        skill_score INT NULL,
-        qual_score INT NULL,
-        match_percentage INT NULL,
-        matched_skills NVARCHAR(MAX) NULL,
-        missing_skills NVARCHAR(MAX) NULL,
-        missing_qualifications NVARCHAR(MAX) NULL,
-        raw_job_json NVARCHAR(MAX) NOT NULL,
-        saved_at DATETIME DEFAULT GETDATE()
-    )
-    """)
+    conn = get_db_pool(mode).acquire()
+    try:
+        applied = run_migrations(conn, mode)
+    finally:
+        conn.close()
 
-    cursor.execute("""
-    IF NOT EXISTS (
-        SELECT * FROM sysobjects WHERE name='user_cvs' AND xtype='U'
-    )
-    CREATE TABLE user_cvs (
-        id INT IDENTITY(1,1) PRIMARY KEY,
-        user_email NVARCHAR(255) NOT NULL,
-        original_name NVARCHAR(255) NOT NULL,
-        stored_filename NVARCHAR(255) NULL,
-        azure_blob_url NVARCHAR(MAX) NULL,
-        extracted_skills NVARCHAR(MAX) NULL,
-        extracted_qualifications NVARCHAR(MAX) NULL,
-        text_preview NVARCHAR(MAX) NULL,
-        uploaded_at DATETIME DEFAULT GETDATE()
-    )
-    """)
+    _schema_ready.add(mode)
+    print("SQLite tables ready." if mode == "sqlite" else "Azure SQL tables ready.")
 
-    cursor.execute("""
-    IF NOT EXISTS (
-        SELECT * FROM sysobjects WHERE name='job_applications' AND xtype='U'
-    )
-    CREATE TABLE job_applications (
-        id INT IDENTITY(1,1) PRIMARY KEY,
-        user_email NVARCHAR(255) NOT NULL,
-        external_job_id NVARCHAR(255) NOT NULL,
-        source_name NVARCHAR(100) NOT NULL,
-        title NVARCHAR(255) NULL,
-        company NVARCHAR(255) NULL,
-        location NVARCHAR(255) NULL,
-        apply_url NVARCHAR(MAX) NULL,
-        status NVARCHAR(50) NOT NULL DEFAULT 'Applied',
-        notes NVARCHAR(MAX) NULL,
-        applied_at DATETIME DEFAULT GETDATE()
-    )
-    """)
+    if ANALYTICS_SUMMARY_VERSION in applied:
+        rebuild_user_analytics(mode=mode)
 
-    cursor.execute("""
-    IF NOT EXISTS (
-        SELECT * FROM sysobjects WHERE name='user_career_targets' AND xtype='U'
-    )
-    CREATE TABLE user_career_targets (
-        id INT IDENTITY(1,1) PRIMARY KEY,
-        user_email NVARCHAR(255) UNIQUE NOT NULL,
-        target_role NVARCHAR(255) NOT NULL,
-        updated_at DATETIME DEFAULT GETDATE()
-    )
-    """)
 
-    cursor.execute("""
-    IF NOT EXISTS (
-        SELECT * FROM sysobjects WHERE name='email_alert_preferences' AND xtype='U'
-    )
-    CREATE TABLE email_alert_preferences (
-        id INT IDENTITY(1,1) PRIMARY KEY,
-        user_email NVARCHAR(255) UNIQUE NOT NULL,
-        alerts_enabled BIT NOT NULL DEFAULT 1,
-        frequency NVARCHAR(50) NOT NULL DEFAULT 'daily',
-        preferred_location NVARCHAR(255) NULL,
-        jobs_per_email INT NOT NULL DEFAULT 5,
-        last_sent_at DATETIME NULL,
-        created_at DATETIME DEFAULT GETDATE(),
-        updated_at DATETIME DEFAULT GETDATE()
-    )
-    """)
+def init_db():
+    ensure_schema(DB_MODE)
 
-    cursor.execute("""
-    IF NOT EXISTS (
-        SELECT * FROM sysobjects WHERE name='emailed_jobs_history' AND xtype='U'
-    )
-    CREATE TABLE emailed_jobs_history (
-        id INT IDENTITY(1,1) PRIMARY KEY,
-        user_email NVARCHAR(255) NOT NULL,
-        external_job_id NVARCHAR(255) NOT NULL,
-        title NVARCHAR(255) NULL,
-        emailed_at DATETIME DEFAULT GETDATE()
-    )
-    """)
+# =========================================================
+# DATA HELPERS
+# =========================================================
+# All queries live in repository.py; these wrappers pick the repository for
+# the active DB_MODE so the routes below stay backend-agnostic.
+_repositories = {}
+sqlite_write_queue = None
+_sqlite_write_queue_lock = threading.Lock()
 
-    conn.commit()
-    cursor.close()
-    conn.close()
-    print("Azure SQL tables ready.")
 
+def get_sqlite_write_queue() -> Optional[WriteQueue]:
+    global sqlite_write_queue
 
-def init_sqlite_db():
-    conn = get_sqlite_connection()
-    cursor = conn.cursor()
+    if not SQLITE_WRITE_QUEUE:
+        return None
 
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        email TEXT UNIQUE NOT NULL,
-        password_hash TEXT NOT NULL,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS saved_jobs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_email TEXT NOT NULL,
-        job_id TEXT NOT NULL,
-        title TEXT,
-        company TEXT,
-        location TEXT,
-        industry TEXT,
-        total_score INTEGER,
-        skill_score INTEGER,
-        qual_score INTEGER,
-        match_percentage INTEGER,
-        matched_skills TEXT,
-        missing_skills TEXT,
-        missing_qualifications TEXT,
-        raw_job_json TEXT NOT NULL,
-        saved_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS user_cvs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_email TEXT NOT NULL,
-        original_name TEXT NOT NULL,
-        stored_filename TEXT,
-        azure_blob_url TEXT,
-        extracted_skills TEXT,
-        extracted_qualifications TEXT,
-        text_preview TEXT,
-        uploaded_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS job_applications (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_email TEXT NOT NULL,
-        external_job_id TEXT NOT NULL,
-        source_name TEXT NOT NULL,
-        title TEXT,
-        company TEXT,
-        location TEXT,
-        apply_url TEXT,
-        status TEXT NOT NULL DEFAULT 'Applied',
-        notes TEXT,
-        applied_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS user_career_targets (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_email TEXT UNIQUE NOT NULL,
-        target_role TEXT NOT NULL,
-        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS email_alert_preferences (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_email TEXT UNIQUE NOT NULL,
-        alerts_enabled INTEGER NOT NULL DEFAULT 1,
-        frequency TEXT NOT NULL DEFAULT 'daily',
-        preferred_location TEXT,
-        jobs_per_email INTEGER NOT NULL DEFAULT 5,
-        last_sent_at TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS emailed_jobs_history (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_email TEXT NOT NULL,
-        external_job_id TEXT NOT NULL,
-        title TEXT,
-        emailed_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
+    # One writer thread per process: two first callers must not both start one.
+    with _sqlite_write_queue_lock:
+        if sqlite_write_queue is None:
+            sqlite_write_queue = WriteQueue(
+                connect_sqlite,
+                max_batch=SQLITE_WRITE_BATCH_SIZE,
+                flush_interval=SQLITE_WRITE_FLUSH_MS / 1000,
+            )
+            atexit.register(sqlite_write_queue.close)
+            print("SQLite write queue enabled.")
+        return sqlite_write_queue
 
-    conn.commit()
-    cursor.close()
-    conn.close()
-    print("SQLite tables ready.")
 
-# =========================================================
-# USER HELPERS
-# =========================================================
-def get_user_by_email(email: str) -> Optional[dict]:
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, name, email, password_hash FROM users WHERE email = ?",
-            (email,),
-        )
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+def get_repository(mode: Optional[str] = None) -> Repository:
+    mode = mode or DB_MODE
+    repo = _repositories.get(mode)
 
-        if not row:
-            return None
+    if repo is None:
+        ensure_schema(mode)
+        if mode in _repositories:
+            return _repositories[mode]
 
-        row = dict_from_row(row)
-        return {
-            "id": row["id"],
-            "name": row["name"],
-            "email": row["email"],
-            "password_hash": row["password_hash"],
-        }
+        pool = get_db_pool(mode)
+        write_queue = get_sqlite_write_queue() if mode == "sqlite" else None
+        repo = Repository(pool.acquire, get_dialect(mode), write_queue=write_queue)
+        _repositories[mode] = repo
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, name, email, password_hash FROM users WHERE email = ?",
-        (email,),
-    )
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
+    return repo
 
-    if not row:
-        return None
 
-    return {
-        "id": row[0],
-        "name": row[1],
-        "email": row[2],
-        "password_hash": row[3],
-    }
+def get_user_by_email(email: str) -> Optional[dict]:
+    return get_repository().get_user_by_email(email)
 
 
 def create_user(name: str, email: str, password_hash: str) -> dict:
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)",
-            (name, email, password_hash),
-        )
-        conn.commit()
-        cursor.execute(
-            "SELECT id, name, email, password_hash FROM users WHERE email = ?",
-            (email,),
-        )
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+    return get_repository().create_user(name, email, password_hash)
 
-        row = dict_from_row(row)
-        ensure_email_preferences_exist(email)
-        return {
-            "id": row["id"],
-            "name": row["name"],
-            "email": row["email"],
-            "password_hash": row["password_hash"],
-        }
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)",
-        (name, email, password_hash),
-    )
-    conn.commit()
-    cursor.execute(
-        "SELECT id, name, email, password_hash FROM users WHERE email = ?",
-        (email,),
-    )
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
+def get_saved_jobs_by_user(user_email: str) -> list:
+    return get_repository().get_saved_jobs(user_email)
 
-    ensure_email_preferences_exist(email)
-    return {
-        "id": row[0],
-        "name": row[1],
-        "email": row[2],
-        "password_hash": row[3],
-    }
 
-# =========================================================
-# SAVED JOBS HELPERS
-# =========================================================
-def get_saved_jobs_by_user(user_email: str) -> list:
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT raw_job_json
-            FROM saved_jobs
-            WHERE user_email = ?
-            ORDER BY saved_at DESC
-        """, (user_email,))
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+def get_saved_jobs_page_for_user(user_email: str, limit: int, cursor: Optional[str] = None):
+    return get_repository().get_saved_jobs_page(user_email, limit, cursor)
 
-        jobs = []
-        for row in rows:
-            row = dict_from_row(row)
-            try:
-                jobs.append(json.loads(row["raw_job_json"]))
-            except Exception:
-                pass
-        return jobs
-
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT raw_job_json
-        FROM saved_jobs
-        WHERE user_email = ?
-        ORDER BY saved_at DESC
-    """, (user_email,))
-    rows = cursor.fetchall()
-    cursor.close()
-    conn.close()
-
-    jobs = []
-    for row in rows:
-        try:
-            jobs.append(json.loads(row[0]))
-        except Exception:
-            pass
-    return jobs
-
-
-def save_job_for_user(user_email: str, job: dict) -> bool:
-    job_id = (
-        job.get("job_id")
-        or job.get("external_job_id")
-        or job.get("id")
-        or job.get("title")
-        or job.get("job_title")
-    )
 
-    if not job_id:
-        job_id = f"job-{datetime.now().timestamp()}"
-
-    title = job.get("title") or job.get("job_title") or ""
-    company = job.get("company") or ""
-    location = job.get("location") or ""
-    industry = job.get("industry") or ""
-    total_score = int(job.get("total_score", 0) or 0)
-    skill_score = int(job.get("skill_score", 0) or 0)
-    qual_score = int(job.get("qual_score", 0) or 0)
-    match_percentage = int(job.get("match_percentage", 0) or 0)
-    matched_skills = json.dumps(job.get("matched_skills", []))
-    missing_skills = json.dumps(job.get("missing_skills", []))
-    missing_qualifications = json.dumps(job.get("missing_qualifications", []))
-    raw_job_json = json.dumps(job)
-
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id
-            FROM saved_jobs
-            WHERE user_email = ? AND job_id = ?
-        """, (user_email, str(job_id)))
-        existing = cursor.fetchone()
-
-        if existing:
-            cursor.close()
-            conn.close()
-            return False
-
-        cursor.execute("""
-            INSERT INTO saved_jobs (
-                user_email, job_id, title, company, location, industry,
-                total_score, skill_score, qual_score, match_percentage,
-                matched_skills, missing_skills, missing_qualifications, raw_job_json
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            user_email, str(job_id), title, company, location, industry,
-            total_score, skill_score, qual_score, match_percentage,
-            matched_skills, missing_skills, missing_qualifications, raw_job_json
-        ))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return True
+def count_saved_jobs_for_user(user_email: str) -> int:
+    return get_repository().count_saved_jobs(user_email)
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id
-        FROM saved_jobs
-        WHERE user_email = ? AND job_id = ?
-    """, (user_email, str(job_id)))
-    existing = cursor.fetchone()
 
-    if existing:
-        cursor.close()
-        conn.close()
-        return False
+def save_job_for_user(user_email: str, job: dict, job_id: Optional[str] = None) -> bool:
+    return get_repository().save_job(user_email, job, job_id=job_id)
 
-    cursor.execute("""
-        INSERT INTO saved_jobs (
-            user_email, job_id, title, company, location, industry,
-            total_score, skill_score, qual_score, match_percentage,
-            matched_skills, missing_skills, missing_qualifications, raw_job_json
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        user_email, str(job_id), title, company, location, industry,
-        total_score, skill_score, qual_score, match_percentage,
-        matched_skills, missing_skills, missing_qualifications, raw_job_json
-    ))
-    conn.commit()
-    cursor.close()
-    conn.close()
-    return True
-
-
-def remove_saved_job_for_user(user_email: str, job_id: str):
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            DELETE FROM saved_jobs
-            WHERE user_email = ? AND job_id = ?
-        """, (user_email, str(job_id)))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        DELETE FROM saved_jobs
-        WHERE user_email = ? AND job_id = ?
-    """, (user_email, str(job_id)))
-    conn.commit()
-    cursor.close()
-    conn.close()
+def remove_saved_job_for_user(user_email: str, job_id: str) -> bool:
+    return get_repository().remove_saved_job(user_email, job_id)
+
 
-# =========================================================
-# CV HISTORY HELPERS
-# =========================================================
 def save_cv_for_user(
     user_email: str,
     original_name: str,
@@ -777,519 +577,130 @@ def save_cv_for_user(
     qualifications: list[str],
     text_preview: str,
 ):
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO user_cvs (
-                user_email, original_name, stored_filename,
-                azure_blob_url, extracted_skills, extracted_qualifications,
-                text_preview
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            user_email,
-            original_name,
-            stored_filename,
-            azure_blob_url or "",
-            json.dumps(skills or []),
-            json.dumps(qualifications or []),
-            text_preview or "",
-        ))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO user_cvs (
-            user_email, original_name, stored_filename,
-            azure_blob_url, extracted_skills, extracted_qualifications,
-            text_preview
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
+    get_repository().save_cv(
         user_email,
         original_name,
         stored_filename,
-        azure_blob_url or "",
-        json.dumps(skills or []),
-        json.dumps(qualifications or []),
-        text_preview or "",
-    ))
-    conn.commit()
-    cursor.close()
-    conn.close()
+        azure_blob_url,
+        skills,
+        qualifications,
+        text_preview,
+    )
+
+
+def create_cv_upload_job(user_email: str, job_id: str, original_name: str, status: str):
+    get_repository().create_cv_upload_job(user_email, job_id, original_name, status)
+
+
+def update_cv_upload_job(job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+    get_repository().update_cv_upload_job(job_id, status, result=result, error=error)
+
+
+def get_cv_upload_job(user_email: str, job_id: str) -> Optional[dict]:
+    return get_repository().get_cv_upload_job(user_email, job_id)
+
+
+def set_cv_blob_url(stored_filename: str, azure_blob_url: str):
+    get_repository().set_cv_blob_url(stored_filename, azure_blob_url)
 
 
 def get_uploaded_cvs_by_user(user_email: str) -> list:
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT original_name, stored_filename, azure_blob_url,
-                   extracted_skills, extracted_qualifications,
-                   text_preview, uploaded_at
-            FROM user_cvs
-            WHERE user_email = ?
-            ORDER BY uploaded_at DESC
-        """, (user_email,))
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+    return get_repository().get_uploaded_cvs(user_email)
 
-        cvs = []
-        for row in rows:
-            row = dict_from_row(row)
-            cvs.append({
-                "original_name": row["original_name"],
-                "stored_filename": row["stored_filename"],
-                "azure_blob_url": row["azure_blob_url"],
-                "skills": json.loads(row["extracted_skills"]) if row["extracted_skills"] else [],
-                "qualifications": json.loads(row["extracted_qualifications"]) if row["extracted_qualifications"] else [],
-                "text_preview": row["text_preview"] or "",
-                "uploaded_at": row["uploaded_at"] or "",
-            })
-        return cvs
-
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT original_name, stored_filename, azure_blob_url,
-               extracted_skills, extracted_qualifications,
-               text_preview, uploaded_at
-        FROM user_cvs
-        WHERE user_email = ?
-        ORDER BY uploaded_at DESC
-    """, (user_email,))
-    rows = cursor.fetchall()
-    cursor.close()
-    conn.close()
-
-    cvs = []
-    for row in rows:
-        cvs.append({
-            "original_name": row[0],
-            "stored_filename": row[1],
-            "azure_blob_url": row[2],
-            "skills": json.loads(row[3]) if row[3] else [],
-            "qualifications": json.loads(row[4]) if row[4] else [],
-            "text_preview": row[5] or "",
-            "uploaded_at": str(row[6]) if row[6] else "",
-        })
-    return cvs
 
-# =========================================================
-# APPLICATION HELPERS
-# =========================================================
-def save_job_application_for_user(user_email: str, job: dict, status: str = "Applied"):
-    external_job_id = str(
-        job.get("external_job_id")
-        or job.get("id")
-        or job.get("job_id")
-        or f"adzuna-{datetime.now().timestamp()}"
-    )
+def get_uploaded_cvs_page_for_user(user_email: str, limit: int, cursor: Optional[str] = None):
+    return get_repository().get_uploaded_cvs_page(user_email, limit, cursor)
 
-    source_name = str(job.get("source_name") or "Adzuna")
-    title = str(job.get("title") or job.get("job_title") or "")
-    company = str(job.get("company") or "")
-    location = str(job.get("location") or "")
-    apply_url = str(job.get("apply_url") or job.get("redirect_url") or "")
-    notes = str(job.get("notes") or "")
 
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id
-            FROM job_applications
-            WHERE user_email = ? AND external_job_id = ?
-        """, (user_email, external_job_id))
-        existing = cursor.fetchone()
-
-        if existing:
-            cursor.execute("""
-                UPDATE job_applications
-                SET status = ?, notes = ?, apply_url = ?, title = ?, company = ?, location = ?
-                WHERE user_email = ? AND external_job_id = ?
-            """, (
-                status, notes, apply_url, title, company, location,
-                user_email, external_job_id
-            ))
-        else:
-            cursor.execute("""
-                INSERT INTO job_applications (
-                    user_email, external_job_id, source_name, title, company,
-                    location, apply_url, status, notes
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                user_email, external_job_id, source_name, title, company,
-                location, apply_url, status, notes
-            ))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
+def count_uploaded_cvs_for_user(user_email: str) -> int:
+    return get_repository().count_uploaded_cvs(user_email)
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id
-        FROM job_applications
-        WHERE user_email = ? AND external_job_id = ?
-    """, (user_email, external_job_id))
-    existing = cursor.fetchone()
-
-    if existing:
-        cursor.execute("""
-            UPDATE job_applications
-            SET status = ?, notes = ?, apply_url = ?, title = ?, company = ?, location = ?
-            WHERE user_email = ? AND external_job_id = ?
-        """, (
-            status, notes, apply_url, title, company, location,
-            user_email, external_job_id
-        ))
-    else:
-        cursor.execute("""
-            INSERT INTO job_applications (
-                user_email, external_job_id, source_name, title, company,
-                location, apply_url, status, notes
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            user_email, external_job_id, source_name, title, company,
-            location, apply_url, status, notes
-        ))
-    conn.commit()
-    cursor.close()
-    conn.close()
+
+def save_job_application_for_user(user_email: str, job: dict, status: str = "Applied") -> str:
+    return get_repository().save_job_application(user_email, job, status)
 
 
 def get_job_applications_by_user(user_email: str) -> list:
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, external_job_id, source_name, title, company, location,
-                   apply_url, status, notes, applied_at
-            FROM job_applications
-            WHERE user_email = ?
-            ORDER BY applied_at DESC
-        """, (user_email,))
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+    return get_repository().get_job_applications(user_email)
 
-        applications = []
-        for row in rows:
-            row = dict_from_row(row)
-            applications.append({
-                "id": row["id"],
-                "external_job_id": row["external_job_id"],
-                "source_name": row["source_name"],
-                "title": row["title"],
-                "company": row["company"],
-                "location": row["location"],
-                "apply_url": row["apply_url"],
-                "status": row["status"],
-                "notes": row["notes"] or "",
-                "applied_at": row["applied_at"] or "",
-            })
-        return applications
-
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id, external_job_id, source_name, title, company, location,
-               apply_url, status, notes, applied_at
-        FROM job_applications
-        WHERE user_email = ?
-        ORDER BY applied_at DESC
-    """, (user_email,))
-    rows = cursor.fetchall()
-    cursor.close()
-    conn.close()
-
-    applications = []
-    for row in rows:
-        applications.append({
-            "id": row[0],
-            "external_job_id": row[1],
-            "source_name": row[2],
-            "title": row[3],
-            "company": row[4],
-            "location": row[5],
-            "apply_url": row[6],
-            "status": row[7],
-            "notes": row[8] or "",
-            "applied_at": str(row[9]) if row[9] else "",
-        })
-    return applications
 
+def get_job_applications_page_for_user(user_email: str, limit: int, cursor: Optional[str] = None):
+    return get_repository().get_job_applications_page(user_email, limit, cursor)
 
-def update_job_application_status_for_user(user_email: str, application_id: int, status: str):
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE job_applications
-            SET status = ?
-            WHERE id = ? AND user_email = ?
-        """, (status, application_id, user_email))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE job_applications
-        SET status = ?
-        WHERE id = ? AND user_email = ?
-    """, (status, application_id, user_email))
-    conn.commit()
-    cursor.close()
-    conn.close()
-
-
-def update_job_application_notes_for_user(user_email: str, application_id: int, notes: str):
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE job_applications
-            SET notes = ?
-            WHERE id = ? AND user_email = ?
-        """, (notes, application_id, user_email))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
+def count_job_applications_for_user(user_email: str) -> int:
+    return get_repository().count_job_applications(user_email)
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE job_applications
-        SET notes = ?
-        WHERE id = ? AND user_email = ?
-    """, (notes, application_id, user_email))
-    conn.commit()
-    cursor.close()
-    conn.close()
 
-# =========================================================
-# CAREER TARGET HELPERS
-# =========================================================
-def get_user_career_target(user_email: str) -> str:
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT target_role
-            FROM user_career_targets
-            WHERE user_email = ?
-        """, (user_email,))
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+def get_job_application_for_user(
+    user_email: str,
+    application_id: Optional[int] = None,
+    external_job_id: Optional[str] = None,
+) -> Optional[dict]:
+    return get_repository().get_job_application(
+        user_email,
+        application_id=application_id,
+        external_job_id=external_job_id,
+    )
 
-        if not row:
-            return ""
 
-        row = dict_from_row(row)
-        return row["target_role"]
+def update_job_application_status_for_user(user_email: str, application_id: int, status: str) -> bool:
+    return get_repository().update_application_status(user_email, application_id, status)
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT target_role
-        FROM user_career_targets
-        WHERE user_email = ?
-    """, (user_email,))
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
 
-    if not row:
-        return ""
+def update_job_application_notes_for_user(user_email: str, application_id: int, notes: str) -> bool:
+    return get_repository().update_application_notes(user_email, application_id, notes)
 
-    return row[0]
 
+def get_list_version_for_user(user_email: str, list_name: str) -> int:
+    return get_repository().get_list_version(user_email, list_name)
 
-def save_user_career_target(user_email: str, target_role: str):
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT id
-            FROM user_career_targets
-            WHERE user_email = ?
-        """, (user_email,))
-        existing = cursor.fetchone()
-
-        if existing:
-            cursor.execute("""
-                UPDATE user_career_targets
-                SET target_role = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE user_email = ?
-            """, (target_role, user_email))
-        else:
-            cursor.execute("""
-                INSERT INTO user_career_targets (user_email, target_role)
-                VALUES (?, ?)
-            """, (user_email, target_role))
-
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
+def get_user_analytics_for_user(user_email: str) -> dict:
+    return get_repository().get_user_analytics(user_email)
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT id
-        FROM user_career_targets
-        WHERE user_email = ?
-    """, (user_email,))
-    existing = cursor.fetchone()
-
-    if existing:
-        cursor.execute("""
-            UPDATE user_career_targets
-            SET target_role = ?, updated_at = GETDATE()
-            WHERE user_email = ?
-        """, (target_role, user_email))
-    else:
-        cursor.execute("""
-            INSERT INTO user_career_targets (user_email, target_role)
-            VALUES (?, ?)
-        """, (user_email, target_role))
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+def aggregate_user_analytics_for_user(user_email: str) -> dict:
+    return get_repository().aggregate_user_analytics(user_email)
 
-# =========================================================
-# EMAIL ALERT PREFERENCES / HISTORY
-# =========================================================
-def ensure_email_preferences_exist(user_email: str):
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id
-            FROM email_alert_preferences
-            WHERE user_email = ?
-        """, (user_email,))
-        existing = cursor.fetchone()
-
-        if not existing:
-            cursor.execute("""
-                INSERT INTO email_alert_preferences (
-                    user_email, alerts_enabled, frequency, preferred_location, jobs_per_email
-                )
-                VALUES (?, ?, ?, ?, ?)
-            """, (user_email, 1, "daily", "", 5))
-            conn.commit()
 
-        cursor.close()
-        conn.close()
-        return
+def rebuild_user_analytics(user_email: Optional[str] = None, mode: Optional[str] = None) -> int:
+    repo = get_repository(mode)
+    emails = [user_email] if user_email else repo.get_user_emails()
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id
-        FROM email_alert_preferences
-        WHERE user_email = ?
-    """, (user_email,))
-    existing = cursor.fetchone()
-
-    if not existing:
-        cursor.execute("""
-            INSERT INTO email_alert_preferences (
-                user_email, alerts_enabled, frequency, preferred_location, jobs_per_email
-            )
-            VALUES (?, ?, ?, ?, ?)
-        """, (user_email, 1, "daily", "", 5))
-        conn.commit()
+    for email in emails:
+        repo.rebuild_user_analytics(email)
 
-    cursor.close()
-    conn.close()
+    print(f"[ANALYTICS] Rebuilt summary for {len(emails)} user(s)")
+    return len(emails)
 
 
-def get_email_preferences_by_user(user_email: str) -> dict:
-    ensure_email_preferences_exist(user_email)
+def check_user_analytics(user_email: Optional[str] = None) -> dict:
+    repo = get_repository()
+    emails = [user_email] if user_email else repo.get_user_emails()
 
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT user_email, alerts_enabled, frequency, preferred_location,
-                   jobs_per_email, last_sent_at
-            FROM email_alert_preferences
-            WHERE user_email = ?
-        """, (user_email,))
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+    mismatches = {}
+    for email in emails:
+        diff = repo.check_user_analytics(email)
+        if diff:
+            mismatches[email] = diff
+    return mismatches
 
-        if not row:
-            return {
-                "user_email": user_email,
-                "alerts_enabled": True,
-                "frequency": "daily",
-                "preferred_location": "",
-                "jobs_per_email": 5,
-                "last_sent_at": None,
-            }
-
-        row = dict_from_row(row)
-        return {
-            "user_email": row["user_email"],
-            "alerts_enabled": bool(row["alerts_enabled"]),
-            "frequency": row["frequency"] or "daily",
-            "preferred_location": row["preferred_location"] or "",
-            "jobs_per_email": int(row["jobs_per_email"] or 5),
-            "last_sent_at": row["last_sent_at"],
-        }
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT user_email, alerts_enabled, frequency, preferred_location,
-               jobs_per_email, last_sent_at
-        FROM email_alert_preferences
-        WHERE user_email = ?
-    """, (user_email,))
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
-
-    if not row:
-        return {
-            "user_email": user_email,
-            "alerts_enabled": True,
-            "frequency": "daily",
-            "preferred_location": "",
-            "jobs_per_email": 5,
-            "last_sent_at": None,
-        }
+def get_user_career_target(user_email: str) -> str:
+    return get_repository().get_career_target(user_email)
 
-    return {
-        "user_email": row[0],
-        "alerts_enabled": bool(row[1]),
-        "frequency": row[2] or "daily",
-        "preferred_location": row[3] or "",
-        "jobs_per_email": int(row[4] or 5),
-        "last_sent_at": str(row[5]) if row[5] else None,
-    }
+
+def save_user_career_target(user_email: str, target_role: str):
+    get_repository().save_career_target(user_email, target_role)
+
+
+def ensure_email_preferences_exist(user_email: str):
+    get_repository().ensure_email_preferences(user_email)
+
+
+def get_email_preferences_by_user(user_email: str) -> dict:
+    return get_repository().get_email_preferences(user_email)
 
 
 def update_email_preferences_for_user(
@@ -1299,261 +710,438 @@ def update_email_preferences_for_user(
     preferred_location: str,
     jobs_per_email: int,
 ):
-    ensure_email_preferences_exist(user_email)
-
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE email_alert_preferences
-            SET alerts_enabled = ?,
-                frequency = ?,
-                preferred_location = ?,
-                jobs_per_email = ?,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_email = ?
-        """, (
-            1 if alerts_enabled else 0,
-            frequency,
-            preferred_location,
-            jobs_per_email,
-            user_email,
-        ))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE email_alert_preferences
-        SET alerts_enabled = ?,
-            frequency = ?,
-            preferred_location = ?,
-            jobs_per_email = ?,
-            updated_at = GETDATE()
-        WHERE user_email = ?
-    """, (
-        1 if alerts_enabled else 0,
+    get_repository().update_email_preferences(
+        user_email,
+        alerts_enabled,
         frequency,
         preferred_location,
         jobs_per_email,
-        user_email,
-    ))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    )
 
 
 def update_email_last_sent_for_user(user_email: str):
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE email_alert_preferences
-            SET last_sent_at = CURRENT_TIMESTAMP,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_email = ?
-        """, (user_email,))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE email_alert_preferences
-        SET last_sent_at = GETDATE(),
-            updated_at = GETDATE()
-        WHERE user_email = ?
-    """, (user_email,))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    get_repository().update_email_last_sent(user_email)
 
 
 def get_all_alert_enabled_users() -> list[dict]:
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT u.email, u.name
-            FROM users u
-            INNER JOIN email_alert_preferences p
-                ON u.email = p.user_email
-            WHERE p.alerts_enabled = 1
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        users = []
-        for row in rows:
-            row = dict_from_row(row)
-            users.append({
-                "email": row["email"],
-                "name": row["name"],
-            })
-        return users
-
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT u.email, u.name
-        FROM users u
-        INNER JOIN email_alert_preferences p
-            ON u.email = p.user_email
-        WHERE p.alerts_enabled = 1
-    """)
-    rows = cursor.fetchall()
-    cursor.close()
-    conn.close()
-
-    return [{"email": row[0], "name": row[1]} for row in rows]
+    return get_repository().get_alert_enabled_users()
 
 
 def has_job_been_emailed_to_user(user_email: str, external_job_id: str) -> bool:
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id
-            FROM emailed_jobs_history
-            WHERE user_email = ? AND external_job_id = ?
-        """, (user_email, external_job_id))
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        return row is not None
-
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id
-        FROM emailed_jobs_history
-        WHERE user_email = ? AND external_job_id = ?
-    """, (user_email, external_job_id))
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
-    return row is not None
+    return get_repository().has_job_been_emailed(user_email, external_job_id)
 
 
 def record_emailed_job(user_email: str, external_job_id: str, title: str):
-    if db_is_sqlite():
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO emailed_jobs_history (user_email, external_job_id, title)
-            VALUES (?, ?, ?)
-        """, (user_email, external_job_id, title))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
+    get_repository().record_emailed_job(user_email, external_job_id, title)
+
+# =========================================================
+# FILE HELPERS
+# =========================================================
+_blob_uploader = None
+_blob_uploader_lock = threading.Lock()
+
+
+def get_blob_uploader() -> Optional[BlobUploader]:
+    global _blob_uploader
+
+    with _blob_uploader_lock:
+        if _blob_uploader is None:
+            if BLOB_BACKEND == "azure" and cv_container_client is not None:
+                backend = AzureBlobBackend(cv_container_client, max_concurrency=BLOB_UPLOAD_CONCURRENCY)
+            elif BLOB_BACKEND == "filesystem":
+                backend = FilesystemBlobBackend(
+                    BLOB_FILESYSTEM_PATH or os.path.join(BASE_DIR, "blob_storage"),
+                    base_url=BLOB_FILESYSTEM_BASE_URL,
+                )
+            else:
+                return None
+
+            _blob_uploader = BlobUploader(
+                backend,
+                workers=BLOB_UPLOAD_WORKERS,
+                retries=BLOB_UPLOAD_RETRIES,
+                backoff_seconds=BLOB_UPLOAD_BACKOFF_SECONDS,
+            )
+            # Let queued uploads finish when the worker shuts down.
+            atexit.register(_blob_uploader.close)
+        return _blob_uploader
+
+
+def upload_cv_blob(data: bytes, blob_name: str) -> tuple[Optional[str], str]:
+    # Stores the file and, once it is there, fills in azure_blob_url on the
+    # user_cvs row that points at it. In the background (the default) the
+    # caller gets (None, "pending") straight away; otherwise it waits and
+    # gets (url, "done") or (None, "failed").
+    uploader = get_blob_uploader()
+    if uploader is None:
+        print("Blob storage not configured. Skipping upload.")
+        return None, "skipped"
+
+    def stored(url: Optional[str]):
+        if url:
+            set_cv_blob_url(blob_name, url)
 
-    conn = get_azure_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO emailed_jobs_history (user_email, external_job_id, title)
-        VALUES (?, ?, ?)
-    """, (user_email, external_job_id, title))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    future = uploader.submit(blob_name, data, stored)
+    if BLOB_UPLOAD_BACKGROUND:
+        return None, "pending"
+
+    url = future.result()
+    return url, "done" if url else "failed"
 
 # =========================================================
-# NLP HELPERS
+# CV PARSE CACHE
 # =========================================================
-def normalize_tokens(text: str) -> list[str]:
-    tokens = word_tokenize(text)
-    clean = []
-    for tok in tokens:
-        lower = tok.lower()
-        if lower.isalpha() and lower not in EN_STOPWORDS:
-            clean.append(lower)
-    return clean
+_cv_cache = None
+_cv_cache_lock = threading.Lock()
 
 
-def keyword_match(text: str, keywords: list[str]) -> list[str]:
-    tokens = normalize_tokens(text)
-    token_text = " ".join(tokens)
-    token_set = set(tokens)
+def get_cv_cache() -> Optional[CVParseCache]:
+    global _cv_cache
 
-    found = []
+    if not CV_CACHE_ENABLED:
+        return None
 
-    for kw in keywords:
-        kw_lower = kw.lower()
-        if " " in kw_lower:
-            if kw_lower in token_text:
-                found.append(kw)
-        else:
-            if kw_lower in token_set:
-                found.append(kw)
+    with _cv_cache_lock:
+        if _cv_cache is None:
+            _cv_cache = CVParseCache(
+                CV_CACHE_PATH or os.path.join(BASE_DIR, "cv_parse_cache.db"),
+                max_entries=CV_CACHE_MAX_ENTRIES,
+                max_bytes=int(CV_CACHE_MAX_MB * 1024 * 1024),
+            )
+        return _cv_cache
 
-    seen = set()
-    unique = []
-    for item in found:
-        key = item.lower()
-        if key not in seen:
-            seen.add(key)
-            unique.append(item)
-    return unique
 
+def cached_cv_parse(key: str) -> Optional[dict]:
+    cache = get_cv_cache()
+    entry = cache.get(key) if cache else None
+    if entry is None:
+        return None
 
-def extract_skills(text: str) -> list[str]:
-    return keyword_match(text, SKILL_KEYWORDS)
+    taxonomy = get_taxonomy()
+    if entry["taxonomy_fingerprint"] != taxonomy.fingerprint:
+        entry["skills"] = extract_skills(entry["text"])
+        entry["qualifications"] = extract_qualifications(entry["text"])
+        entry["taxonomy_fingerprint"] = taxonomy.fingerprint
+        cache.put(key, entry["text"], entry["skills"], entry["qualifications"], taxonomy.fingerprint)
+    entry["cache_key"] = key
+    entry["cached"] = True
+    return entry
+
+
+def analyse_cv_text(key: str, raw_text: str) -> dict:
+    text = clean_extracted_text(raw_text)
+    return {
+        "cache_key": key,
+        "cached": False,
+        "text": text,
+        "skills": extract_skills(text),
+        "qualifications": extract_qualifications(text),
+        "taxonomy_fingerprint": get_taxonomy().fingerprint,
+    }
+
+
+def parse_cv_bytes(data: bytes, filename: str) -> dict:
+    # Returns the cleaned text, skills and qualifications for an upload,
+    # from the cache when the same bytes have been parsed before; "cached"
+    # tells the caller which path was taken.
+    ext = os.path.splitext(filename)[1].lower()
+    key = content_key(data, ext)
+    return cached_cv_parse(key) or analyse_cv_text(key, extract_cv_text(data, ext))
+
+
+def remember_parsed_cv(parsed: dict):
+    cache = get_cv_cache()
+    if cache is None or parsed["cached"]:
+        return
+
+    try:
+        cache.put(
+            parsed["cache_key"],
+            parsed["text"],
+            parsed["skills"],
+            parsed["qualifications"],
+            parsed["taxonomy_fingerprint"],
+        )
+    except Exception as e:
+        print("[CV CACHE] Could not store parse result:", e)
 
 
-def extract_qualifications(text: str) -> list[str]:
-    return keyword_match(text, QUALIFICATION_KEYWORDS)
 
 # =========================================================
-# FILE HELPERS
+# CV UPLOAD PIPELINE
 # =========================================================
-def upload_cv_to_azure(file_path: str, blob_name: str) -> Optional[str]:
-    if cv_container_client is None:
-        print("Azure CV container client not configured. Skipping upload.")
-        return None
+_cv_job_queue = None
+_cv_job_queue_lock = threading.Lock()
+
+
+def get_cv_job_queue() -> LocalJobQueue:
+    global _cv_job_queue
+
+    with _cv_job_queue_lock:
+        if _cv_job_queue is None:
+            _cv_job_queue = LocalJobQueue(
+                io_workers=CV_JOB_IO_WORKERS,
+                parse_workers=CV_JOB_PARSE_WORKERS,
+                max_pending=CV_JOB_MAX_PENDING,
+            )
+            atexit.register(_cv_job_queue.close, False)
+        return _cv_job_queue
+
+
+_pdf_extractor = None
+
 
-    with open(file_path, "rb") as data:
-        cv_container_client.upload_blob(
-            name=blob_name,
-            data=data,
-            overwrite=True,
+def get_pdf_extractor() -> PdfExtractor:
+    global _pdf_extractor
+
+    if _pdf_extractor is None:
+        _pdf_extractor = PdfExtractor(
+            get_cv_job_queue().submit_parse,
+            workers=max(1, CV_JOB_PARSE_WORKERS),
+            max_pages=PDF_MAX_PAGES,
+            max_bytes=int(PDF_MAX_MB * 1024 * 1024),
+            time_budget=PDF_TIME_BUDGET_SECONDS,
+            target_chars=PDF_TARGET_CHARS,
+            pages_per_task=PDF_PAGES_PER_TASK,
         )
+    return _pdf_extractor
+
+
+def check_cv_upload(data: bytes, filename: str):
+    if os.path.splitext(filename)[1].lower() == ".pdf":
+        get_pdf_extractor().check(data)
+
+
+def extract_cv_text(data: bytes, ext: str) -> str:
+    # Parsing always happens in the worker process pool, never in the
+    # request thread; PDFs are split across workers page by page.
+    if ext == ".pdf":
+        return get_pdf_extractor().extract(data)
+    return get_cv_job_queue().parse(extract_text_from_bytes, data, ext, timeout=CV_JOB_PARSE_TIMEOUT)
+
+
+def stored_cv_record(user_email: str, original_name: str, parsed: dict) -> dict:
+    # The user_cvs row for a parsed upload (see Repository.save_cvs). A
+    # cache hit may come from another user's upload, so only the parse is
+    # reused; every row gets a file of its own.
+    remember_parsed_cv(parsed)
+
+    # Stored names carry a content hash prefix and a random suffix: two
+    # uploads with the same name in the same second, including the same
+    # bytes from two users, must not overwrite each other's blob.
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    filename = f"{timestamp}-{parsed['cache_key'][:8]}-{uuid.uuid4().hex[:8]}-{original_name}"
+
+    text = parsed["text"]
+    return {
+        "user_email": user_email,
+        "original_name": original_name,
+        "stored_filename": filename,
+        "azure_blob_url": None,
+        "skills": parsed["skills"],
+        "qualifications": parsed["qualifications"],
+        "text_preview": text[:1200] if text else "",
+    }
+
+
+def process_cv_upload(user_email: str, data: bytes, original_name: str) -> dict:
+    # data is the upload read once from its spool; the parser and the blob
+    # upload share it and nothing is written to local disk.
+    parsed = parse_cv_bytes(data, original_name)
+    record = stored_cv_record(user_email, original_name, parsed)
+    save_cv_for_user(**record)
+
+    # The row is written first and its azure_blob_url filled in when the
+    # blob lands, so blob latency is not part of the request.
+    blob_url, blob_upload = upload_cv_blob(data, record["stored_filename"])
+
+    return {
+        "message": "CV uploaded & parsed successfully",
+        "original_name": original_name,
+        "skills": record["skills"],
+        "qualifications": record["qualifications"],
+        "text_preview": record["text_preview"],
+        "azure_blob_url": blob_url,
+        "blob_upload": blob_upload,
+        "cached": parsed["cached"],
+        "db_mode": DB_MODE,
+    }
 
-    blob_client = cv_container_client.get_blob_client(blob_name)
-    return blob_client.url
 
+def run_cv_upload_job(job_id: str, user_email: str, data: bytes, original_name: str):
+    update_cv_upload_job(job_id, JOB_PROCESSING)
 
-def extract_text_from_pdf(path: str) -> str:
     try:
-        reader = PdfReader(path)
-        return "\n".join((page.extract_text() or "") for page in reader.pages)
+        result = process_cv_upload(user_email, data, original_name)
+    except (ExtractionLimit, ParseFailed) as e:
+        print(f"[CV JOBS] Job {job_id} failed:", e)
+        update_cv_upload_job(job_id, JOB_FAILED, error=str(e))
+        return
     except Exception as e:
-        print("PDF parse error:", e)
-        return ""
+        print(f"[CV JOBS] Job {job_id} failed:", e)
+        update_cv_upload_job(job_id, JOB_FAILED, error=str(e) or e.__class__.__name__)
+        raise
+
+    update_cv_upload_job(job_id, JOB_DONE, result=result)
+
+
+def enqueue_cv_upload(user_email: str, data: bytes, original_name: str) -> str:
+    check_cv_upload(data, original_name)
+
+    job_id = new_job_id()
+    create_cv_upload_job(user_email, job_id, original_name, JOB_QUEUED)
+
+    try:
+        get_cv_job_queue().submit(run_cv_upload_job, job_id, user_email, data, original_name)
+    except (QueueFull, RuntimeError) as e:
+        update_cv_upload_job(job_id, JOB_FAILED, error=str(e))
+        raise
+
+    return job_id
+
+# =========================================================
+# BULK CV INGESTION
+# =========================================================
+def ingest_cv_files(files: list, report: Optional[IngestReport] = None, batch_size: Optional[int] = None) -> dict:
+    # Parses whole files across the process pool, a bounded window at a
+    # time, and saves the user_cvs rows batch_size per transaction. Blob
+    # uploads go to the background uploader as each batch is saved.
+    report = report if report is not None else IngestReport()
+    batch_size = max(1, batch_size or BULK_INGEST_BATCH_SIZE)
+    queue = get_cv_job_queue()
+    window = max(1, queue.parse_workers) * 4
+
+    in_flight = deque()
+    batch = []
+
+    def flush():
+        if not batch:
+            return
+        try:
+            get_repository().save_cvs([record for _, record, _, _ in batch])
+        except Exception as e:
+            print("[BULK] Could not save batch:", e)
+            for entry, _, _, _ in batch:
+                report.fail(entry, f"Database error: {e}")
+            batch.clear()
+            return
+
+        for entry, record, data, parsed in batch:
+            upload_cv_blob(data, record["stored_filename"])
+            report.ok(
+                entry,
+                (time.perf_counter() - entry.started) * 1000,
+                len(parsed["text"]),
+                len(record["skills"]),
+                len(record["qualifications"]),
+                parsed["cached"],
+            )
+        batch.clear()
+
+    def finish(entry, data, key, parsed, future):
+        try:
+            if parsed is None:
+                raw_text = future.result(timeout=PDF_TIME_BUDGET_SECONDS + CV_JOB_PARSE_TIMEOUT)
+                parsed = analyse_cv_text(key, raw_text)
+            record = stored_cv_record(entry.email, entry.original_name, parsed)
+        except Exception as e:
+            report.fail(entry, f"Could not parse: {str(e) or e.__class__.__name__}")
+            return
+
+        batch.append((entry, record, data, parsed))
+        if len(batch) >= batch_size:
+            flush()
+
+    for entry in files:
+        entry.started = time.perf_counter()
+        try:
+            data = entry.load()
+        except Exception as e:
+            report.fail(entry, f"Could not read: {e}")
+            continue
+
+        key = content_key(data, entry.extension)
+        parsed = cached_cv_parse(key)
+        future = None
+        if parsed is None:
+            future = queue.submit_parse(
+                extract_document, data, entry.extension,
+                PDF_MAX_PAGES, PDF_TIME_BUDGET_SECONDS, PDF_TARGET_CHARS,
+            )
+        in_flight.append((entry, data, key, parsed, future))
+
+        while len(in_flight) > window:
+            finish(*in_flight.popleft())
+
+    while in_flight:
+        finish(*in_flight.popleft())
+    flush()
+
+    result = report.to_dict()
+    print(
+        f"[BULK] {result['succeeded']}/{result['total']} CVs ingested for {result['users']} user(s) "
+        f"in {result['seconds']}s ({result['files_per_second']} files/s)"
+    )
+    return result
+
+
+def collect_cv_source(source, report: IngestReport) -> list:
+    return collect_files(
+        source,
+        max_files=BULK_INGEST_MAX_FILES,
+        max_file_bytes=int(CV_UPLOAD_MAX_MB * 1024 * 1024),
+        max_total_bytes=int(BULK_INGEST_MAX_MB * 1024 * 1024),
+        report=report,
+    )
+
+
+def ingest_cv_source(source, batch_size: Optional[int] = None) -> dict:
+    report = IngestReport()
+    files = collect_cv_source(source, report)
+    return ingest_cv_files(files, report=report, batch_size=batch_size)
+
+
+def run_bulk_ingest_job(job_id: str, spool, files: list, report: IngestReport, batch_size: Optional[int]):
+    update_cv_upload_job(job_id, JOB_PROCESSING)
+
+    try:
+        result = ingest_cv_files(files, report=report, batch_size=batch_size)
+    except Exception as e:
+        print(f"[BULK] Job {job_id} failed:", e)
+        update_cv_upload_job(job_id, JOB_FAILED, error=str(e) or e.__class__.__name__)
+        raise
+    finally:
+        spool.close()
+
+    update_cv_upload_job(job_id, JOB_DONE, result=result)
 
 
-def extract_text_from_docx(path: str) -> str:
+def enqueue_bulk_ingest(admin_email: str, stream, original_name: str, batch_size: Optional[int] = None) -> str:
+    # A whole cohort takes minutes to parse, far past a gunicorn worker's
+    # timeout, so the request only lists the archive and the job does the
+    # rest. The upload is copied to a spool the job owns because the
+    # request's own file is closed once the response has been sent.
+    spool = SpooledTemporaryFile(max_size=int(CV_UPLOAD_SPOOL_MB * 1024 * 1024), mode="rb+")
     try:
-        doc = Document(path)
-        return "\n".join(p.text for p in doc.paragraphs)
-    except Exception as e:
-        print("DOCX parse error:", e)
-        return ""
+        shutil.copyfileobj(stream, spool)
+        spool.seek(0)
+        report = IngestReport()
+        files = collect_cv_source(spool, report)
+    except Exception:
+        spool.close()
+        raise
 
+    job_id = new_job_id()
+    create_cv_upload_job(admin_email, job_id, original_name, JOB_QUEUED)
 
-def extract_text_generic(path: str) -> str:
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
-    except Exception as e:
-        print("Generic text parse error:", e)
-        return ""
+        get_cv_job_queue().submit(run_bulk_ingest_job, job_id, spool, files, report, batch_size)
+    except (QueueFull, RuntimeError) as e:
+        spool.close()
+        update_cv_upload_job(job_id, JOB_FAILED, error=str(e))
+        raise
+
+    return job_id
 
 # =========================================================
 # MATCHING / EXPLANATION
@@ -1669,7 +1257,7 @@ def calculate_job_readiness(skills: list, qualifications: list, saved_jobs: list
 
 
 def get_latest_cv_data(user_email: str) -> dict:
-    uploaded_cvs = get_uploaded_cvs_by_user(user_email)
+    uploaded_cvs, _ = get_uploaded_cvs_page_for_user(user_email, 1)
     if not uploaded_cvs:
         return {
             "skills": [],
@@ -1684,6 +1272,38 @@ def get_latest_cv_data(user_email: str) -> dict:
         "text_preview": latest.get("text_preview", ""),
     }
 
+# =========================================================
+# LOCAL JOB MATCHING
+# =========================================================
+_local_job_index = None
+_local_job_index_lock = threading.Lock()
+
+
+def get_local_job_index() -> LocalJobIndex:
+    # Built from job_dataset on first use and again whenever the taxonomy file
+    # changes, since postings are indexed by canonical skill name.
+    global _local_job_index
+
+    taxonomy = get_taxonomy()
+    with _local_job_index_lock:
+        if _local_job_index is None or _local_job_index.fingerprint != taxonomy.fingerprint:
+            start = time.perf_counter()
+            _local_job_index = LocalJobIndex.from_dataset(job_dataset, taxonomy)
+            print(
+                f"[MATCH] Indexed {_local_job_index.size} job postings "
+                f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+            )
+        return _local_job_index
+
+
+def match_local_jobs(skills: list, qualifications: list, top_n: int = 10, query: str = "") -> tuple[list[dict], dict]:
+    jobs, metadata = get_local_job_index().match(skills, qualifications, top_n, query=query)
+    for job in jobs:
+        job["explanation"] = generate_job_explanation(job["matched_skills"], job["missing_skills"])
+    metadata["source"] = "Dataset"
+    return jobs, metadata
+
+
 # =========================================================
 # ADZUNA HELPERS
 # =========================================================
@@ -1700,99 +1320,28 @@ def build_search_query_from_skills(skills: list[str], career_target: str = "") -
         if career_target in mapping:
             return mapping[career_target]
 
-    lowered_skills = [str(skill).lower().strip() for skill in skills]
-
-    if any(
-        skill in lowered_skills
-        for skill in ["python", "sql", "data analysis", "data analytics", "power bi", "machine learning"]
-    ):
-        return "data analyst"
-
-    if any(
-        skill in lowered_skills
-        for skill in ["react", "javascript", "typescript", "html", "css", "ui", "ux", "figma"]
-    ):
-        return "frontend developer"
-
-    if any(
-        skill in lowered_skills
-        for skill in ["aws", "azure", "cloud", "docker", "kubernetes", "terraform", "devops"]
-    ):
-        return "cloud engineer"
+    # Each taxonomy skill lists the roles it points to; the first role in
+    # role_priority that any of the user's skills maps to wins.
+    return get_taxonomy().best_role(skills) or "software engineer"
 
-    if any(
-        skill in lowered_skills
-        for skill in ["django", "flask", "java", "node.js", "c#", "c++"]
-    ):
-        return "software engineer"
 
-    return "software engineer"
+def adzuna_job_text(job: dict) -> tuple[str, str, str, str]:
+    # (title, description, category, lower-cased text the skills are found in)
+    title = job.get("title") or "Untitled role"
+    description = job.get("description") or ""
+    category = ((job.get("category") or {}).get("label", "") or "").replace(" Jobs", "")
+    return title, description, category, f"{title} {description} {category}".lower()
 
 
 def normalize_adzuna_job(job: dict, user_skills: list[str], user_quals: list[str]) -> dict:
-    title = job.get("title") or "Untitled role"
+    title, description, category, combined_text = adzuna_job_text(job)
     company = (job.get("company") or {}).get("display_name", "")
     location = (job.get("location") or {}).get("display_name", "")
-    description = job.get("description") or ""
-    category = ((job.get("category") or {}).get("label", "") or "").replace(" Jobs", "")
     redirect_url = job.get("redirect_url") or ""
 
-    combined_text = f"{title} {description} {category}".lower()
-
-    normalized_user_skills = [str(skill).lower().strip() for skill in user_skills]
-    normalized_user_quals = [str(q).lower().strip() for q in user_quals]
-
-    matched_skills = []
-    for skill in normalized_user_skills:
-        if skill and skill in combined_text:
-            matched_skills.append(skill)
-
-    missing_skills = []
-    for skill in SKILL_KEYWORDS:
-        skill_lower = skill.lower()
-        if skill_lower in combined_text and skill_lower not in normalized_user_skills:
-            missing_skills.append(skill)
-
-    missing_qualifications = []
-    for qual in QUALIFICATION_KEYWORDS:
-        qual_lower = qual.lower()
-        if qual_lower in combined_text and qual_lower not in normalized_user_quals:
-            missing_qualifications.append(qual)
-
-    title_bonus = 0
-    title_lower = title.lower()
-
-    if "data" in title_lower and any(
-        x in normalized_user_skills for x in ["python", "sql", "data analysis", "data analytics", "power bi"]
-    ):
-        title_bonus += 2
-
-    if "frontend" in title_lower and any(
-        x in normalized_user_skills for x in ["react", "javascript", "typescript", "html", "css"]
-    ):
-        title_bonus += 2
-
-    if "cloud" in title_lower and any(
-        x in normalized_user_skills for x in ["aws", "azure", "cloud", "docker", "kubernetes"]
-    ):
-        title_bonus += 2
-
-    if "software" in title_lower or "engineer" in title_lower:
-        if any(x in normalized_user_skills for x in ["java", "python", "flask", "django", "node.js"]):
-            title_bonus += 2
-
-    skill_score = len(matched_skills)
-    qual_score = sum(1 for q in normalized_user_quals if q and q in combined_text)
-    total_score = (skill_score * 2) + qual_score + title_bonus
-
-    total_relevant = len(matched_skills) + len(missing_skills)
-    match_percentage = (
-        round((len(matched_skills) / total_relevant) * 100)
-        if total_relevant > 0 else 15
-    )
-
-    if title_bonus > 0 and match_percentage < 35:
-        match_percentage = 35
+    scores = score_job(combined_text, title, get_taxonomy(), user_skills, user_quals)
+    matched_skills = scores["matched_skills"]
+    missing_skills = scores["missing_skills"]
 
     explanation = generate_job_explanation(matched_skills, missing_skills)
 
@@ -1807,17 +1356,208 @@ def normalize_adzuna_job(job: dict, user_skills: list[str], user_quals: list[str
         "description": description[:500],
         "apply_url": redirect_url,
         "redirect_url": redirect_url,
-        "total_score": total_score,
-        "skill_score": skill_score,
-        "qual_score": qual_score,
-        "match_percentage": match_percentage,
+        "total_score": scores["total_score"],
+        "skill_score": scores["skill_score"],
+        "qual_score": scores["qual_score"],
+        "match_percentage": scores["match_percentage"],
         "matched_skills": matched_skills,
         "missing_skills": missing_skills[:8],
-        "missing_qualifications": missing_qualifications[:5],
+        "missing_qualifications": scores["missing_qualifications"][:5],
         "explanation": explanation,
     }
 
 
+ADZUNA_TARGET_JOBS = 20
+
+_adzuna_http = None
+_adzuna_http_lock = threading.Lock()
+_adzuna_fan_out = None
+_adzuna_fan_out_lock = threading.Lock()
+
+
+def get_adzuna_http() -> HttpClient:
+    global _adzuna_http
+
+    with _adzuna_http_lock:
+        if _adzuna_http is None:
+            _adzuna_http = HttpClient(
+                pool_connections=ADZUNA_POOL_CONNECTIONS,
+                pool_maxsize=ADZUNA_POOL_MAXSIZE,
+                connect_timeout=ADZUNA_CONNECT_TIMEOUT,
+                read_timeout=ADZUNA_READ_TIMEOUT,
+            )
+            atexit.register(_adzuna_http.close)
+        return _adzuna_http
+
+
+def get_adzuna_fan_out() -> QueryFanOut:
+    global _adzuna_fan_out
+
+    with _adzuna_fan_out_lock:
+        if _adzuna_fan_out is None:
+            _adzuna_fan_out = QueryFanOut(workers=ADZUNA_FANOUT_WORKERS, width=ADZUNA_FANOUT_WIDTH)
+            atexit.register(_adzuna_fan_out.close, False)
+        return _adzuna_fan_out
+
+
+_adzuna_cache = None
+_adzuna_cache_lock = threading.Lock()
+_adzuna_guard_lock = threading.Lock()
+_adzuna_rate_limiter = None
+_adzuna_breaker = None
+
+
+def adzuna_cache_path() -> str:
+    return ADZUNA_CACHE_PATH or os.path.join(BASE_DIR, "adzuna_cache.db")
+
+
+def get_adzuna_guards() -> tuple[TokenBucket, CircuitBreaker]:
+    global _adzuna_rate_limiter, _adzuna_breaker
+
+    with _adzuna_guard_lock:
+        if _adzuna_rate_limiter is None:
+            if ADZUNA_RATE_LIMIT_BACKEND == "sqlite":
+                _adzuna_rate_limiter = SQLiteTokenBucket(
+                    adzuna_cache_path(),
+                    per_minute=ADZUNA_RATE_LIMIT_PER_MINUTE,
+                    burst=ADZUNA_RATE_LIMIT_BURST,
+                )
+            else:
+                _adzuna_rate_limiter = TokenBucket(
+                    per_minute=ADZUNA_RATE_LIMIT_PER_MINUTE,
+                    burst=ADZUNA_RATE_LIMIT_BURST,
+                )
+            _adzuna_breaker = CircuitBreaker(
+                failure_threshold=ADZUNA_BREAKER_FAILURES,
+                reset_seconds=ADZUNA_BREAKER_RESET_SECONDS,
+            )
+        return _adzuna_rate_limiter, _adzuna_breaker
+
+
+def adzuna_get(url: str, params: dict, timeout=None):
+    limiter, breaker = get_adzuna_guards()
+    return guarded_get(
+        get_adzuna_http(),
+        url,
+        params,
+        limiter,
+        breaker,
+        rate_limit_wait=ADZUNA_RATE_LIMIT_WAIT_SECONDS,
+        timeout=timeout,
+    )
+
+
+def get_adzuna_cache() -> Optional[SearchCache]:
+    global _adzuna_cache
+
+    with _adzuna_cache_lock:
+        if _adzuna_cache is None:
+            if ADZUNA_CACHE_BACKEND == "memory":
+                store = MemorySearchStore(max_entries=ADZUNA_CACHE_MAX_ENTRIES)
+            elif ADZUNA_CACHE_BACKEND == "sqlite":
+                store = SQLiteSearchStore(
+                    adzuna_cache_path(),
+                    max_entries=ADZUNA_CACHE_MAX_ENTRIES,
+                )
+            else:
+                return None
+
+            _adzuna_cache = SearchCache(
+                store,
+                ttl_seconds=ADZUNA_CACHE_TTL_SECONDS,
+                stale_seconds=ADZUNA_CACHE_STALE_SECONDS,
+            )
+            atexit.register(_adzuna_cache.close)
+        return _adzuna_cache
+
+
+_adzuna_job_index = None
+_adzuna_job_index_lock = threading.Lock()
+
+
+def get_adzuna_job_index() -> AdzunaJobIndex:
+    global _adzuna_job_index
+
+    with _adzuna_job_index_lock:
+        if _adzuna_job_index is None:
+            _adzuna_job_index = AdzunaJobIndex(max_jobs=ADZUNA_JOB_INDEX_MAX_JOBS)
+        return _adzuna_job_index
+
+
+def adzuna_relevance(jobs: list[dict], query: str):
+    # BM25 relevance of each job to query, with term weights from every
+    # Adzuna job this process holds rather than from this search alone.
+    taxonomy = get_taxonomy()
+    index = get_adzuna_job_index()
+
+    ids = []
+    texts = []
+    for job in jobs:
+        title, _, _, text = adzuna_job_text(job)
+        job_id = str(job["id"]) if job.get("id") is not None else None
+        index.features(job_id, title, text, taxonomy)
+        ids.append(job_id)
+        texts.append(text)
+    return index.relevance(ids, texts, query)
+
+
+def rank_adzuna_jobs(jobs: list[dict], skills: list[str], qualifications: list[str]) -> list[int]:
+    # Positions of the best ADZUNA_TARGET_JOBS jobs, best first, ordered
+    # like normalize_adzuna_job's scores with ties to the earlier job.
+    # Only jobs sharing a term with the CV (or containing one of its
+    # aliases / unknown entries) are scored; the rest match nothing.
+    taxonomy = get_taxonomy()
+    index = get_adzuna_job_index()
+
+    texts = [adzuna_job_text(job) for job in jobs]
+    ids = [str(job["id"]) if job.get("id") is not None else None for job in jobs]
+    features = [
+        index.features(job_id, title, text, taxonomy)
+        for job_id, (title, _, _, text) in zip(ids, texts)
+    ]
+
+    skills = [s for s in (str(skill).lower().strip() for skill in skills) if s]
+    quals = [q for q in (str(q).lower().strip() for q in qualifications) if q]
+    user_skill_set = {taxonomy.skills.canonical(skill) for skill in skills}
+    user_qual_set = {taxonomy.qualifications.canonical(q) for q in quals}
+    # Entries other than canonical taxonomy names also match by substring.
+    loose = [
+        entry
+        for entries, names in ((skills, taxonomy.skills), (quals, taxonomy.qualifications))
+        for entry in entries
+        if names.canonical(entry) != entry or entry not in names.categories
+    ]
+
+    shared = index.candidates(user_terms(user_skill_set, user_qual_set), {i for i in ids if i is not None})
+    candidates = [
+        pos for pos, (job_id, text) in enumerate(zip(ids, texts))
+        if job_id is None or job_id in shared or any(entry in text[3] for entry in loose)
+    ]
+
+    percentage = [0 if features[pos][0] else 15 for pos in range(len(jobs))]
+    total = [0] * len(jobs)
+    matched = [0] * len(jobs)
+    if candidates:
+        batch = JobBatch(
+            [texts[pos][3] for pos in candidates],
+            [texts[pos][0] for pos in candidates],
+            taxonomy,
+            job_skills=[features[pos][0] for pos in candidates],
+            job_quals=[features[pos][1] for pos in candidates],
+        )
+        scores = batch.score(skills, quals)
+        for row, pos in enumerate(candidates):
+            percentage[pos] = int(scores["match_percentage"][row])
+            total[pos] = int(scores["total_score"][row])
+            matched[pos] = int(scores["skill_score"][row])
+
+    return heapq.nlargest(
+        ADZUNA_TARGET_JOBS,
+        range(len(jobs)),
+        key=lambda pos: (percentage[pos], total[pos], matched[pos], -pos),
+    )
+
+
 def search_live_jobs_adzuna(
     skills: list[str],
     qualifications: list[str],
@@ -1825,9 +1565,13 @@ def search_live_jobs_adzuna(
     page: int = 1,
     results_per_page: int = 20,
     career_target: str = "",
+    rank_query: str = "",
 ):
+    # With a rank_query (the CV text) the jobs are ranked by BM25 relevance to
+    # it instead of skill match, with term weights from every Adzuna job the
+    # process holds (see adzuna_relevance).
     if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
-        raise RuntimeError("Adzuna API credentials are missing.")
+        raise AdzunaUnavailable("Adzuna API credentials are missing.")
 
     primary_query = build_search_query_from_skills(skills, career_target=career_target)
 
@@ -1847,11 +1591,7 @@ def search_live_jobs_adzuna(
             seen_queries.append(query)
             unique_queries.append(query)
 
-    seen_ids = set()
-    combined_jobs = []
-    total_results_seen = 0
-
-    for query_text in unique_queries:
+    def fetch_raw(query_text: str) -> list[dict]:
         url = f"https://api.adzuna.com/v1/api/jobs/{ADZUNA_COUNTRY}/search/{page}"
         params = {
             "app_id": ADZUNA_APP_ID,
@@ -1864,39 +1604,77 @@ def search_live_jobs_adzuna(
         if where:
             params["where"] = where
 
-        response = requests.get(url, params=params, timeout=30)
+        response = adzuna_get(url, params)
         response.raise_for_status()
         payload = response.json()
 
         raw_jobs = payload.get("results", [])
-        total_results_seen += len(raw_jobs)
-
         print(f"[ADZUNA] query='{query_text}' returned {len(raw_jobs)} raw jobs")
+        return raw_jobs
 
-        normalized_jobs = [
-            normalize_adzuna_job(job, skills, qualifications)
-            for job in raw_jobs
-        ]
-
-        for job in normalized_jobs:
-            unique_id = job.get("external_job_id") or job.get("job_id")
-            if unique_id and unique_id not in seen_ids:
-                seen_ids.add(unique_id)
-                combined_jobs.append(job)
-
-        if len(combined_jobs) >= 20:
-            break
-
-    combined_jobs.sort(
-        key=lambda j: (
-            j.get("match_percentage", 0),
-            j.get("total_score", 0),
-            len(j.get("matched_skills", [])),
-        ),
-        reverse=True,
-    )
+    degraded = []
+    unavailable = []
+
+    def fetch(query_text: str) -> list[dict]:
+        # While Adzuna is unavailable a search falls back to its last cached
+        # results however old they are, or to nothing, so the other queries
+        # can still fill the list.
+        cache = get_adzuna_cache()
+        key = search_key(ADZUNA_COUNTRY, query_text, where, page, results_per_page)
+        try:
+            if cache is None:
+                return fetch_raw(query_text)
+            return cache.get(key, lambda: fetch_raw(query_text))
+        except AdzunaUnavailable as e:
+            entry = cache.peek(key) if cache else None
+            if entry is None:
+                print(f"[ADZUNA] query='{query_text}' skipped: {e}")
+                unavailable.append(str(e))
+                return []
+
+            print(f"[ADZUNA] query='{query_text}' served from cache ({time.time() - entry[1]:.0f}s old): {e}")
+            degraded.append(query_text)
+            return entry[0]
+
+    seen_ids = set()
+    combined_jobs = []
+    total_results_seen = 0
 
-    top_jobs = combined_jobs[:20]
+    # Raw jobs are deduplicated by Adzuna id, scored together, and only the
+    # ones that make the cut are normalized.
+    results = get_adzuna_fan_out().results(unique_queries, fetch)
+    try:
+        for query_text, raw_jobs in results:
+            total_results_seen += len(raw_jobs)
+
+            for job in raw_jobs:
+                unique_id = str(job.get("id"))
+                if unique_id not in seen_ids:
+                    seen_ids.add(unique_id)
+                    combined_jobs.append(job)
+
+            if len(combined_jobs) >= ADZUNA_TARGET_JOBS:
+                break
+    finally:
+        results.close()
+
+    if not combined_jobs and unavailable:
+        raise AdzunaUnavailable(unavailable[0])
+
+    if rank_query:
+        relevance = adzuna_relevance(combined_jobs, rank_query)
+        best = heapq.nlargest(
+            ADZUNA_TARGET_JOBS,
+            range(len(combined_jobs)),
+            key=lambda pos: (relevance[pos], -pos),
+        )
+    else:
+        best = rank_adzuna_jobs(combined_jobs, skills, qualifications)
+
+    top_jobs = [normalize_adzuna_job(combined_jobs[i], skills, qualifications) for i in best]
+    if rank_query:
+        for job, i in zip(top_jobs, best):
+            job["relevance_score"] = round(float(relevance[i]), 4)
 
     print(f"[ADZUNA] returning {len(top_jobs)} jobs to frontend")
 
@@ -1912,6 +1690,8 @@ def search_live_jobs_adzuna(
             ),
             "page": page,
             "results_per_page": results_per_page,
+            "degraded": bool(degraded or unavailable),
+            "rank_mode": "relevance" if rank_query else "match",
         },
     }
 
@@ -1919,124 +1699,22 @@ def search_live_jobs_adzuna(
 # PROFILE ANALYTICS
 # =========================================================
 def build_profile_analytics(saved_jobs: list, uploaded_cvs: list, applications: list):
-    skill_counter = {}
-    qualification_counter = {}
-    missing_skill_counter = {}
-    role_counter = {}
-    industry_counter = {}
-    status_counter = {}
-
-    total_match_rate = 0
-    strong_matches = 0
-    good_matches = 0
-    weak_matches = 0
-
-    for cv in uploaded_cvs:
-        for skill in cv.get("skills", []):
-            key = str(skill).strip().lower()
-            if key:
-                skill_counter[key] = skill_counter.get(key, 0) + 1
-
-        for qual in cv.get("qualifications", []):
-            key = str(qual).strip().lower()
-            if key:
-                qualification_counter[key] = qualification_counter.get(key, 0) + 1
-
-    for job in saved_jobs:
-        match_percentage = int(job.get("match_percentage", 0) or 0)
-        total_match_rate += match_percentage
-
-        if match_percentage >= 80:
-            strong_matches += 1
-        elif match_percentage >= 50:
-            good_matches += 1
-        else:
-            weak_matches += 1
-
-        role_name = job.get("title") or job.get("job_title") or "Untitled role"
-        role_counter[role_name] = role_counter.get(role_name, 0) + 1
-
-        industry_name = job.get("industry") or ""
-        if industry_name:
-            industry_counter[industry_name] = industry_counter.get(industry_name, 0) + 1
-
-        for missing_skill in job.get("missing_skills", []):
-            key = str(missing_skill).strip().lower()
-            if key:
-                missing_skill_counter[key] = missing_skill_counter.get(key, 0) + 1
-
-    for application in applications:
-        status = str(application.get("status", "Applied"))
-        status_counter[status] = status_counter.get(status, 0) + 1
-
-    all_extracted_skills = [
-        skill for skill, _ in sorted(
-            skill_counter.items(),
-            key=lambda x: (-x[1], x[0])
-        )
-    ]
-
-    all_extracted_qualifications = [
-        qualification for qualification, _ in sorted(
-            qualification_counter.items(),
-            key=lambda x: (-x[1], x[0])
-        )
-    ]
-
-    top_missing_skills = [
-        {"skill": skill, "count": count}
-        for skill, count in sorted(
-            missing_skill_counter.items(),
-            key=lambda x: (-x[1], x[0])
-        )[:5]
-    ]
-
-    role_breakdown = [
-        {"name": name, "count": count}
-        for name, count in sorted(
-            role_counter.items(),
-            key=lambda x: (-x[1], x[0])
-        )[:5]
-    ]
-
-    application_status_breakdown = [
-        {"name": name, "count": count}
-        for name, count in sorted(
-            status_counter.items(),
-            key=lambda x: (-x[1], x[0])
-        )
-    ]
+    return summarize_analytics(count_profile(saved_jobs, uploaded_cvs, applications))
 
-    best_fit_role = role_breakdown[0]["name"] if role_breakdown else ""
-    best_fit_industry = (
-        sorted(industry_counter.items(), key=lambda x: (-x[1], x[0]))[0][0]
-        if industry_counter else ""
-    )
-
-    average_match_rate = round(total_match_rate / len(saved_jobs)) if saved_jobs else 0
 
-    return {
-        "all_extracted_skills": all_extracted_skills,
-        "all_extracted_qualifications": all_extracted_qualifications,
-        "analytics": {
-            "average_match_rate": average_match_rate,
-            "saved_jobs_count": len(saved_jobs),
-            "uploaded_cv_count": len(uploaded_cvs),
-            "applications_count": len(applications),
-            "applied_jobs_count": len(applications),
-            "interviewing_count": len([a for a in applications if a.get("status") == "Interviewing"]),
-            "offer_count": len([a for a in applications if a.get("status") == "Offer"]),
-            "rejected_count": len([a for a in applications if a.get("status") == "Rejected"]),
-            "strong_matches": strong_matches,
-            "good_matches": good_matches,
-            "weak_matches": weak_matches,
-            "top_missing_skills": top_missing_skills,
-            "role_breakdown": role_breakdown,
-            "application_status_breakdown": application_status_breakdown,
-            "best_fit_role": best_fit_role,
-            "best_fit_industry": best_fit_industry,
-        },
-    }
+def get_profile_analytics(
+    user_email: str,
+    saved_jobs: Optional[list] = None,
+    uploaded_cvs: Optional[list] = None,
+    applications: Optional[list] = None,
+):
+    # Without the full lists (the lite profile) the Python engine has
+    # nothing to count, so the summary counters stand in for it.
+    if ANALYTICS_ENGINE == "sql":
+        return summarize_analytics(aggregate_user_analytics_for_user(user_email))
+    if ANALYTICS_ENGINE == "summary" or saved_jobs is None:
+        return summarize_analytics(get_user_analytics_for_user(user_email))
+    return build_profile_analytics(saved_jobs, uploaded_cvs, applications)
 
 # =========================================================
 # EMAIL HELPERS
@@ -2253,7 +1931,15 @@ def run_scheduled_email_alerts():
 # =========================================================
 @app.route("/health", methods=["GET"])
 def health():
-    return jsonify({"status": "ok", "db_mode": DB_MODE}), 200
+    limiter, breaker = get_adzuna_guards()
+    return jsonify({
+        "status": "ok",
+        "db_mode": DB_MODE,
+        "adzuna": {
+            "circuit": breaker.stats(),
+            "rate_limit": limiter.stats(),
+        },
+    }), 200
 
 
 @app.route("/api/debug-db-mode", methods=["GET"])
@@ -2261,6 +1947,17 @@ def debug_db_mode():
     return jsonify({
         "db_mode": DB_MODE,
         "sqlite_path": SQLITE_PATH,
+        "db_pool": get_db_pool().stats(),
+        "sqlite_write_queue": sqlite_write_queue.stats() if sqlite_write_queue else None,
+        "cv_parse_cache": get_cv_cache().stats() if CV_CACHE_ENABLED else None,
+        "cv_upload_jobs": _cv_job_queue.stats() if _cv_job_queue else None,
+        "blob_uploads": _blob_uploader.stats() if _blob_uploader else None,
+        "adzuna_fan_out": _adzuna_fan_out.stats() if _adzuna_fan_out else None,
+        "adzuna_http": _adzuna_http.stats() if _adzuna_http else None,
+        "adzuna_cache": _adzuna_cache.stats() if _adzuna_cache else None,
+        "adzuna_job_index": _adzuna_job_index.stats() if _adzuna_job_index else None,
+        "local_job_index": _local_job_index.stats() if _local_job_index else None,
+        "job_dataset": job_dataset.stats() if job_dataset is not None else None,
     }), 200
 
 
@@ -2280,7 +1977,7 @@ def test_adzuna():
     }
 
     try:
-        response = requests.get(url, params=params, timeout=20)
+        response = adzuna_get(url, params, timeout=(ADZUNA_CONNECT_TIMEOUT, 20))
         response.raise_for_status()
         return jsonify(response.json()), 200
     except Exception as e:
@@ -2299,7 +1996,7 @@ def test_adzuna_raw():
             "content-type": "application/json",
         }
 
-        response = requests.get(url, params=params, timeout=30)
+        response = adzuna_get(url, params)
         response.raise_for_status()
         payload = response.json()
 
@@ -2499,6 +2196,19 @@ def test_send_job_alert():
         return jsonify({"error": f"Could not send email alert: {str(e)}"}), 500
 
 
+@app.errorhandler(413)
+def upload_too_large(e):
+    limit_mb = BULK_INGEST_MAX_MB if request.path == "/api/admin/bulk-cvs" else CV_UPLOAD_MAX_MB
+    return jsonify({"error": f"Upload is larger than {limit_mb:g} MB"}), 413
+
+
+def wants_async_upload() -> bool:
+    value = request.args.get("async", request.form.get("async"))
+    if value is None:
+        return CV_UPLOAD_ASYNC
+    return value.lower() in ("1", "true", "yes")
+
+
 @app.route("/api/upload-cv", methods=["POST"])
 @jwt_required()
 def upload_and_parse_cv():
@@ -2511,52 +2221,103 @@ def upload_and_parse_cv():
     if file.filename == "":
         return jsonify({"error": "Empty filename"}), 400
 
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    filename = f"{timestamp}-{file.filename}"
+    data = file.read()
 
-    save_path = os.path.join(UPLOAD_FOLDER, filename)
-    file.save(save_path)
+    if wants_async_upload():
+        try:
+            job_id = enqueue_cv_upload(user_email, data, file.filename)
+        except ExtractionLimit as e:
+            return jsonify({"error": str(e)}), 413
+        except QueueFull:
+            return jsonify({"error": "Too many CV uploads in progress, try again shortly"}), 503
 
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext == ".pdf":
-        text = extract_text_from_pdf(save_path)
-    elif ext == ".docx":
-        text = extract_text_from_docx(save_path)
-    else:
-        text = extract_text_generic(save_path)
+        return jsonify({
+            "message": "CV upload queued",
+            "job_id": job_id,
+            "status": JOB_QUEUED,
+            "status_url": f"/api/upload-cv/{job_id}",
+        }), 202
 
-    text = clean_extracted_text(text)
-    skills = extract_skills(text)
-    qualifications = extract_qualifications(text)
-    preview = text[:1200] if text else ""
+    try:
+        return jsonify(process_cv_upload(user_email, data, file.filename)), 201
+    except ExtractionLimit as e:
+        return jsonify({"error": str(e)}), 413
+    except ParseFailed as e:
+        return jsonify({"error": f"{e}, try again shortly"}), 503
 
-    blob_url = upload_cv_to_azure(save_path, filename)
 
-    save_cv_for_user(
-        user_email=user_email,
-        original_name=file.filename,
-        stored_filename=filename,
-        azure_blob_url=blob_url,
-        skills=skills,
-        qualifications=qualifications,
-        text_preview=preview,
-    )
+@app.route("/api/upload-cv/<job_id>", methods=["GET"])
+@jwt_required()
+def get_cv_upload_status(job_id):
+    job = get_cv_upload_job(get_jwt_identity(), job_id)
+    if job is None:
+        return jsonify({"error": "Upload job not found"}), 404
 
+    return jsonify(job), 200
+
+
+@app.route("/api/admin/bulk-cvs", methods=["POST"])
+@jwt_required()
+def bulk_ingest_cvs():
+    if get_jwt_identity().lower() not in BULK_INGEST_ADMINS:
+        return jsonify({"error": "Bulk CV ingestion is limited to BULK_INGEST_ADMINS"}), 403
+
+    # A cohort's zip is far bigger than the single-CV limit.
+    request.max_content_length = int(BULK_INGEST_MAX_MB * 1024 * 1024) + 64 * 1024
+
+    if "file" not in request.files:
+        return jsonify({"error": "No zip file provided"}), 400
+
+    file = request.files["file"]
     try:
-        if os.path.exists(save_path):
-            os.remove(save_path)
-    except Exception as e:
-        print("Could not delete temp file:", e)
+        job_id = enqueue_bulk_ingest(
+            get_jwt_identity(),
+            file.stream,
+            file.filename or "bulk-cvs.zip",
+            batch_size=request.args.get("batch_size", type=int),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except QueueFull:
+        return jsonify({"error": "Too many CV jobs in progress, try again shortly"}), 503
 
     return jsonify({
-        "message": "CV uploaded & parsed successfully",
-        "original_name": file.filename,
-        "skills": skills,
-        "qualifications": qualifications,
-        "text_preview": preview,
-        "azure_blob_url": blob_url,
-        "db_mode": DB_MODE,
-    }), 201
+        "message": "Bulk CV ingestion queued",
+        "job_id": job_id,
+        "status": JOB_QUEUED,
+        "status_url": f"/api/admin/bulk-cvs/{job_id}",
+    }), 202
+
+
+@app.route("/api/admin/bulk-cvs/<job_id>", methods=["GET"])
+@jwt_required()
+def get_bulk_ingest_status(job_id):
+    # result holds the per-file report once the job is done.
+    user_email = get_jwt_identity()
+    if user_email.lower() not in BULK_INGEST_ADMINS:
+        return jsonify({"error": "Bulk CV ingestion is limited to BULK_INGEST_ADMINS"}), 403
+
+    job = get_cv_upload_job(user_email, job_id)
+    if job is None:
+        return jsonify({"error": "Bulk ingestion job not found"}), 404
+
+    return jsonify(job), 200
+
+
+def requested_rank_mode(data: dict) -> str:
+    mode = data.get("rank_mode") or request.args.get("rank_mode", "") or JOB_RANK_MODE
+    return str(mode).strip().lower()
+
+
+def relevance_query(user_email: str, data: dict, skills: list, qualifications: list) -> str:
+    # The CV text the client sends, else the text of the user's latest
+    # uploaded CV, else the skills and qualifications themselves.
+    cv_text = data.get("cv_text")
+    if not (isinstance(cv_text, str) and cv_text.strip()):
+        cv_text = get_latest_cv_data(user_email)["text_preview"]
+    if cv_text and cv_text.strip():
+        return clean_extracted_text(cv_text)
+    return " ".join(str(value) for value in list(skills) + list(qualifications))
 
 
 @app.route("/api/live-jobs", methods=["POST"])
@@ -2581,6 +2342,11 @@ def live_jobs():
     if not isinstance(raw_quals, list):
         return jsonify({"error": "qualifications must be a list"}), 400
 
+    rank_mode = requested_rank_mode(data)
+    if rank_mode not in JOB_RANK_MODES:
+        return jsonify({"error": f"rank_mode must be one of: {', '.join(JOB_RANK_MODES)}"}), 400
+    query = relevance_query(user_email, data, raw_skills, raw_quals) if rank_mode == "relevance" else ""
+
     try:
         results = search_live_jobs_adzuna(
             skills=raw_skills,
@@ -2589,14 +2355,99 @@ def live_jobs():
             page=page,
             results_per_page=results_per_page,
             career_target=career_target,
+            rank_query=query,
         )
         results["db_mode"] = DB_MODE
         return jsonify(results), 200
+    except AdzunaUnavailable as e:
+        # Fall back to the local dataset rather than an empty page.
+        print("Adzuna live jobs unavailable, matching local postings:", e)
+        jobs, metadata = match_local_jobs(
+            raw_skills,
+            raw_quals,
+            max(1, min(results_per_page, PAGE_SIZE_MAX)),
+            query=query,
+        )
+        if not jobs:
+            return jsonify({"error": f"Live jobs are temporarily unavailable: {str(e)}"}), 503
+
+        metadata.update({
+            "query_used": build_search_query_from_skills(raw_skills, career_target=career_target),
+            "career_target": career_target,
+            "total_results_returned": metadata["total_jobs_loaded"],
+            "page": 1,
+            "results_per_page": metadata["top_n"],
+            "degraded": True,
+            "fallback_reason": str(e),
+        })
+        return jsonify({"jobs": jobs, "metadata": metadata, "db_mode": DB_MODE}), 200
     except Exception as e:
         print("Adzuna live jobs error:", e)
         return jsonify({"error": f"Could not fetch live jobs: {str(e)}"}), 500
 
 
+@app.route("/api/match-jobs", methods=["POST"])
+@jwt_required()
+def match_jobs():
+    data = request.get_json(silent=True) or {}
+
+    skills = data.get("skills", [])
+    qualifications = data.get("qualifications", [])
+
+    if not isinstance(skills, list):
+        return jsonify({"error": "skills must be a list"}), 400
+
+    if not isinstance(qualifications, list):
+        return jsonify({"error": "qualifications must be a list"}), 400
+
+    try:
+        top_n = int(data.get("top_n", 10) or 10)
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_n must be a number"}), 400
+    top_n = max(1, min(top_n, PAGE_SIZE_MAX))
+
+    rank_mode = requested_rank_mode(data)
+    if rank_mode not in JOB_RANK_MODES:
+        return jsonify({"error": f"rank_mode must be one of: {', '.join(JOB_RANK_MODES)}"}), 400
+    query = relevance_query(get_jwt_identity(), data, skills, qualifications) if rank_mode == "relevance" else ""
+
+    jobs, metadata = match_local_jobs(skills, qualifications, top_n, query=query)
+    return jsonify({"jobs": jobs, "metadata": metadata}), 200
+
+
+def wants_delta_response(data: dict) -> bool:
+    mode = data.get("response_mode") or request.args.get("response_mode", "")
+    return str(mode).strip().lower() == "delta"
+
+
+def delta_response(
+    user_email: str,
+    list_name: str,
+    op: str,
+    item_id: Any,
+    item: Optional[dict],
+    message: str,
+    status_code: int = 200,
+    **extra,
+):
+    # Opt-in alternative to returning the whole list after a write: only the
+    # changed record plus the list version it produced, so the client can
+    # patch its local copy and refetch if it sees a version gap.
+    return jsonify({
+        "message": message,
+        "response_mode": "delta",
+        "change": {
+            "list": list_name,
+            "op": op,
+            "id": item_id,
+            "item": item,
+        },
+        "version": get_list_version_for_user(user_email, list_name),
+        **extra,
+        "db_mode": DB_MODE,
+    }), status_code
+
+
 @app.route("/api/save-job", methods=["POST"])
 @jwt_required()
 def save_job():
@@ -2607,29 +2458,71 @@ def save_job():
     if not isinstance(job, dict):
         return jsonify({"error": "No job provided"}), 400
 
-    saved = save_job_for_user(user_email, job)
-    jobs = get_saved_jobs_by_user(user_email)
+    job_id = saved_job_id(job)
+    saved = save_job_for_user(user_email, job, job_id=job_id)
+    message = "Job saved successfully" if saved else "Job already saved"
+    status_code = 201 if saved else 200
 
-    if not saved:
-        return jsonify({
-            "message": "Job already saved",
-            "saved_jobs": jobs,
-            "db_mode": DB_MODE,
-        }), 200
+    if wants_delta_response(data):
+        return delta_response(
+            user_email,
+            SAVED_JOBS_LIST,
+            op="added" if saved else "unchanged",
+            item_id=job_id,
+            item=job,
+            message=message,
+            status_code=status_code,
+        )
+
+    jobs = get_saved_jobs_by_user(user_email)
 
     return jsonify({
-        "message": "Job saved successfully",
+        "message": message,
         "saved_jobs": jobs,
+        "version": get_list_version_for_user(user_email, SAVED_JOBS_LIST),
         "db_mode": DB_MODE,
-    }), 201
+    }), status_code
+
+
+def page_args() -> tuple[Optional[int], Optional[str]]:
+    # Paging is opt-in: without ?limit= or ?cursor= the list endpoints keep
+    # returning the full list so existing dashboard calls are unaffected.
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor") or None
+
+    if limit is None and cursor is None:
+        return None, None
+
+    try:
+        limit = int(limit) if limit is not None else PAGE_SIZE_DEFAULT
+    except ValueError:
+        raise ValueError("limit must be an integer")
+
+    return max(1, min(limit, PAGE_SIZE_MAX)), cursor
+
+
+def page_fields(next_cursor: Optional[str]) -> dict:
+    return {"next_cursor": next_cursor, "has_more": next_cursor is not None}
 
 
 @app.route("/api/saved-jobs", methods=["GET"])
 @jwt_required()
 def get_saved_jobs():
     user_email = get_jwt_identity()
-    jobs = get_saved_jobs_by_user(user_email)
-    return jsonify({"saved_jobs": jobs, "db_mode": DB_MODE}), 200
+
+    try:
+        limit, cursor = page_args()
+        with db_session():
+            if limit is None:
+                jobs, paging = get_saved_jobs_by_user(user_email), {}
+            else:
+                jobs, next_cursor = get_saved_jobs_page_for_user(user_email, limit, cursor)
+                paging = page_fields(next_cursor)
+            version = get_list_version_for_user(user_email, SAVED_JOBS_LIST)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"saved_jobs": jobs, "version": version, **paging, "db_mode": DB_MODE}), 200
 
 
 @app.route("/api/remove-saved-job", methods=["POST"])
@@ -2642,12 +2535,24 @@ def remove_saved_job():
     if not job_id:
         return jsonify({"error": "job_id is required"}), 400
 
-    remove_saved_job_for_user(user_email, job_id)
+    removed = remove_saved_job_for_user(user_email, job_id)
+
+    if wants_delta_response(data):
+        return delta_response(
+            user_email,
+            SAVED_JOBS_LIST,
+            op="removed" if removed else "unchanged",
+            item_id=str(job_id),
+            item=None,
+            message="Job removed",
+        )
+
     jobs = get_saved_jobs_by_user(user_email)
 
     return jsonify({
         "message": "Job removed",
         "saved_jobs": jobs,
+        "version": get_list_version_for_user(user_email, SAVED_JOBS_LIST),
         "db_mode": DB_MODE,
     }), 200
 
@@ -2666,18 +2571,31 @@ def apply_job():
     if not apply_url:
         return jsonify({"error": "This job has no application URL"}), 400
 
-    save_job_application_for_user(
+    external_job_id = save_job_application_for_user(
         user_email=user_email,
         job=job,
         status="Applied"
     )
 
+    if wants_delta_response(data):
+        application = get_job_application_for_user(user_email, external_job_id=external_job_id)
+        return delta_response(
+            user_email,
+            APPLICATIONS_LIST,
+            op="updated",
+            item_id=application["id"] if application else None,
+            item=application,
+            message="Application recorded",
+            apply_url=apply_url,
+        )
+
     applications = get_job_applications_by_user(user_email)
 
     return jsonify({
         "message": "Application recorded",
         "apply_url": apply_url,
         "applications": applications,
+        "version": get_list_version_for_user(user_email, APPLICATIONS_LIST),
         "db_mode": DB_MODE,
     }), 200
 
@@ -2686,8 +2604,58 @@ def apply_job():
 @jwt_required()
 def get_applications():
     user_email = get_jwt_identity()
+
+    try:
+        limit, cursor = page_args()
+        with db_session():
+            if limit is None:
+                applications, paging = get_job_applications_by_user(user_email), {}
+            else:
+                applications, next_cursor = get_job_applications_page_for_user(user_email, limit, cursor)
+                paging = page_fields(next_cursor)
+            version = get_list_version_for_user(user_email, APPLICATIONS_LIST)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"applications": applications, "version": version, **paging, "db_mode": DB_MODE}), 200
+
+
+@app.route("/api/cv-history", methods=["GET"])
+@jwt_required()
+def get_cv_history():
+    user_email = get_jwt_identity()
+
+    try:
+        limit, cursor = page_args()
+        uploaded_cvs, next_cursor = get_uploaded_cvs_page_for_user(
+            user_email, limit or PAGE_SIZE_DEFAULT, cursor
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"uploaded_cvs": uploaded_cvs, **page_fields(next_cursor), "db_mode": DB_MODE}), 200
+
+
+def application_update_response(user_email: str, data: dict, application_id: int, updated: bool, message: str):
+    if wants_delta_response(data):
+        application = get_job_application_for_user(user_email, application_id=application_id)
+        return delta_response(
+            user_email,
+            APPLICATIONS_LIST,
+            op="updated" if updated else "unchanged",
+            item_id=application_id,
+            item=application,
+            message=message,
+        )
+
     applications = get_job_applications_by_user(user_email)
-    return jsonify({"applications": applications, "db_mode": DB_MODE}), 200
+
+    return jsonify({
+        "message": message,
+        "applications": applications,
+        "version": get_list_version_for_user(user_email, APPLICATIONS_LIST),
+        "db_mode": DB_MODE,
+    }), 200
 
 
 @app.route("/api/update-application-status", methods=["POST"])
@@ -2705,14 +2673,10 @@ def update_application_status():
     if status not in ALLOWED_APPLICATION_STATUSES:
         return jsonify({"error": "Invalid status"}), 400
 
-    update_job_application_status_for_user(user_email, int(application_id), status)
-    applications = get_job_applications_by_user(user_email)
-
-    return jsonify({
-        "message": "Application status updated",
-        "applications": applications,
-        "db_mode": DB_MODE,
-    }), 200
+    updated = update_job_application_status_for_user(user_email, int(application_id), status)
+    return application_update_response(
+        user_email, data, int(application_id), updated, "Application status updated"
+    )
 
 
 @app.route("/api/update-application-notes", methods=["POST"])
@@ -2727,20 +2691,60 @@ def update_application_notes():
     if not application_id:
         return jsonify({"error": "application_id is required"}), 400
 
-    update_job_application_notes_for_user(user_email, int(application_id), notes)
-    applications = get_job_applications_by_user(user_email)
+    updated = update_job_application_notes_for_user(user_email, int(application_id), notes)
+    return application_update_response(
+        user_email, data, int(application_id), updated, "Application notes updated"
+    )
+
+
+@app.route("/api/profile-data", methods=["GET"])
+@jwt_required()
+def profile_data():
+    user_email = get_jwt_identity()
+
+    with db_session():
+        if request.args.get("mode") == "lite":
+            return build_lite_profile_response(user_email)
+        return build_profile_response(user_email)
+
+
+def build_lite_profile_response(user_email: str):
+    # First page of each list plus totals; the dashboard pulls the rest
+    # through the paged list endpoints as the user scrolls.
+    user = get_user_by_email(user_email)
+
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+
+    saved_jobs, saved_cursor = get_saved_jobs_page_for_user(user_email, PAGE_SIZE_DEFAULT)
+    applications, applications_cursor = get_job_applications_page_for_user(user_email, PAGE_SIZE_DEFAULT)
+    uploaded_cvs, cvs_cursor = get_uploaded_cvs_page_for_user(user_email, PAGE_SIZE_DEFAULT)
 
     return jsonify({
-        "message": "Application notes updated",
+        "mode": "lite",
+        "user": {
+            "id": user["id"],
+            "name": user["name"],
+            "email": user["email"],
+        },
+        "counts": {
+            "saved_jobs": count_saved_jobs_for_user(user_email),
+            "applications": count_job_applications_for_user(user_email),
+            "uploaded_cvs": count_uploaded_cvs_for_user(user_email),
+        },
+        "saved_jobs": saved_jobs,
+        "saved_jobs_next_cursor": saved_cursor,
         "applications": applications,
+        "applications_next_cursor": applications_cursor,
+        "uploaded_cvs": uploaded_cvs,
+        "uploaded_cvs_next_cursor": cvs_cursor,
+        "analytics": get_profile_analytics(user_email)["analytics"],
+        "career_target": get_user_career_target(user_email),
         "db_mode": DB_MODE,
     }), 200
 
 
-@app.route("/api/profile-data", methods=["GET"])
-@jwt_required()
-def profile_data():
-    user_email = get_jwt_identity()
+def build_profile_response(user_email: str):
     user = get_user_by_email(user_email)
 
     if not user:
@@ -2752,7 +2756,8 @@ def profile_data():
     career_target = get_user_career_target(user_email)
     email_preferences = get_email_preferences_by_user(user_email)
 
-    profile_bits = build_profile_analytics(
+    profile_bits = get_profile_analytics(
+        user_email,
         saved_jobs=saved_jobs,
         uploaded_cvs=uploaded_cvs,
         applications=applications,
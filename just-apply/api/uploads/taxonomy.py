@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from functools import cached_property
+from typing import Optional
+
+from matcher import KeywordMatcher
+
+# =========================================================
+# SKILL TAXONOMY
+# =========================================================
+# skill_taxonomy.json lists every skill and qualification we recognise: a
+# canonical name, aliases, a category and (for skills) the roles it points
+# to. Each list is compiled once into a KeywordIndex whose matchers read a
+# text in a single pass however many entries there are, and every hit is
+# reported under its canonical name in file order.
+#
+# Canonical names keep the matching rules the hard-coded keyword lists had;
+# aliases only match as whole words so short forms like "js" or "ts" do not
+# fire inside other words. CV matching (find_loose) also treats canonical
+# names of up to SHORT_NAME_MAX characters that way, so "ba" and "ui" are not
+# read out of "database" and "build".
+
+SHORT_NAME_MAX = 2
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+
+
+class KeywordIndex:
+    def __init__(self, entries: list[dict]):
+        self.names: list[str] = []
+        self.categories: dict[str, str] = {}
+        self.roles: dict[str, list[str]] = {}
+        self._canonical: dict[str, str] = {}
+
+        surfaces = []
+        aliases = set()
+
+        for entry in entries:
+            name = str(entry["name"]).strip()
+            if not name:
+                raise ValueError("Taxonomy entry with an empty name")
+
+            self.names.append(name)
+            self.categories[name] = entry.get("category") or ""
+            self.roles[name] = list(entry.get("roles") or [])
+
+            for i, surface in enumerate([name] + list(entry.get("aliases") or [])):
+                key = str(surface).lower().strip()
+                if not key or key in self._canonical:
+                    raise ValueError(f"'{surface}' is empty or appears more than once in the taxonomy")
+                self._canonical[key] = name
+                surfaces.append(key)
+                if i > 0:
+                    aliases.add(key)
+
+        self._rank = {name: i for i, name in enumerate(self.names)}
+        self._surfaces = surfaces
+        self._aliases = aliases
+        self._text = KeywordMatcher(surfaces, whole_word=aliases)
+
+    # The other matchers are compiled on first use; most processes only
+    # ever need one or two of them.
+    @cached_property
+    def _short_names(self) -> set:
+        return {name.lower() for name in self.names if len(name) <= SHORT_NAME_MAX}
+
+    @cached_property
+    def _loose(self) -> KeywordMatcher:
+        return KeywordMatcher(
+            [name.lower() for name in self.names if name.lower() not in self._short_names],
+            ignore_spaces=True,
+        )
+
+    @cached_property
+    def _loose_words(self) -> KeywordMatcher:
+        words = self._aliases | self._short_names
+        return KeywordMatcher(sorted(words), whole_word=words)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _ordered(self, surfaces) -> list[str]:
+        names = {self._canonical[surface] for surface in surfaces}
+        return sorted(names, key=self._rank.__getitem__)
+
+    def canonical(self, value: str) -> str:
+        key = str(value).lower().strip()
+        return self._canonical.get(key, key)
+
+    def find(self, text: str) -> list[str]:
+        # Substring matching over lower-cased text (job descriptions).
+        return self._ordered(self._text.find(str(text or "").lower()))
+
+    def find_loose(self, text: str) -> list[str]:
+        # Space-insensitive matching for text pulled out of broken PDFs (CVs).
+        text = str(text or "").lower()
+        return self._ordered(self._loose.find(text) + self._loose_words.find(text))
+
+    def best_role(self, skills: list[str], priority: list[str]) -> str:
+        roles = {role for skill in skills for role in self.roles.get(self.canonical(skill), [])}
+        for role in priority:
+            if role in roles:
+                return role
+        return ""
+
+
+class Taxonomy:
+    def __init__(self, data: dict, source: str = "", fingerprint: str = ""):
+        # fingerprint identifies the file contents, so anything cached from
+        # an extraction (see cv_cache.py) can tell when it is stale.
+        self.source = source
+        self.fingerprint = fingerprint
+        self.role_priority = list(data.get("role_priority") or [])
+        self.skills = KeywordIndex(data.get("skills") or [])
+        self.qualifications = KeywordIndex(data.get("qualifications") or [])
+        self.loaded_at = time.time()
+
+    def best_role(self, skills: list[str]) -> str:
+        return self.skills.best_role(skills, self.role_priority)
+
+    def stats(self) -> dict:
+        return {
+            "source": self.source,
+            "fingerprint": self.fingerprint,
+            "skills": len(self.skills),
+            "qualifications": len(self.qualifications),
+            "loaded_at": self.loaded_at,
+        }
+
+
+def load_taxonomy(path: str) -> Taxonomy:
+    with open(path, "rb") as f:
+        raw = f.read()
+    fingerprint = hashlib.sha256(raw).hexdigest()[:16]
+    return Taxonomy(json.loads(raw.decode("utf-8")), source=path, fingerprint=fingerprint)
+
+
+class TaxonomyStore:
+    # Hands out the compiled taxonomy and, at most every reload_seconds,
+    # checks the file's mtime and recompiles it when it has changed. Each
+    # gunicorn worker reloads on its own, so editing the file takes effect
+    # without a restart. A broken edit is logged and the previous taxonomy
+    # stays in use.
+    def __init__(self, path: str = DEFAULT_TAXONOMY_PATH, reload_seconds: float = 30):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._taxonomy: Optional[Taxonomy] = None
+        self._mtime = None
+        self._checked = 0.0
+
+    def get(self) -> Taxonomy:
+        taxonomy = self._taxonomy
+        if taxonomy is not None and (
+            self.reload_seconds < 0 or time.monotonic() - self._checked < self.reload_seconds
+        ):
+            return taxonomy
+
+        with self._lock:
+            self._refresh()
+        return self._taxonomy
+
+    def reload(self) -> Taxonomy:
+        with self._lock:
+            self._mtime = None
+            self._refresh()
+        return self._taxonomy
+
+    def _refresh(self):
+        self._checked = time.monotonic()
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            if self._taxonomy is None:
+                raise
+            print(f"[TAXONOMY] Cannot stat {self.path}, keeping current taxonomy: {e}")
+            return
+
+        if self._taxonomy is not None and mtime == self._mtime:
+            return
+
+        try:
+            taxonomy = load_taxonomy(self.path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if self._taxonomy is None:
+                raise
+            print(f"[TAXONOMY] Reload failed, keeping current taxonomy: {e}")
+            return
+
+        self._taxonomy = taxonomy
+        self._mtime = mtime
+        print(
+            f"[TAXONOMY] Loaded {len(taxonomy.skills)} skills and "
+            f"{len(taxonomy.qualifications)} qualifications from {self.path}"
+        )
+
+
+_store = TaxonomyStore()
+
+
+def configure_taxonomy(path: str, reload_seconds: float) -> TaxonomyStore:
+    global _store
+    _store = TaxonomyStore(path, reload_seconds)
+    return _store
+
+
+def get_taxonomy() -> Taxonomy:
+    return _store.get()
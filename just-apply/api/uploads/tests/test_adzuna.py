@@ -0,0 +1,220 @@
+import threading
+import time
+
+import pytest
+
+import adzuna
+from adzuna import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    QueryFanOut,
+    SQLiteTokenBucket,
+    TokenBucket,
+)
+
+QUERIES = ["primary", "a", "b", "c", "d", "e"]
+
+
+class Recorder:
+    def __init__(self, delay: float = 0.02, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.sent = []
+        self.live = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, query: str) -> str:
+        with self._lock:
+            self.sent.append(query)
+            self.live += 1
+            self.peak = max(self.peak, self.live)
+        time.sleep(self.delay)
+        with self._lock:
+            self.live -= 1
+        if query in self.fail:
+            raise RuntimeError(query)
+        return query.upper()
+
+
+@pytest.fixture
+def fan_out():
+    pool = QueryFanOut(workers=4, width=2)
+    yield pool
+    pool.close()
+
+
+def test_results_in_order_within_width(fan_out):
+    fetch = Recorder()
+    assert list(fan_out.results(QUERIES, fetch)) == [(q, q.upper()) for q in QUERIES]
+    assert fetch.peak <= 2
+    assert fan_out.stats()["queries_sent"] == len(QUERIES)
+
+
+def test_primary_alone_sends_one_query(fan_out):
+    fetch = Recorder()
+    results = fan_out.results(QUERIES, fetch)
+    assert next(results) == ("primary", "PRIMARY")
+    results.close()
+
+    assert fetch.sent == ["primary"]
+    assert fan_out.stats()["queries_cancelled"] == len(QUERIES) - 1
+
+
+def test_primary_does_not_wait_for_a_busy_pool():
+    pool = QueryFanOut(workers=1, width=1)
+    release = threading.Event()
+    pool._executor.submit(release.wait)
+    try:
+        start = time.perf_counter()
+        results = pool.results(QUERIES, Recorder(delay=0))
+        assert next(results) == ("primary", "PRIMARY")
+        assert time.perf_counter() - start < 0.5
+        results.close()
+    finally:
+        release.set()
+        pool.close()
+
+
+def test_failure_raised_in_turn(fan_out):
+    fetch = Recorder(fail={"b"})
+    seen = []
+    with pytest.raises(RuntimeError, match="b"):
+        for query, _ in fan_out.results(QUERIES, fetch):
+            seen.append(query)
+
+    assert seen == ["primary", "a"]
+    assert fan_out.stats()["queries_failed"] == 1
+
+
+class FakeClock:
+    # Stands in for the time module inside adzuna; sleep() moves it on.
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(adzuna, "time", fake)
+    return fake
+
+
+def test_bucket_burst_then_refill(clock):
+    bucket = TokenBucket(per_minute=60, burst=3)
+    assert [bucket.acquire(timeout=0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.refused == 1
+
+    clock.now += 1
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+
+    clock.now += 600
+    assert bucket.tokens() == 3
+
+
+def test_bucket_waits_within_timeout(clock):
+    bucket = TokenBucket(per_minute=30, burst=1)
+    assert bucket.acquire(timeout=0)
+
+    start = clock.now
+    assert not bucket.acquire(timeout=1.5)
+    assert bucket.acquire(timeout=2)
+    assert clock.now - start == pytest.approx(2)
+    assert (bucket.granted, bucket.waited, bucket.refused) == (2, 1, 1)
+
+
+def test_bucket_without_limit(clock):
+    bucket = TokenBucket(per_minute=0, burst=1)
+    assert all(bucket.acquire(timeout=0) for _ in range(100))
+
+
+def test_sqlite_bucket_shared_between_instances(clock, tmp_path):
+    path = str(tmp_path / "limits.db")
+    first = SQLiteTokenBucket(path, per_minute=60, burst=2)
+    second = SQLiteTokenBucket(path, per_minute=60, burst=2)
+
+    assert first.acquire(timeout=0)
+    assert second.acquire(timeout=0)
+    assert not first.acquire(timeout=0)
+    assert not second.acquire(timeout=0)
+
+    clock.now += 1.5
+    assert second.tokens() == pytest.approx(1.5)
+    assert first.acquire(timeout=0)
+    assert not second.acquire(timeout=0)
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure("timeout")
+    assert breaker.state() == BREAKER_CLOSED
+
+    breaker.record_failure("timeout")
+    assert breaker.state() == BREAKER_OPEN
+    assert not breaker.allow()
+
+    clock.now += 29.9
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_breaker_half_open_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure("HTTP 503")
+
+    clock.now += 30
+    assert breaker.state() == BREAKER_HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # A failed trial opens it again for another reset_seconds.
+    breaker.record_failure("HTTP 503")
+    assert breaker.state() == BREAKER_OPEN and breaker.opened == 2
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state() == BREAKER_CLOSED
+    assert breaker.allow() and breaker.allow()
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_breaker_release_frees_the_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10)
+    breaker.record_failure()
+    clock.now += 10
+
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_breaker_retry_after(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_seconds=30)
+    breaker.record_failure("HTTP 429", open_for=120)
+    assert breaker.state() == BREAKER_OPEN
+
+    clock.now += 119
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+    # Retry-After never shortens the reset period.
+    breaker.record_success()
+    breaker.record_failure("HTTP 429", open_for=1)
+    clock.now += 29
+    assert breaker.state() == BREAKER_OPEN
@@ -0,0 +1,56 @@
+import random
+
+import numpy as np
+import pytest
+
+from bm25 import BM25Corpus, BM25Index, tokenize
+
+WORDS = [f"w{i}" for i in range(200)] + ["c++", "node.js", "python", "sql"]
+QUERIES = ["python sql", "c++ node.js w3", "w1 w1 w2 nothing", "", "unknown words"]
+
+
+def documents(seed: int, count: int = 150) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 50))) for _ in range(count)]
+
+
+def corpus(docs: list[str]) -> BM25Corpus:
+    built = BM25Corpus()
+    for i, doc in enumerate(docs):
+        built.add(i, tokenize(doc))
+    return built
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("query", QUERIES)
+def test_corpus_matches_index(seed, query):
+    docs = documents(seed)
+    expected = BM25Index(docs).scores(query)
+    assert np.allclose(corpus(docs).scores(list(range(len(docs))), query), expected, rtol=1e-5)
+
+
+def test_remove_restores_statistics():
+    docs = documents(7)
+    built = corpus(docs)
+    built.add("extra", tokenize("python python sql c++"))
+    built.add(3, tokenize("python"))
+    built.add(3, tokenize(docs[3]))
+    built.remove("extra")
+    built.remove("missing")
+
+    assert "extra" not in built and len(built) == len(docs)
+    expected = BM25Index(docs).scores("python c++")
+    assert np.allclose(built.scores(list(range(len(docs))), "python c++"), expected, rtol=1e-5)
+
+
+def test_docs_not_held_are_scored_from_text():
+    docs = documents(11)
+    built = corpus(docs)
+    text = "python and sql"
+
+    scored = built.scores(["new", None, 0], "python sql", [text, text, "ignored"])
+
+    assert scored[0] == scored[1] > 0
+    assert scored[2] == built.scores([0], "python sql")[0]
+    assert built.scores(["new"], "python sql")[0] == 0
+    assert len(built) == len(docs) and "new" not in built
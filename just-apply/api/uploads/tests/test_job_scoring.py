@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from job_scoring import TITLE_BONUS_RULES, JobBatch, rank, score_job
+from taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy
+
+TITLES = ["Data Analyst", "Frontend Developer", "Cloud Engineer", "Software Engineer", "Chef", ""]
+FILLER = "the team role remote hybrid experience json delivery stakeholders agile".split()
+FIELDS = ("match_percentage", "total_score", "skill_score", "qual_score", "title_bonus")
+
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return load_taxonomy(DEFAULT_TAXONOMY_PATH)
+
+
+def job_texts(rng: random.Random, taxonomy, rows: int) -> tuple[list[str], list[str]]:
+    # Canonical names and aliases (including ones that only count as whole
+    # words) mixed into filler, under titles that may earn a bonus.
+    surfaces = list(taxonomy.skills._canonical) + list(taxonomy.qualifications._canonical)
+    titles = [rng.choice(TITLES) for _ in range(rows)]
+    texts = [
+        f"{title} " + " ".join(
+            rng.choice(surfaces) if rng.random() < 0.2 else rng.choice(FILLER)
+            for _ in range(rng.randint(0, 40))
+        )
+        for title in titles
+    ]
+    return [text.lower() for text in texts], titles
+
+
+def user_profile(rng: random.Random, taxonomy) -> tuple[list[str], list[str]]:
+    # Canonical names, aliases, odd casing and spacing, unknown words and
+    # duplicates of each.
+    skills = list(taxonomy.skills._canonical) + ["json", "excel", "", " Python ", "JS", "K8S"]
+    quals = list(taxonomy.qualifications._canonical) + ["", "BSc", " masters "]
+    user_skills = [rng.choice(skills) for _ in range(rng.randint(0, 8))]
+    user_quals = [rng.choice(quals) for _ in range(rng.randint(0, 3))]
+    if user_skills and rng.random() < 0.5:
+        user_skills += rng.sample(user_skills, k=min(2, len(user_skills)))
+    return user_skills, user_quals
+
+
+def per_job(texts, titles, taxonomy, user_skills, user_quals) -> list[tuple]:
+    expected = []
+    for text, title in zip(texts, titles):
+        scores = score_job(text, title, taxonomy, user_skills, user_quals)
+        expected.append(tuple(scores[field] for field in FIELDS) + (len(scores["missing_skills"]),))
+    return expected
+
+
+def batched(batch: JobBatch, user_skills, user_quals) -> tuple[dict, list[tuple]]:
+    scores = batch.score(user_skills, user_quals)
+    columns = [scores[field].tolist() for field in FIELDS] + [scores["missing_count"].tolist()]
+    return scores, list(zip(*columns))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_matches_per_job_scoring(taxonomy, seed):
+    rng = random.Random(seed)
+    texts, titles = job_texts(rng, taxonomy, rng.randint(0, 40))
+    batch = JobBatch(texts, titles, taxonomy)
+
+    for _ in range(10):
+        user_skills, user_quals = user_profile(rng, taxonomy)
+        expected = per_job(texts, titles, taxonomy, user_skills, user_quals)
+        scores, got = batched(batch, user_skills, user_quals)
+        assert got == expected, (user_skills, user_quals)
+
+        order = sorted(range(len(expected)), key=lambda i: expected[i][:3], reverse=True)[:20]
+        assert rank(scores, 20).tolist() == order
+
+
+@pytest.mark.parametrize("user_skills, user_quals", [
+    (["js", "javascript", "JS"], ["bsc", "bsc"]),
+    (["python", "python", "postgres"], []),
+    (["k8s", "kubernetes"], ["bachelor's"]),
+    (["reactjs", "unknown skill", ""], ["  "]),
+])
+def test_aliases_and_duplicates(taxonomy, user_skills, user_quals):
+    texts = [
+        "frontend developer react.js, javascript and html5",
+        "data engineer: python, postgresql, kubernetes; bachelor's degree",
+        "json parser in python with bsc",
+        "chef",
+    ]
+    titles = ["Frontend Developer", "Data Engineer", "Software Engineer", "Chef"]
+    _, got = batched(JobBatch(texts, titles, taxonomy), user_skills, user_quals)
+    assert got == per_job(texts, titles, taxonomy, user_skills, user_quals)
+
+
+@pytest.mark.parametrize("words, skills", TITLE_BONUS_RULES)
+def test_title_bonus(taxonomy, words, skills):
+    titles = [f"Senior {word} lead" for word in words] + ["Chef"]
+    texts = [title.lower() for title in titles]
+    user_skills = [skills[0]]
+
+    scores, got = batched(JobBatch(texts, titles, taxonomy), user_skills, [])
+    assert got == per_job(texts, titles, taxonomy, user_skills, [])
+    assert scores["title_bonus"].tolist() == [2] * len(words) + [0]
+    assert all(percentage >= 35 for percentage in scores["match_percentage"][:-1].tolist())
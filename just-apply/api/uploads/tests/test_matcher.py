@@ -0,0 +1,87 @@
+import random
+import re
+
+import pytest
+
+from matcher import AUTOMATON_MIN_KEYWORDS, KeywordMatcher
+
+# Filler keywords push a list over AUTOMATON_MIN_KEYWORDS without ever
+# matching the texts below.
+FILLER = [f"zz{i:04d}qq" for i in range(AUTOMATON_MIN_KEYWORDS)]
+WHOLE_WORD = ("js", "c#", "node.js", "c++", "r")
+
+
+def reference(text: str, keywords: list[str], whole_word=()) -> list[str]:
+    text = text.lower()
+    found = []
+    for kw in keywords:
+        pattern = kw.lower().strip()
+        if kw in whole_word:
+            if re.search(rf"(?<!\w){re.escape(pattern)}(?!\w)", text):
+                found.append(kw)
+        elif pattern in text:
+            found.append(kw)
+    return found
+
+
+def matchers(keywords, **kwargs):
+    # The scan path and the automaton path over the same keywords.
+    scan = KeywordMatcher(keywords, automaton_min_keywords=len(keywords) + 1, **kwargs)
+    automaton = KeywordMatcher(keywords, automaton_min_keywords=1, **kwargs)
+    return scan, automaton
+
+
+@pytest.mark.parametrize("size", [AUTOMATON_MIN_KEYWORDS - 1, AUTOMATON_MIN_KEYWORDS])
+@pytest.mark.parametrize("text, expected", [
+    ("parse json files", []),
+    ("react, js and css", ["js"]),
+    ("js", ["js"]),
+    ("c# developer", ["c#"]),
+    ("abc# and c#x", []),
+    ("node.js.", ["node.js", "js"]),
+    ("node.json config", []),
+    ("c++/c#", ["c#", "c++"]),
+    ("r, python", ["r"]),
+    ("rust and go", []),
+])
+def test_whole_word_boundaries(size, text, expected):
+    # The default threshold picks the scan path just below
+    # AUTOMATON_MIN_KEYWORDS and the automaton from it upwards.
+    keywords = list(WHOLE_WORD) + FILLER[:size - len(WHOLE_WORD)]
+    matcher = KeywordMatcher(keywords, whole_word=WHOLE_WORD)
+    assert (matcher._automaton is not None) == (size >= AUTOMATON_MIN_KEYWORDS)
+    assert sorted(matcher.find(text)) == sorted(expected)
+
+
+def test_paths_agree_on_random_lists():
+    rng = random.Random(20240601)
+    alphabet = "ab c.#+_"
+
+    for _ in range(2_000):
+        keywords = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 12))
+        ] + rng.sample(list(WHOLE_WORD) + ["json", "node", "c"], 3)
+        text = "".join(rng.choice(alphabet + "jsonde") for _ in range(rng.randint(0, 60)))
+        candidates = [kw for kw in keywords if kw.strip()]
+        whole_word = set(rng.sample(candidates, rng.randint(0, len(candidates))))
+
+        for kwargs in ({}, {"whole_word": whole_word}):
+            scan, automaton = matchers(keywords, **kwargs)
+            expected = reference(text, keywords, kwargs.get("whole_word", ()))
+            assert scan.find(text) == expected, (keywords, text, kwargs)
+            assert automaton.find(text) == expected, (keywords, text, kwargs)
+
+        scan, automaton = matchers(keywords, ignore_spaces=True)
+        assert scan.find(text) == automaton.find(text), (keywords, text)
+
+
+def test_duplicates_keep_original_order():
+    keywords = ["SQL", "python", "sql ", "Python"]
+    for matcher in matchers(keywords):
+        assert matcher.find("python and sql") == keywords
+
+
+def test_whole_word_rejected_with_ignore_spaces():
+    with pytest.raises(ValueError):
+        KeywordMatcher(["js"], ignore_spaces=True, whole_word=["js"])
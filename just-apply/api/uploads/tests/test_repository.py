@@ -0,0 +1,201 @@
+import sqlite3
+import threading
+
+import pytest
+
+from db import SQLiteThreadPool, WriteQueue, apply_sqlite_pragmas
+from migrations import run_migrations
+from repository import APPLICATIONS_LIST, SAVED_JOBS_LIST, SQLITE, Repository
+
+
+@pytest.fixture
+def repo():
+    # Each thread keeps its own pooled connection, so the in-memory
+    # database lives as long as the pool within this test's thread.
+    pool = SQLiteThreadPool(lambda: sqlite3.connect(":memory:", check_same_thread=False))
+    with pool.session() as conn:
+        run_migrations(conn, "sqlite")
+        yield Repository(pool.acquire, SQLITE)
+
+
+def job(job_id, match_percentage=60, **extra):
+    return {
+        "job_id": job_id,
+        "title": f"Role {job_id}",
+        "company": "Acme",
+        "industry": "Technology",
+        "match_percentage": match_percentage,
+        "missing_skills": ["Docker"],
+        **extra,
+    }
+
+
+def test_save_job_bumps_version_once(repo):
+    assert repo.save_job("a@x.com", job("j1"))
+    assert repo.get_list_version("a@x.com", SAVED_JOBS_LIST) == 1
+
+    # Saving the same job again is a no-op.
+    assert not repo.save_job("a@x.com", job("j1"))
+    assert repo.get_list_version("a@x.com", SAVED_JOBS_LIST) == 1
+    assert repo.count_saved_jobs("a@x.com") == 1
+
+    assert repo.save_job("a@x.com", job("j2"))
+    assert repo.get_list_version("a@x.com", SAVED_JOBS_LIST) == 2
+    assert repo.get_list_version("b@x.com", SAVED_JOBS_LIST) == 0
+
+
+def test_remove_saved_job(repo):
+    repo.save_job("a@x.com", job("j1"))
+
+    assert repo.remove_saved_job("a@x.com", "j1")
+    assert repo.get_list_version("a@x.com", SAVED_JOBS_LIST) == 2
+    assert repo.get_saved_jobs("a@x.com") == []
+
+    assert not repo.remove_saved_job("a@x.com", "j1")
+    assert repo.get_list_version("a@x.com", SAVED_JOBS_LIST) == 2
+
+
+def test_saved_jobs_keyset_pagination(repo):
+    # Rows saved within the same second share saved_at; the id breaks ties.
+    for i in range(7):
+        repo.save_job("a@x.com", job(f"j{i}"))
+    repo.save_job("b@x.com", job("other"))
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = repo.get_saved_jobs_page("a@x.com", 3, cursor)
+        seen += [item["job_id"] for item in page]
+        if cursor is None:
+            break
+        assert len(page) == 3
+
+    assert seen == [f"j{i}" for i in reversed(range(7))]
+    assert seen == [item["job_id"] for item in repo.get_saved_jobs("a@x.com")]
+
+
+def test_pagination_rejects_bad_cursor(repo):
+    repo.save_job("a@x.com", job("j1"))
+
+    for cursor in ("not-a-cursor", "W10", "!!!"):
+        with pytest.raises(ValueError):
+            repo.get_saved_jobs_page("a@x.com", 3, cursor)
+
+
+def test_application_upsert(repo):
+    first = repo.save_job_application("a@x.com", {"external_job_id": "e1", "title": "Dev"})
+    again = repo.save_job_application("a@x.com", {"external_job_id": "e1", "title": "Dev", "notes": "called"}, "Interview")
+
+    assert first == again == "e1"
+    applications = repo.get_job_applications("a@x.com")
+    assert len(applications) == 1
+    assert applications[0]["status"] == "Interview"
+    assert applications[0]["notes"] == "called"
+    assert repo.get_list_version("a@x.com", APPLICATIONS_LIST) == 2
+
+    application_id = applications[0]["id"]
+    assert repo.update_application_status("a@x.com", application_id, "Offer")
+    assert not repo.update_application_status("b@x.com", application_id, "Rejected")
+    assert repo.get_job_application("a@x.com", application_id=application_id)["status"] == "Offer"
+
+
+def test_analytics_counters_follow_writes(repo):
+    user = "a@x.com"
+    repo.save_job(user, job("j1", 90))
+    repo.save_job(user, job("j2", 40, industry=""))
+    repo.save_job(user, job("j1", 90))
+    repo.remove_saved_job(user, "j2")
+    repo.save_cv(user, "cv.pdf", "stored.pdf", None, ["Python", "SQL"], ["BSc"], "preview")
+    repo.save_job_application(user, {"external_job_id": "e1"})
+    repo.save_job_application(user, {"external_job_id": "e1"}, "Interview")
+    repo.save_job_application(user, {"external_job_id": "e2"})
+
+    counters = repo.get_user_analytics(user)
+    assert counters["total"] == {
+        "saved_jobs": 1,
+        "match_rate": 90,
+        "strong_matches": 1,
+        "uploaded_cvs": 1,
+        "applications": 2,
+    }
+    assert counters["status"] == {"Interview": 1, "Applied": 1}
+    assert counters["skill"] == {"python": 1, "sql": 1}
+    assert counters["missing_skill"] == {"docker": 1}
+
+    assert repo.check_user_analytics(user) == []
+    assert repo.aggregate_user_analytics(user) == counters
+    assert repo.rebuild_user_analytics(user) == counters
+
+
+@pytest.fixture(params=["direct", "write_queue"])
+def shared_repo(request, tmp_path):
+    # A file database shared by several threads, each with its own
+    # connection, written either directly or through the writer thread.
+    path = str(tmp_path / "shared.db")
+
+    def connect():
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        apply_sqlite_pragmas(conn, busy_timeout_ms=10000)
+        return conn
+
+    pool = SQLiteThreadPool(connect)
+    with pool.session() as conn:
+        run_migrations(conn, "sqlite")
+        conn.commit()
+
+    write_queue = WriteQueue(connect) if request.param == "write_queue" else None
+    yield Repository(pool.acquire, SQLITE, write_queue=write_queue)
+    if write_queue is not None:
+        write_queue.close()
+    pool.close_all()
+
+
+def run_threads(count: int, target):
+    errors = []
+
+    def run(i):
+        try:
+            target(i)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    assert errors == []
+
+
+def test_concurrent_writes_keep_counters_consistent(shared_repo):
+    user = "a@x.com"
+    shared_repo.save_job_application(user, {"external_job_id": "e1"})
+    application_id = shared_repo.get_job_applications(user)[0]["id"]
+    statuses = ["Interview", "Offer", "Rejected", "Applied"]
+
+    def work(i):
+        for n in range(15):
+            status = statuses[(i + n) % len(statuses)]
+            shared_repo.update_application_status(user, application_id, status)
+            shared_repo.save_job_application(user, {"external_job_id": f"e{n % 3}"}, status)
+            shared_repo.save_job(user, job(f"j{n % 4}", 70))
+            shared_repo.remove_saved_job(user, f"j{(n + i) % 4}")
+
+    run_threads(6, work)
+
+    assert shared_repo.check_user_analytics(user) == []
+    counters = shared_repo.get_user_analytics(user)
+    assert sum(counters["status"].values()) == counters["total"]["applications"] == 3
+
+
+def test_transaction_rolls_back_on_error(shared_repo):
+    def work(tx):
+        tx.save_job("a@x.com", job("j1"))
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        shared_repo.transaction(work)
+
+    assert shared_repo.get_saved_jobs("a@x.com") == []
+    assert shared_repo.get_user_analytics("a@x.com") == {}
+    assert shared_repo.get_list_version("a@x.com", SAVED_JOBS_LIST) == 0
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+import search_cache
+from search_cache import MemorySearchStore, SearchCache, SQLiteSearchStore
+
+TTL = 60
+STALE = 300
+
+
+class FakeClock:
+    # Stands in for the time module inside search_cache.
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+class Fetcher:
+    # Counts calls; with hold=True each call waits until release().
+    def __init__(self, name: str = "job", hold: bool = False, fail: bool = False):
+        self.name = name
+        self.calls = 0
+        self.fail = fail
+        self._gate = threading.Event()
+        if not hold:
+            self._gate.set()
+        self._lock = threading.Lock()
+
+    def release(self):
+        self._gate.set()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        assert self._gate.wait(5)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return [f"{self.name}-{call}"]
+
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(search_cache, "time", fake)
+    return fake
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, clock, tmp_path):
+    if request.param == "memory":
+        store = MemorySearchStore()
+    else:
+        store = SQLiteSearchStore(str(tmp_path / "search.db"))
+    built = SearchCache(store, ttl_seconds=TTL, stale_seconds=STALE)
+    yield built
+    built.close(wait=True)
+
+
+def test_fresh_hit_then_expiry(cache, clock):
+    fetch = Fetcher()
+    assert cache.get("k", fetch) == ["job-1"]
+
+    clock.now += TTL - 1
+    assert cache.get("k", fetch) == ["job-1"]
+    assert fetch.calls == 1
+
+    clock.now += STALE + 2
+    assert cache.get("k", fetch) == ["job-2"]
+    assert (cache.hits, cache.misses, cache.stale_hits) == (1, 2, 0)
+
+
+def test_concurrent_misses_share_one_fetch(cache):
+    fetch = Fetcher(hold=True)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("k", fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+
+    wait_for(lambda: cache.coalesced == 7)
+    fetch.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert fetch.calls == 1
+    assert results == [["job-1"]] * 8
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_stale_hit_returns_at_once_and_refreshes_once(cache, clock):
+    assert cache.get("k", Fetcher()) == ["job-1"]
+    clock.now += TTL + 1
+
+    fetch = Fetcher("fresh", hold=True)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("k", fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    # Every caller got the stale value while the refresh is still held.
+    assert results == [["job-1"]] * 8
+    assert cache.stale_hits == 8 and cache.refreshes == 1
+
+    fetch.release()
+    wait_for(lambda: cache.peek("k")[0] == ["fresh-1"])
+    assert cache.get("k", Fetcher("unused")) == ["fresh-1"]
+    assert fetch.calls == 1 and cache.hits == 1
+
+
+def test_failed_refresh_keeps_stale_entry(cache, clock):
+    assert cache.get("k", Fetcher()) == ["job-1"]
+    clock.now += TTL + 1
+
+    assert cache.get("k", Fetcher("down", fail=True)) == ["job-1"]
+    wait_for(lambda: cache.refresh_failures == 1)
+    assert cache.peek("k")[0] == ["job-1"]
+
+
+def test_memory_store_evicts_least_recently_used(clock):
+    store = MemorySearchStore(max_entries=2)
+    store.put("a", 1)
+    store.put("b", 2)
+    store.get("a")
+    store.put("c", 3)
+
+    assert store.get("b") is None
+    assert store.get("a") == (1, clock.now)
+    assert store.evictions == 1